@@ -0,0 +1,137 @@
+# bench_string_builder.py: Rendering a report of N rows into one string or a file
+# Each row is (name, qty, price, total) rendered as "{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n".
+# Into one str:
+#   +=            report += f"..." in a loop (CPython grows a local str in place)
+#   +=attribute   self.report += f"...": the str has two references, so every += copies it
+#                 (quadratic: run on the first --quadratic-rows rows only)
+#   f-string      "".join([f"..." for ... in rows])
+#   format        "".join(["{:<12}{:>6d}...".format(*row) for row in rows])
+#   percent       "".join(["%-12s%6d%10.2f%14.2f\n" % row for row in rows])
+#   builder       StringBuilder: builder += f"..." in a loop, getvalue() once
+#   compiled      compile_template(template).render(rows)
+#   compiled-fmt  the same with printf=False: generated code, but format() for every spec
+# Into a file:
+#   write         f.write(f"...") per row
+#   builder-file  StringBuilder(f): += per row, written in 64K-character chunks
+#   compiled-file compile_template(template).write(rows, f)
+# Each variant runs in its own process; reported: ns per row and the peak memory
+# added while rendering (ru_maxrss). All outputs are checked to be identical.
+# Usage: python bench_string_builder.py [--rows 1000000]
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+from string_builder import StringBuilder, compile_template
+
+TEMPLATE = "{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n"
+FIELDS = ("name", "qty", "price", "total")
+POSITIONAL = "{:<12}{:>6d}{:>10.2f}{:>14.2f}\n"
+VARIANTS = ("+=", "+=attribute", "f-string", "format", "percent", "builder", "compiled", "compiled-fmt",
+            "write", "builder-file", "compiled-file")
+
+
+def make_rows(n: int, seed: int = 42) -> list[tuple]:
+    rng = random.Random(seed)
+    names = [f"item-{i:05d}" for i in range(5000)]
+    rows = []
+    for _ in range(n):
+        qty, price = rng.randint(1, 500), rng.uniform(0.01, 999.99)
+        rows.append((rng.choice(names), qty, price, qty * price))
+    return rows
+
+
+def render_text(variant: str, rows: list[tuple]) -> str:
+    if variant == "+=":
+        report = ""
+        for name, qty, price, total in rows:
+            report += f"{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n"
+        return report
+    if variant == "+=attribute":
+        report = SimpleNamespace(text="")
+        for name, qty, price, total in rows:
+            report.text += f"{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n"
+        return report.text
+    if variant == "f-string":
+        return "".join([f"{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n" for name, qty, price, total in rows])
+    if variant == "format":
+        return "".join([POSITIONAL.format(*row) for row in rows])
+    if variant == "percent":
+        return "".join(["%-12s%6d%10.2f%14.2f\n" % row for row in rows])
+    if variant == "builder":
+        builder = StringBuilder()
+        for name, qty, price, total in rows:
+            builder += f"{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n"
+        return builder.getvalue()
+    return compile_template(TEMPLATE, FIELDS, printf=variant == "compiled").render(rows)
+
+
+def render_file(variant: str, rows: list[tuple], f) -> None:
+    if variant == "write":
+        for name, qty, price, total in rows:
+            f.write(f"{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n")
+    elif variant == "builder-file":
+        with StringBuilder(f) as builder:
+            for name, qty, price, total in rows:
+                builder += f"{name:<12}{qty:>6d}{price:>10.2f}{total:>14.2f}\n"
+    else:
+        compile_template(TEMPLATE, FIELDS).write(rows, f)
+
+
+def worker(variant: str, n: int) -> dict:
+    rows = make_rows(n)
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    if variant.endswith("file") or variant == "write":
+        path = os.path.join(tempfile.mkdtemp(), "report.txt")
+        with open(path, "w") as f:
+            render_file(variant, rows, f)
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        os.remove(path)
+    else:
+        text = render_text(variant, rows)
+        elapsed = time.perf_counter() - start
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        digest = hashlib.sha256(text.encode()).hexdigest()
+    return {"seconds": elapsed, "added_kb": peak - before, "digest": digest}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--quadratic-rows", type=int, default=20_000)
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument("--worker", nargs=2, metavar=("VARIANT", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], int(args.worker[1]))))
+        return
+
+    print(f"{args.rows:,} rows of {TEMPLATE!r}")
+    print(f"{'variant':<15}{'ns/row':>8}{'peak +MB':>10}")
+    digests = set()
+    for variant in args.variants:
+        rows = min(args.rows, args.quadratic_rows) if variant == "+=attribute" else args.rows
+        output = subprocess.run([sys.executable, __file__, "--worker", variant, str(rows)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        if rows == args.rows:
+            digests.add(result["digest"])
+        note = f"   ({rows:,} rows: time per row grows with the row count)" if rows != args.rows else ""
+        print(f"{variant:<15}{result['seconds'] / rows * 1e9:>8,.0f}{result['added_kb'] / 1024:>10,.0f}{note}")
+    if len(digests) > 1:
+        raise SystemExit("the variants did not all produce the same report")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# bench_text_index.py: Repeated str.find / str.count vs a TextIndex built once
+# The corpus is generated text (Zipf-distributed made-up words, sentences, lines).
+# Queries are a mix of words, two-word phrases, pieces of words and absent strings.
+#   str        text.find / text.count / re.finditer: one scan per query
+#   index      text_index.TextIndex: binary searches in the suffix arrays
+# The index is built once (timed), saved, and reopened memory-mapped (timed).
+# Multi-pattern counting, k patterns at once:
+#   str.count  k scans of the text
+#   aho        text_index.AhoCorasick: one pass, no index
+#   index      TextIndex.count_many: k binary searches
+# Usage: python bench_text_index.py [--mb 8] [--queries 1000] [--patterns 10 100 1000]
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+from itertools import accumulate
+
+from text_index import AhoCorasick, TextIndex
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def make_corpus(chars: int, rng: random.Random) -> str:
+    vocabulary = ["".join(rng.choices(LETTERS, k=rng.randint(2, 11))) for _ in range(50_000)]
+    cumulative = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+    lines, total = [], 0
+    while total < chars:
+        words = rng.choices(vocabulary, cum_weights=cumulative, k=rng.randint(8, 30))
+        words[0] = words[0].capitalize()
+        line = " ".join(words) + rng.choice([".", ".", "!", "?"])
+        lines.append(line)
+        total += len(line) + 1
+    return "\n".join(lines)[:chars]
+
+
+def make_queries(text: str, count: int, rng: random.Random) -> list[str]:
+    queries = []
+    while len(queries) < count:
+        kind = rng.random()
+        if kind < 0.8:  # A phrase, a word or a piece of a word, taken from the text
+            start = text.rfind(" ", 0, rng.randrange(len(text) - 40)) + 1
+            end = text.find(" ", start)
+            if kind < 0.25:
+                end = text.find(" ", end + 1)
+            elif kind >= 0.55:
+                end = start + rng.randint(3, 6)
+            query = text[start:end]
+        else:  # Absent: every scan goes to the end
+            query = "".join(rng.choices(LETTERS, k=rng.randint(7, 12))) + "q"
+        if query.strip() and len(query.encode()) <= 64:
+            queries.append(query)
+    return queries
+
+
+def per_query(function, queries) -> tuple[float, list]:
+    start = time.perf_counter()
+    results = [function(query) for query in queries]
+    return (time.perf_counter() - start) / len(queries), results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=8, help="corpus size, millions of characters")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--baseline", type=int, default=100, help="queries timed with str (each one scans)")
+    parser.add_argument("--patterns", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    text = make_corpus(int(args.mb * 1_000_000), rng)
+    queries = make_queries(text, args.queries, rng)
+    sample = queries[:args.baseline]
+    print(f"{len(text):,} characters, {len(queries)} queries ({len(sample)} of them timed with str)")
+
+    start = time.perf_counter()
+    index = TextIndex.build(text)
+    built = time.perf_counter() - start
+    path = os.path.join(tempfile.mkdtemp(), "corpus.idx")
+    index.save(path)
+    start = time.perf_counter()
+    mapped = TextIndex.open(path)
+    opened = time.perf_counter() - start
+    print(f"build {built:.1f} s, {os.path.getsize(path) / 2**20:.0f} MB on disk "
+          f"({os.path.getsize(path) / len(text.encode()):.1f}x the text), reopen {opened * 1000:.1f} ms")
+
+    print(f"\n{'query':<10}{'str us':>12}{'index us':>11}{'mmap us':>10}{'speedup':>10}")
+    operations = [("find", text.find, TextIndex.find),
+                  ("count", text.count, TextIndex.count),
+                  ("find_all", lambda q: [m.start() for m in re.finditer(re.escape(q), text)], TextIndex.find_all)]
+    for name, baseline, method in operations:
+        scanned, expected = per_query(baseline, sample)
+        indexed, results = per_query(lambda q: method(index, q), queries)
+        on_disk, mapped_results = per_query(lambda q: method(mapped, q), queries)
+        if results[:len(sample)] != expected or mapped_results != results:
+            raise SystemExit(f"{name}: index and str disagree")
+        print(f"{name:<10}{scanned * 1e6:>12,.1f}{indexed * 1e6:>11,.1f}{on_disk * 1e6:>10,.1f}"
+              f"{scanned / indexed:>9,.0f}x")
+
+    print(f"\n{'patterns':>8}{'str.count s':>13}{'aho s':>8}{'index ms':>10}   occurrences")
+    words = sorted({word for word in re.findall(r"[a-z]{4,}", text[:200_000])})
+    for k in args.patterns:
+        patterns = rng.sample(words, min(k, len(words)))
+        start = time.perf_counter()
+        expected = {pattern: text.count(pattern) for pattern in patterns}
+        scanned = time.perf_counter() - start
+        start = time.perf_counter()
+        found = AhoCorasick(patterns).count(text)
+        one_pass = time.perf_counter() - start
+        start = time.perf_counter()
+        counted = index.count_many(patterns, overlapping=True)
+        indexed = time.perf_counter() - start
+        if found != {p: n for p, n in counted.items() if n} or index.count_many(patterns) != expected:
+            raise SystemExit(f"{k} patterns: counts disagree")
+        print(f"{len(patterns):>8}{scanned:>13.2f}{one_pass:>8.2f}{indexed * 1000:>10.1f}   "
+              f"{sum(counted.values()):,}")
+    mapped.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+# string_builder.py: Building big strings without re-copying them
+# Report code often grows one string row by row:
+#
+#   report = ""
+#   for name, qty, price in rows:
+#       report += f"{name:<12}{qty:>6d}{price:>10.2f}\n"     # format specs parsed again for every row
+#
+# Two tools for that loop:
+#   StringBuilder     collects the pieces in a list and joins them ONCE at the end,
+#                     or streams them to a file / io.TextIOBase in large chunks
+#   compile_template  parses a str.format template ONCE and renders whole batches of
+#                     rows with generated code; format specs are turned into %-directives
+#                     ("{price:>10.2f}" -> "%10.2f") wherever the output is identical,
+#                     because % formatting skips the per-value __format__ call
+#
+#   line = compile_template("{name:<12}{qty:>6d}{price:>10.2f}\n")
+#   report = line.render(rows)                       # one str
+#   with open("report.txt", "w") as f:
+#       line.write(rows, f)                          # streamed in batches
+
+import re
+from functools import lru_cache
+from itertools import batched
+from string import Formatter
+
+ACCESS = ("sequence", "mapping", "attribute")
+
+# [[fill]align][sign][z][#][0][width][grouping][.precision][type]
+_SPEC = re.compile(r"(?:(?P<fill>.)?(?P<align>[<>=^]))?(?P<sign>[-+ ])?(?P<z>z)?(?P<alt>#)?(?P<zero>0)?"
+                   r"(?P<width>\d+)?(?P<grouping>[,_])?(?:\.(?P<precision>\d+))?(?P<type>[bcdeEfFgGnosxX%])?",
+                   re.DOTALL)
+_PART = re.compile(r"\.([A-Za-z_]\w*)|\[([^\]]+)\]")
+_CONVERSIONS = {"r": "repr", "s": "str", "a": "ascii"}
+
+
+# --------------------------------------------------
+# Builder
+# --------------------------------------------------
+class StringBuilder:
+    """
+    Collects strings and joins them once. `builder += text`, append(), write()
+    (so print(..., file=builder) works) and extend() only add to a list.
+
+    With `out` (an open text file, io.StringIO, sys.stdout...), the pieces are
+    joined and written every `flush_chars` characters instead of kept: memory
+    stays flat however long the output gets.
+    """
+
+    def __init__(self, out=None, flush_chars: int = 1 << 16):
+        self.out = out
+        self.flush_chars = flush_chars
+        self.written = 0
+        self._parts: list[str] = []
+        self._pending = 0
+        if out is None:  # Nothing to check per piece: append IS list.append
+            self.append = self._parts.append
+
+    def append(self, text: str) -> None:
+        self._parts.append(text)
+        self._pending += len(text)
+        if self._pending >= self.flush_chars:
+            self.flush()
+
+    def write(self, text: str) -> int:
+        self.append(text)
+        return len(text)
+
+    def extend(self, texts) -> None:
+        if self.out is None:
+            self._parts.extend(texts)
+        else:
+            for text in texts:
+                self.append(text)
+
+    def __iadd__(self, text: str) -> "StringBuilder":
+        self.append(text)
+        return self
+
+    def flush(self) -> None:
+        """Write what is collected to `out` as one string (no-op without `out`)."""
+        if self.out is not None and self._parts:
+            chunk = "".join(self._parts)
+            self._parts.clear()
+            self._pending = 0
+            self.written += self.out.write(chunk)
+
+    def getvalue(self) -> str:
+        """Everything appended so far, joined (kept joined, so calling again is cheap)."""
+        if self.out is not None:
+            raise ValueError("this StringBuilder streams to a file: its text is not kept")
+        if len(self._parts) > 1:
+            self._parts[:] = ["".join(self._parts)]
+        return self._parts[0] if self._parts else ""
+
+    def __str__(self) -> str:
+        return self.getvalue()
+
+    def __len__(self) -> int:
+        return self.written + sum(map(len, self._parts))
+
+    def clear(self) -> None:
+        self._parts.clear()
+        self._pending = 0
+
+    def __enter__(self) -> "StringBuilder":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.flush()
+
+    def __repr__(self) -> str:
+        target = "in memory" if self.out is None else f"streaming to {self.out!r}"
+        return f"<StringBuilder {len(self):,} chars, {target}>"
+
+
+# --------------------------------------------------
+# Template compiler
+# --------------------------------------------------
+def printf_directive(spec: str, conversion: str | None = None) -> str | None:
+    """
+    The %-directive that renders a value like format(value, spec) does, or
+    None if there is none. For str, int, float and bool the output is the same;
+    % is only more lenient with bad input ("%d" % 2.5 gives "2", format raises).
+    Types with their own spec language (datetime, ...) need printf=False.
+    """
+    match = _SPEC.fullmatch(spec)
+    if not match or match["fill"] not in (None, " ") or match["align"] in ("^", "=") \
+            or match["z"] or match["grouping"]:
+        return None
+    align, sign, alt, zero, width, precision, kind = (match[name] for name in (
+        "align", "sign", "alt", "zero", "width", "precision", "type"))
+    flags = "-" if align == "<" else ""
+    if conversion and kind not in (None, "s") or zero and align:  # format() ignores 0 when aligned
+        return None
+    if conversion or kind in (None, "s"):
+        if kind is None and not conversion and (align or width or precision):
+            return None  # Default alignment, precision, even the text (format(True, ">4") is "   1") depend on the type
+        if sign or alt or zero:
+            return None
+        if (kind == "s" or conversion) and align is None:
+            flags = "-"  # format() left-aligns text (and !r / !s / !a results are text)
+        kind = conversion or "s"
+    elif kind in "dxXo":
+        if precision or (alt and kind == "d"):
+            return None
+    elif kind not in "eEfFgG":
+        return None
+    flags += (sign if sign in ("+", " ") else "") + ("#" if alt else "") + ("0" if zero else "")
+    return f"%{flags}{width or ''}{'.' + precision if precision else ''}{kind}"
+
+
+def _parse(template: str):
+    """(literal, field, spec, conversion) pieces, with auto-numbered {} fields numbered."""
+    pieces, auto = [], 0
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if field is not None:
+            if "{" in spec:
+                raise ValueError(f"nested fields in format specs are not supported: {{{field}:{spec}}}")
+            if field == "" or field[0] in ".[":
+                field = f"{auto}{field}"
+                auto += 1
+        pieces.append((literal, field, spec or "", conversion))
+    return pieces
+
+
+def _split_field(field: str) -> tuple[str, str]:
+    """'user.name[0]' -> ('user', '.name[0]') with the accessors as Python code."""
+    head = re.match(r"[^.[]*", field).group()
+    code, position = [], len(head)
+    while position < len(field):
+        part = _PART.match(field, position)
+        if part is None:
+            raise ValueError(f"bad field name {field!r}")
+        attribute, key = part.groups()
+        code.append(f".{attribute}" if attribute else f"[{int(key) if key.isdigit() else key!r}]")
+        position = part.end()
+    return head, "".join(code)
+
+
+class RowFormat:
+    """
+    A compiled template (see compile_template). format(row) renders one row;
+    render(rows) all of them as one str; lines(rows) one str per row;
+    write(rows, out) streams batches to a file. `source` is the generated code.
+    """
+
+    def __init__(self, template: str, fields: tuple[str, ...], access: str, source: str, namespace: dict):
+        self.template, self.fields, self.access, self.source = template, fields, access, source
+        self._format = namespace["format_row"]
+        self._lines = namespace["format_rows"]
+
+    def format(self, row) -> str:
+        return self._format(row)
+
+    __call__ = format
+
+    def lines(self, rows) -> list[str]:
+        return self._lines(rows)
+
+    def render(self, rows, batch: int = 4096) -> str:
+        """All rows as one str. Joined batch by batch, so at most `batch` line strings exist at once."""
+        lines = self._lines
+        return "".join(["".join(lines(chunk)) for chunk in batched(rows, batch)])
+
+    def write(self, rows, out, batch: int = 4096) -> int:
+        """Render `rows` into `out` (anything with write(str)), `batch` rows per write call."""
+        written = 0
+        for chunk in batched(rows, batch):
+            written += out.write("".join(self._lines(chunk)))
+        return written
+
+    def __repr__(self) -> str:
+        return f"RowFormat({self.template!r}, fields={self.fields}, access={self.access!r})"
+
+
+@lru_cache(maxsize=256)
+def _compile(template: str, fields: tuple[str, ...] | None, access: str, printf: bool) -> RowFormat:
+    pieces = _parse(template)
+    names = [_split_field(field)[0] for _, field, _, _ in pieces if field is not None]
+    numbered = [name for name in names if name.isdigit()]
+    if access not in ACCESS:
+        raise ValueError(f"access must be one of {ACCESS}, not {access!r}")
+    if numbered and (len(numbered) < len(names) or access != "sequence"):
+        raise ValueError("numbered fields ({0} or {}) need access='sequence' and no named fields")
+    if fields is None:
+        fields = tuple(dict.fromkeys(names))
+    if numbered:
+        fields = tuple(str(i) for i in range(max(map(int, fields)) + 1))
+    missing = [name for name in names if name not in fields]
+    if missing:
+        raise ValueError(f"template fields {missing} are not in fields {fields}")
+
+    if numbered:  # Like str.format(*row): index, so rows may hold more items than are used
+        variable, row = {name: f"row[{name}]" for name in fields}, "row"
+    elif access == "sequence":
+        variable = {name: f"v{i}" for i, name in enumerate(fields)}
+        row = ", ".join(variable.values()) + ("," if len(fields) == 1 else "") if fields else "row"
+    elif access == "mapping":
+        variable, row = {name: f"row[{name!r}]" for name in fields}, "row"
+    else:
+        variable, row = {name: f"row.{name}" for name in fields}, "row"
+        if not all(name.isidentifier() for name in fields):
+            raise ValueError(f"access='attribute' needs identifiers as field names, not {fields}")
+
+    constants, values, directives = {}, [], []
+    for literal, field, spec, conversion in pieces:
+        directives.append(literal.replace("%", "%%"))
+        if field is None:
+            continue
+        head, accessors = _split_field(field)
+        value = variable[head] + accessors
+        directive = printf_directive(spec, conversion) if printf else None
+        if directive is None:  # Not expressible with %: format() it, then insert the str
+            if conversion:
+                value = f"{_CONVERSIONS[conversion]}({value})"
+            name = f"_s{len(constants)}"
+            constants[name] = spec
+            value, directive = f"format({value}, {name})", "%s"
+        directives.append(directive)
+        values.append(value)
+
+    constants["_fmt"] = "".join(directives)
+    arguments = f"({', '.join(values)}{',' if len(values) == 1 else ''})"
+    unpack = f"    {row} = row\n" if row != "row" else ""
+    source = (f"def format_row(row):\n{unpack}    return _fmt % {arguments}\n\n"
+              f"def format_rows(rows):\n    return [_fmt % {arguments} for {row} in rows]\n")
+    namespace = {"__builtins__": {"format": format, "repr": repr, "ascii": ascii, "str": str}, **constants}
+    exec(compile(source, f"<template {template!r}>", "exec"), namespace)
+    return RowFormat(template, fields, access, source, namespace)
+
+
+def compile_template(template: str, fields=None, access: str = "sequence", printf: bool = True) -> RowFormat:
+    """
+    Compile a str.format template for rendering many rows.
+
+    access="sequence": rows are tuples/lists holding `fields` in order (by
+    default the template's field names in order of first use, or {0} {1} ...);
+    "mapping": rows are dicts; "attribute": rows are objects (dataclasses...).
+    Each field's spec becomes a %-directive when that renders the same
+    (printf=False keeps format() for every field). Compiled templates are cached.
+    """
+    return _compile(template, None if fields is None else tuple(fields), access, printf)
+
+
+# Example of code that should only run when string_builder.py is executed directly
+if __name__ == "__main__":
+    import io
+
+    rows = [("apple", 3, 0.5), ("banana", 12, 0.25), ("cherry", 100, 4.125)]
+    line = compile_template("{name:<10}|{qty:>5d}|{price:>8.2f}|{total:>10,.2f}\n",
+                            fields=["name", "qty", "price", "total"])
+    print(line.source)
+    print(line.render((name, qty, price, qty * price) for name, qty, price in rows))
+
+    report = StringBuilder()
+    report += "Fruit report\n"
+    for name, qty, price in rows:
+        print(f"{name}: {qty * price:.2f}", file=report)
+    print(report.getvalue(), repr(report))
+
+    out = io.StringIO()
+    with StringBuilder(out, flush_chars=20) as streamed:
+        for name, qty, price in rows:
+            streamed += f"{name}={price:.3f};"
+    print(out.getvalue(), repr(streamed))
+
+    by_key = compile_template("{name!r:>10} costs {price:.1f}\n", access="mapping")
+    print(by_key.render([{"name": "kiwi", "price": 0.75}]), end="")
@@ -0,0 +1,585 @@
+# text_index.py: Indexed substring and token search over a large text
+# text.find, text.count and `in` scan the whole string on every call. When the
+# same big text is searched thousands of times, index it once and answer each
+# query with a couple of binary searches:
+#
+#   index = TextIndex.build(text)             # or TextIndex.build_file("corpus.txt", "corpus.idx")
+#   index.find("needle")                      # same answer as text.find("needle")
+#   index.count("needle")                     # same as text.count("needle")
+#   index.find_all("needle")                  # every start, like re.finditer
+#   index.postings("word")                    # starts of the whole word (inverted token index)
+#   index.save("corpus.idx"); TextIndex.open("corpus.idx")   # memory-mapped: opens instantly
+#
+#   matcher = AhoCorasick(["error", "warning", "timeout"])   # no index needed:
+#   for start, pattern in matcher.finditer(text): ...        # all patterns in ONE pass
+#
+# The substring index is a suffix array: the start of every suffix of the UTF-8
+# text, sorted. All suffixes that begin with a pattern are neighbours, so two
+# binary searches find them: O(m log n) instead of O(n). Big texts are split into
+# segments of `segment_chars` characters with their own suffix array; each segment
+# also keeps the next `max_pattern` bytes of text, so a match that crosses into
+# the next segment is still found. Patterns may be at most `max_pattern` bytes.
+# Building is pure Python (a few seconds per million characters); the point is
+# to pay that once and query many times.
+
+import bisect
+import mmap
+import re
+import struct
+import sys
+from array import array
+from collections import Counter, defaultdict
+from functools import lru_cache, partial
+from itertools import accumulate, chain
+
+TOKEN = re.compile(r"\w+")
+SEGMENT_CHARS = 1 << 22     # characters per segment: bounds the memory used while building
+MAX_PATTERN = 256           # longest searchable pattern, in UTF-8 bytes
+_BLOCK = 64                 # suffix array entries per stored minimum (for find)
+_CHECKPOINT = 4096          # bytes per character-count checkpoint (non-ASCII segments)
+_CONTINUATION = bytes(range(0x80, 0xC0))   # UTF-8 bytes that do not start a character
+
+# File layout (all fixed width, written with struct):
+#   header    magic, version, byte order, max_pattern, total characters, segment count
+#   segments  per segment: a _SEGMENT header, then its text bytes, suffix array,
+#             block minimums, checkpoints and token index, each on an 8-byte boundary
+_MAGIC = b"TXTINDEX"
+_HEADER = struct.Struct("<8sBcIQI")
+_SEGMENT = struct.Struct("<9Q")
+
+
+# --------------------------------------------------
+# Building: suffix sorting
+# --------------------------------------------------
+def suffix_array(data: bytes, limit: int = MAX_PATTERN) -> list[int]:
+    """
+    Every position of `data`, ordered by the (at most) `limit` bytes starting
+    there. Suffixes that agree on all `limit` bytes keep an arbitrary order,
+    which is all a search for patterns of up to `limit` bytes needs.
+
+    Prefix doubling: sort by the first 8 bytes (read as big-endian integers, so
+    integer order is byte order), then repeatedly sort each group of equal
+    suffixes by the rank of the suffix k bytes further on, which orders them
+    by 2k bytes. Groups that are already unique are never touched again.
+    """
+    n = len(data)
+    if n == 0:
+        return []
+    padded = data + bytes(16)
+    keys = array("Q", bytes(8 * n))
+    for shift in range(min(8, n)):
+        count = (n - shift + 7) // 8
+        windows = array("Q")
+        windows.frombytes(padded[shift:shift + 8 * count])
+        if sys.byteorder == "little":
+            windows.byteswap()
+        keys[shift::8] = windows
+    # The last 8 suffixes are padded with zeros, so "a" and "a\0" get the same key.
+    # Listed first and shortest first, the stable sort puts each before the longer
+    # suffixes it ties with, and each gets a group (rank) of its own
+    tail = min(8, n)
+    order = sorted(chain(range(n - 1, n - tail - 1, -1), range(n - tail)), key=keys.__getitem__)
+
+    # rank[i]: 1 + position in `order` of the first suffix in i's group; 0 past the end
+    rank = array("Q", bytes(8 * (n + max(limit, 8))))
+    groups = []
+    group_start, previous, after_tail = 0, keys[order[0]], False
+    for position, suffix in enumerate(order):
+        key = keys[suffix]
+        in_tail = suffix >= n - tail
+        if key != previous or in_tail or after_tail:
+            if position - group_start > 1:
+                groups.append((group_start, position))
+            group_start, previous = position, key
+        after_tail = in_tail
+        rank[suffix] = group_start + 1
+    if n - group_start > 1:
+        groups.append((group_start, n))
+    del keys
+
+    k = 8
+    while groups and k < limit:
+        refined = []
+        for start, end in groups:
+            members = order[start:end]
+            second = [rank[suffix + k] for suffix in members]   # read before any rank changes
+            group_start, previous = start, None
+            for position, i in enumerate(sorted(range(len(members)), key=second.__getitem__), start):
+                suffix, key = members[i], second[i]
+                if key != previous:
+                    if position - group_start > 1:
+                        refined.append((group_start, position))
+                    group_start, previous = position, key
+                order[position] = suffix
+                rank[suffix] = group_start + 1
+            if end - group_start > 1:
+                refined.append((group_start, end))
+        groups = refined
+        k *= 2
+    return order
+
+
+def _build_segment(own: str, following: str, run_on: str, char_base: int, limit: int, tokens: bool,
+                   continues: bool) -> "_Segment":
+    """
+    Index `own`; the first `limit` characters of `following` (the next chunk)
+    are kept as overlap, searched but not indexed. run_on is the rest of a word
+    that `own` ends inside (it may span several chunks). continues=True means
+    `own` starts inside a word that the previous segment indexed.
+    """
+    own_bytes = own.encode()
+    data = own_bytes + following[:limit].encode()
+    size = len(own_bytes)
+    ascii = len(own_bytes) == len(own)
+    if ascii:
+        suffixes = array("I", [i for i in suffix_array(data, limit) if i < size])
+        checkpoints = None
+    else:  # Only suffixes that start at a character, so every match is a str position
+        suffixes = array("I", [i for i in suffix_array(data, limit)
+                               if i < size and not 0x80 <= data[i] < 0xC0])
+        checkpoints = array("Q", accumulate(
+            (len(own_bytes[i:i + _CHECKPOINT].translate(None, _CONTINUATION))
+             for i in range(0, size, _CHECKPOINT)), initial=0))
+    minimums = array("I", [min(suffixes[i:i + _BLOCK]) for i in range(0, len(suffixes), _BLOCK)])
+
+    found = defaultdict(list)
+    if tokens:
+        for match in TOKEN.finditer(own):
+            start, word = match.start(), match.group()
+            if start == 0 and continues:  # The tail of a word the previous segment indexed
+                continue
+            if match.end() == len(own):  # A word running on into the following chunks
+                word += run_on
+            found[word].append(char_base + start)
+    words = sorted((word.encode(), positions) for word, positions in found.items())
+    vocabulary = b"".join(word for word, _ in words)
+    word_ends = array("Q", accumulate((len(word) for word, _ in words), initial=0))
+    posting_ends = array("Q", accumulate((len(positions) for _, positions in words), initial=0))
+    postings = array("Q")
+    for _, positions in words:
+        postings.extend(positions)
+    return _Segment(data, 0, len(data), size, char_base, len(own), suffixes, minimums, checkpoints,
+                    vocabulary, word_ends, posting_ends, postings)
+
+
+def _segments(chunks, max_pattern: int, tokens: bool):
+    """Build one segment per chunk of text, each overlapping the next by max_pattern characters."""
+    chunks = iter(chunks)
+    current = next(chunks, "")
+    ahead = [next(chunks, "")]  # Chunks read but not indexed yet; "" is the end of the text
+    char_base, continues = 0, False
+    while current:
+        run_on = ""
+        if tokens and TOKEN.match(current[-1]):  # Read ahead while a word covers whole chunks
+            i = 0
+            while True:
+                if i == len(ahead):
+                    ahead.append(next(chunks, ""))
+                rest = TOKEN.match(ahead[i])
+                run_on += rest.group() if rest else ""
+                if not rest or rest.end() < len(ahead[i]):
+                    break
+                i += 1
+        following = ahead.pop(0)
+        yield _build_segment(current, following, run_on, char_base, max_pattern, tokens, continues)
+        continues = bool(TOKEN.match(current[-1])) and bool(TOKEN.match(following[:1]))
+        char_base += len(current)
+        current = following
+        if not ahead:
+            ahead.append(next(chunks, ""))
+
+
+@lru_cache(maxsize=1024)
+def _self_overlapping(pattern: str) -> bool:
+    """True if two occurrences can overlap: some proper prefix is also a suffix ("aa", "abab")."""
+    return any(pattern.startswith(pattern[-k:]) for k in range(1, len(pattern)))
+
+
+def _non_overlapping(positions: list[int], length: int) -> list[int]:
+    """Keep occurrences left to right, skipping any that start inside the previous one (like str.count)."""
+    kept, free = [], 0
+    for position in positions:
+        if position >= free:
+            kept.append(position)
+            free = position + length
+    return kept
+
+
+# --------------------------------------------------
+# One indexed segment
+# --------------------------------------------------
+class _Segment:
+    """
+    The text of one segment (`size` bytes of its own, then the overlap) at
+    data[offset:], with its suffix array and token index. `data` is bytes when
+    built in memory and the mmap when opened from a file: both slice to bytes.
+    """
+
+    __slots__ = ("data", "offset", "length", "size", "char_base", "chars", "suffixes", "minimums",
+                 "checkpoints", "vocabulary", "word_ends", "posting_ends", "postings")
+
+    def __init__(self, data, offset, length, size, char_base, chars, suffixes, minimums, checkpoints,
+                 vocabulary, word_ends, posting_ends, postings):
+        self.data, self.offset, self.length, self.size = data, offset, length, size
+        self.char_base, self.chars = char_base, chars
+        self.suffixes, self.minimums, self.checkpoints = suffixes, minimums, checkpoints
+        self.vocabulary, self.word_ends = vocabulary, word_ends
+        self.posting_ends, self.postings = posting_ends, postings
+
+    def range(self, pattern: bytes) -> tuple[int, int]:
+        """The slice of the suffix array whose suffixes start with `pattern`."""
+        data, offset, length, end = self.data, self.offset, len(pattern), self.offset + self.length
+        if end == len(data):  # Built in memory: the data is this segment's text alone
+            def prefix(i):
+                return data[i:i + length]
+        else:
+            def prefix(i):  # Never past the segment: in a file, its suffix array comes next
+                return data[offset + i:min(offset + i + length, end)]
+
+        low = bisect.bisect_left(self.suffixes, pattern, key=prefix)
+        return low, bisect.bisect_right(self.suffixes, pattern, low, key=prefix)
+
+    def first(self, low: int, high: int) -> int:
+        """Smallest byte position in suffixes[low:high]: whole blocks come from the stored minimums."""
+        suffixes = self.suffixes
+        first_block, last_block = -(-low // _BLOCK), high // _BLOCK
+        if first_block >= last_block:
+            return min(suffixes[low:high])
+        candidates = [min(self.minimums[first_block:last_block])]
+        if low < first_block * _BLOCK:
+            candidates.append(min(suffixes[low:first_block * _BLOCK]))
+        if high > last_block * _BLOCK:
+            candidates.append(min(suffixes[last_block * _BLOCK:high]))
+        return min(candidates)
+
+    def to_chars(self, positions) -> list[int]:
+        """Byte positions (sorted) -> str positions in the whole text."""
+        base = self.char_base
+        if self.checkpoints is None:  # ASCII: one byte per character
+            return [base + position for position in positions]
+        data, offset, checkpoints = self.data, self.offset, self.checkpoints
+        result = []
+        for position in positions:
+            block = position // _CHECKPOINT
+            start = offset + block * _CHECKPOINT
+            skipped = len(data[start:offset + position].translate(None, _CONTINUATION))
+            result.append(base + checkpoints[block] + skipped)
+        return result
+
+    def words(self) -> int:
+        return len(self.word_ends) - 1
+
+    def postings_of(self, word: bytes):
+        ends, vocabulary = self.word_ends, self.vocabulary
+        index = bisect.bisect_left(range(self.words()), word,
+                                   key=lambda i: bytes(vocabulary[ends[i]:ends[i + 1]]))
+        if index == self.words() or bytes(vocabulary[ends[index]:ends[index + 1]]) != word:
+            return ()
+        return self.postings[self.posting_ends[index]:self.posting_ends[index + 1]]
+
+
+# --------------------------------------------------
+# The index
+# --------------------------------------------------
+class TextIndex:
+    """Suffix arrays plus an inverted token index over one large text."""
+
+    def __init__(self, segments: list[_Segment], max_pattern: int = MAX_PATTERN):
+        self._segments = segments
+        self.max_pattern = max_pattern
+        self.chars = sum(segment.chars for segment in segments)
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def build(cls, text: str, *, segment_chars: int = SEGMENT_CHARS, max_pattern: int = MAX_PATTERN,
+              tokens: bool = True) -> "TextIndex":
+        """Index a str held in memory."""
+        if segment_chars < max_pattern:
+            raise ValueError(f"segment_chars ({segment_chars}) must be at least max_pattern ({max_pattern})")
+        chunks = (text[i:i + segment_chars] for i in range(0, len(text), segment_chars))
+        return cls(list(_segments(chunks, max_pattern, tokens)), max_pattern)
+
+    @classmethod
+    def build_file(cls, source: str, path: str, *, encoding: str = "utf-8",
+                   segment_chars: int = SEGMENT_CHARS, max_pattern: int = MAX_PATTERN,
+                   tokens: bool = True) -> "TextIndex":
+        """
+        Index a text file that may not fit in memory: each segment is written to
+        `path` as soon as it is built, then the whole index is opened memory-mapped.
+        Positions are those of open(source, encoding=encoding).read().
+        """
+        if segment_chars < max_pattern:
+            raise ValueError(f"segment_chars ({segment_chars}) must be at least max_pattern ({max_pattern})")
+        with open(source, encoding=encoding) as text, open(path, "wb") as f:
+            f.write(bytes(_HEADER.size))
+            chars = count = 0
+            for segment in _segments(iter(partial(text.read, segment_chars), ""), max_pattern, tokens):
+                _write_segment(f, segment)
+                chars += segment.chars
+                count += 1
+            f.seek(0)
+            f.write(_HEADER.pack(_MAGIC, 1, sys.byteorder[0].encode(), max_pattern, chars, count))
+        return cls.open(path)
+
+    # Substrings
+    def _encode(self, pattern: str) -> bytes:
+        raw = pattern.encode()
+        if len(raw) > self.max_pattern:
+            raise ValueError(f"pattern is {len(raw)} bytes; this index answers at most {self.max_pattern}")
+        return raw
+
+    def __len__(self) -> int:
+        return self.chars
+
+    def __contains__(self, pattern: str) -> bool:
+        return self.find(pattern) >= 0
+
+    def find(self, pattern: str) -> int:
+        """Lowest position of `pattern`, or -1 (like str.find)."""
+        if not pattern:
+            return 0
+        raw = self._encode(pattern)
+        for segment in self._segments:
+            low, high = segment.range(raw)
+            if low < high:
+                return segment.to_chars([segment.first(low, high)])[0]
+        return -1
+
+    def count(self, pattern: str, overlapping: bool = False) -> int:
+        """
+        Occurrences of `pattern`. Like str.count, occurrences that overlap an
+        earlier one are not counted unless overlapping=True ("aa" in "aaa": 1 or 2).
+        """
+        if not pattern:
+            return self.chars + 1
+        if not overlapping and _self_overlapping(pattern):
+            return len(self.find_all(pattern))
+        raw = self._encode(pattern)
+        return sum(high - low for low, high in map(lambda segment: segment.range(raw), self._segments))
+
+    def find_all(self, pattern: str, overlapping: bool = False) -> list[int]:
+        """Sorted positions of `pattern` (by default the ones re.finditer would give)."""
+        if not pattern:
+            return list(range(self.chars + 1))
+        raw = self._encode(pattern)
+        positions = []
+        for segment in self._segments:
+            low, high = segment.range(raw)
+            if low < high:
+                positions += segment.to_chars(sorted(segment.suffixes[low:high]))
+        if not overlapping and _self_overlapping(pattern):
+            positions = _non_overlapping(positions, len(pattern))
+        return positions
+
+    def count_many(self, patterns, overlapping: bool = False) -> dict[str, int]:
+        """count() for each pattern: with an index, many patterns is just many binary searches."""
+        return {pattern: self.count(pattern, overlapping) for pattern in patterns}
+
+    # Whole words
+    def postings(self, word: str) -> list[int]:
+        """Sorted start positions of `word` as a whole token (matched by TOKEN, case-sensitive)."""
+        raw = word.encode()
+        positions = []
+        for segment in self._segments:
+            positions.extend(segment.postings_of(raw))
+        return positions
+
+    def count_word(self, word: str) -> int:
+        raw = word.encode()
+        return sum(len(segment.postings_of(raw)) for segment in self._segments)
+
+    def vocabulary_size(self) -> int:
+        """Distinct tokens, counted per segment (a word in two segments counts twice)."""
+        return sum(segment.words() for segment in self._segments)
+
+    # Files
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, 1, sys.byteorder[0].encode(), self.max_pattern, self.chars,
+                                 len(self._segments)))
+            for segment in self._segments:
+                _write_segment(f, segment)
+
+    @classmethod
+    def open(cls, path: str) -> "TextIndex":
+        """
+        Reopen a saved index without reading it: text, suffix arrays and postings
+        are views into a read-only memory map, loaded page by page as queries touch them.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, order, max_pattern, chars, count = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or version != 1:
+            raise ValueError(f"{path} is not a saved TextIndex")
+        swap = order.decode() != sys.byteorder[0]
+        view = memoryview(mapped)
+        offset = _HEADER.size
+
+        def take(typecode: str, length: int):
+            nonlocal offset
+            offset += -offset % 8
+            raw = view[offset:offset + length * array(typecode).itemsize]
+            offset += len(raw)
+            if not swap:
+                return raw.cast(typecode)
+            values = array(typecode, raw.tobytes())  # Written with the other byte order: convert a copy
+            values.byteswap()
+            return values
+
+        segments = []
+        for _ in range(count):
+            offset += -offset % 8
+            (char_base, chars_here, data_size, size, suffix_count, checkpoint_count, words,
+             vocabulary_size, posting_count) = _SEGMENT.unpack_from(mapped, offset)
+            offset += _SEGMENT.size
+            data_offset = offset
+            offset += data_size
+            suffixes = take("I", suffix_count)
+            minimums = take("I", -(-suffix_count // _BLOCK))
+            checkpoints = take("Q", checkpoint_count) if checkpoint_count else None
+            word_ends = take("Q", words + 1)
+            vocabulary = take("B", vocabulary_size)
+            posting_ends = take("Q", words + 1)
+            postings = take("Q", posting_count)
+            segments.append(_Segment(mapped, data_offset, data_size, size, char_base, chars_here, suffixes, minimums,
+                                     checkpoints, vocabulary, word_ends, posting_ends, postings))
+        index = cls(segments, max_pattern)
+        index._mmap = mapped
+        return index
+
+    def close(self) -> None:
+        """Release the memory map of an opened index (its views must no longer be in use)."""
+        if self._mmap is not None:
+            self._segments = []
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> "TextIndex":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the index: text (with overlaps), suffix arrays, minimums, checkpoints and token index."""
+        total = 0
+        for segment in self._segments:
+            total += segment.length
+            for part in (segment.suffixes, segment.minimums, segment.checkpoints, segment.word_ends,
+                         segment.vocabulary, segment.posting_ends, segment.postings):
+                if part is not None:
+                    total += len(part) * (part.itemsize if hasattr(part, "itemsize") else 1)
+        return total
+
+    def __repr__(self) -> str:
+        source = "memory-mapped" if self._mmap is not None else "in memory"
+        return f"<TextIndex {self.chars:,} chars, {len(self._segments)} segments, {source}>"
+
+
+def _write_segment(f, segment: _Segment) -> None:
+    checkpoints = segment.checkpoints
+    f.write(b"\0" * (-f.tell() % 8))
+    f.write(_SEGMENT.pack(segment.char_base, segment.chars, segment.length, segment.size,
+                          len(segment.suffixes), 0 if checkpoints is None else len(checkpoints),
+                          segment.words(), len(segment.vocabulary), len(segment.postings)))
+    f.write(segment.data[segment.offset:segment.offset + segment.length])
+    for part in (segment.suffixes, segment.minimums, checkpoints, segment.word_ends,
+                 segment.vocabulary, segment.posting_ends, segment.postings):
+        if part is not None:
+            f.write(b"\0" * (-f.tell() % 8))
+            f.write(part)
+
+
+# --------------------------------------------------
+# Many patterns, one pass, no index: Aho-Corasick
+# --------------------------------------------------
+class AhoCorasick:
+    """
+    Finds every occurrence of every pattern in one left-to-right pass. The
+    patterns form a trie; each state also knows where to continue when the
+    next character does not extend it (the longest suffix that is still a
+    trie path), so every character is looked at exactly once, however many
+    patterns there are. Here those fallbacks are resolved ahead of time into
+    one dict per state: scanning is a single dict lookup per character.
+    """
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(patterns))
+        if not self.patterns or not all(self.patterns):
+            raise ValueError("AhoCorasick needs at least one pattern, and no empty ones")
+        trie: list[dict[str, int]] = [{}]
+        outputs: list[tuple[int, ...]] = [()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                following = trie[state].get(char)
+                if following is None:
+                    following = trie[state][char] = len(trie)
+                    trie.append({})
+                    outputs.append(())
+                state = following
+            outputs[state] = (index,)
+
+        # Breadth first, so a state's fallback (always shallower) is complete before the state itself
+        fallback = [0] * len(trie)
+        moves = [dict(trie[0])] + [None] * (len(trie) - 1)
+        queue = list(trie[0].values())
+        for state in queue:
+            moves_back = moves[fallback[state]]
+            outputs[state] += outputs[fallback[state]]
+            for char, child in trie[state].items():
+                fallback[child] = moves_back.get(char, 0) if state else 0
+                queue.append(child)
+            moves[state] = moves_back | trie[state]
+        self._moves = [table.get for table in moves]
+        self._outputs = [tuple((self.patterns[i], len(self.patterns[i])) for i in found) for found in outputs]
+        self.states = len(trie)
+
+    def _scan(self, chunks):
+        moves, outputs = self._moves, self._outputs
+        state, end = 0, 0
+        for chunk in chunks:
+            for end, char in enumerate(chunk, end + 1):
+                state = moves[state](char, 0)
+                if outputs[state]:
+                    for pattern, length in outputs[state]:
+                        yield end - length, pattern
+
+    def finditer(self, text: str):
+        """(start, pattern) for every occurrence, overlaps included, in order of where they end."""
+        return self._scan((text,))
+
+    def scan(self, stream, chunk_chars: int = 1 << 20):
+        """finditer() over a text file object, read chunk by chunk: matches across chunk ends are found."""
+        return self._scan(iter(partial(stream.read, chunk_chars), ""))
+
+    def count(self, text: str) -> Counter:
+        """Occurrences of each pattern (overlaps included)."""
+        return Counter(pattern for _, pattern in self.finditer(text))
+
+
+# Example of code that should only run when text_index.py is executed directly
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    text = ("Strings are immutable. A string method returns a new string; "
+            "the string itself never changes. Ünïcödé text works too: naïve café, naïve résumé. ") * 3
+    index = TextIndex.build(text, segment_chars=300)
+    print(index)
+    for pattern in ("string", "naïve", "é", "never", "absent"):
+        print(f"{pattern!r:10} find {index.find(pattern):>4} (str: {text.find(pattern):>4})   "
+              f"count {index.count(pattern)} (str: {text.count(pattern)})")
+    print("all 'string':", index.find_all("string"))
+    print("whole word 'string':", index.postings("string"))
+
+    path = os.path.join(tempfile.mkdtemp(), "text.idx")
+    index.save(path)
+    with TextIndex.open(path) as reopened:
+        print(f"{os.path.getsize(path):,} bytes on disk; reopened: {reopened}, "
+              f"find('café') = {reopened.find('café')}")
+
+    matcher = AhoCorasick(["string", "ring", "naïve", "text"])
+    print(matcher.count(text))
+    print(list(matcher.finditer("strings and rings")))
@@ -0,0 +1,86 @@
+# bench_matrix.py: Compare the flat Matrix against the nested-list matrix
+# Usage: python bench_matrix.py [--sizes 100 1000 4000] [--max-matmul 200]
+# Pure-Python O(n^3) multiplication of 4000x4000 takes hours, so matmul is
+# skipped above --max-matmul unless NumPy is installed.
+
+import argparse
+import random
+import sys
+import time
+
+from matrix import Matrix, np
+
+
+def time_it(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def nested_transpose(m: list[list[float]]) -> list[list[float]]:
+    return [[m[r][c] for r in range(len(m))] for c in range(len(m[0]))]
+
+
+def nested_matmul(a: list[list[float]], b: list[list[float]]) -> list[list[float]]:
+    # The textbook triple loop over matrix[row][col]
+    n, m, p = len(a), len(b), len(b[0])
+    c = [[0.0] * p for _ in range(n)]
+    for i in range(n):
+        for j in range(p):
+            total = 0.0
+            for k in range(m):
+                total += a[i][k] * b[k][j]
+            c[i][j] = total
+    return c
+
+
+def nested_sum(m: list[list[float]]) -> float:
+    total = 0.0
+    for r in range(len(m)):
+        for c in range(len(m[0])):
+            total += m[r][c]
+    return total
+
+
+def flat_sum(m: Matrix) -> float:
+    total = 0.0
+    for r in range(m.rows):
+        for c in range(m.cols):
+            total += m[r, c]
+    return total
+
+
+def nested_bytes(m: list[list[float]]) -> int:
+    # Outer list + each row list + each float object
+    return sys.getsizeof(m) + sum(sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row) for row in m)
+
+
+def run(size: int, max_matmul: int) -> None:
+    rng = random.Random(size)
+    nested = [[rng.random() for _ in range(size)] for _ in range(size)]
+    flat = Matrix.from_nested(nested)
+
+    print(f"\n--- {size} x {size} ---")
+    print(f"memory:     nested {nested_bytes(nested) / 1e6:9.2f} MB   flat {size * size * 8 / 1e6:9.2f} MB")
+    print(f"[r][c] sum: nested {time_it(lambda: nested_sum(nested)):9.4f} s    flat {time_it(lambda: flat_sum(flat)):9.4f} s")
+    print(f"transpose:  nested {time_it(lambda: nested_transpose(nested)):9.4f} s    flat {time_it(flat.transpose):9.4f} s"
+          f"   (.T view {time_it(lambda: flat.T):.6f} s)")
+    if size <= max_matmul or np is not None:
+        nested_time = time_it(lambda: nested_matmul(nested, nested)) if size <= max_matmul else float("nan")
+        print(f"matmul:     nested {nested_time:9.4f} s    flat {time_it(lambda: flat @ flat):9.4f} s")
+    else:
+        print(f"matmul:     skipped (size > --max-matmul {max_matmul} and NumPy is not installed)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 4000])
+    parser.add_argument("--max-matmul", type=int, default=200, help="largest size to multiply in pure Python")
+    args = parser.parse_args()
+    print(f"NumPy fast path: {'on' if np is not None else 'off'}")
+    for size in args.sizes:
+        run(size, args.max_matmul)
+
+
+if __name__ == "__main__":
+    main()
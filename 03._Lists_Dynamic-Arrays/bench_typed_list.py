@@ -0,0 +1,78 @@
+# bench_typed_list.py: Compare memory and speed of TypedList against a plain list
+# Usage: python bench_typed_list.py [--max-power 8]
+# Sizes run from 10**3 up to 10**max-power (10**8 needs several GB of RAM for the list side).
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from typed_list import TypedList
+
+
+def measure_memory(build) -> tuple[object, int]:
+    """Run build() and return (result, bytes allocated while building it)."""
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak
+
+
+def time_it(func) -> float:
+    """Return seconds taken by one call of func()."""
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def build_by_append(container_type, values):
+    container = container_type()
+    append = container.append
+    for value in values:
+        append(value)
+    return container
+
+
+def random_values(size: int, seed: int = 42):
+    """Yield the same pseudo-random int64 values on every call."""
+    rng = random.Random(seed)
+    return (rng.randrange(-(2**62), 2**62) for _ in range(size))
+
+
+def run(size: int) -> None:
+    # Build each container from a generator so the list pays for its own int objects
+    plain, plain_bytes = measure_memory(lambda: list(random_values(size)))
+    typed, typed_bytes = measure_memory(lambda: TypedList("q", random_values(size)))
+    values = plain
+
+    timings = {}
+    for name, factory in (("list", list), ("TypedList", lambda: TypedList("q"))):
+        timings[name] = {
+            "append": time_it(lambda: build_by_append(factory, values)),
+        }
+    # Slicing: list copies, TypedList.view() does not
+    timings["list"]["slice"] = time_it(lambda: plain[size // 4 : 3 * size // 4])
+    timings["TypedList"]["slice"] = time_it(lambda: typed.view(size // 4, 3 * size // 4))
+    timings["list"]["sort"] = time_it(lambda: plain.copy().sort())
+    timings["TypedList"]["sort"] = time_it(lambda: typed.copy().sort())
+
+    print(f"\n--- n = {size:,} ---")
+    print(f"{'':<10}{'memory':>14}{'append':>12}{'slice':>12}{'sort':>12}")
+    for name, used in (("list", plain_bytes), ("TypedList", typed_bytes)):
+        t = timings[name]
+        print(f"{name:<10}{used / 1e6:>11.2f} MB{t['append']:>11.4f}s{t['slice']:>11.6f}s{t['sort']:>11.4f}s")
+    print(f"Memory saved: {plain_bytes / max(typed_bytes, 1):.1f}x smaller")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--min-power", type=int, default=3)
+    parser.add_argument("--max-power", type=int, default=6, help="largest size is 10**max-power (up to 8)")
+    args = parser.parse_args()
+    for power in range(args.min_power, args.max_power + 1):
+        run(10**power)
+
+
+if __name__ == "__main__":
+    main()
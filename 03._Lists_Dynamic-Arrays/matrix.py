@@ -0,0 +1,248 @@
+# matrix.py: A 2D matrix stored in ONE flat, row-major buffer
+# A nested list (matrix[row][col]) needs two pointer hops per access and its rows
+# live in unrelated places in memory. Matrix keeps every value in a single
+# `array('d')` and finds element (r, c) with arithmetic:
+#     index = offset + r * row_stride + c * col_stride
+# Rows, columns, sub-blocks and the transpose are just different
+# (offset, shape, strides) over the same buffer, so they copy nothing.
+
+from array import array
+from collections.abc import Iterable
+
+try:  # Optional fast path: NumPy does the math in C when it is installed
+    import numpy as np
+except ImportError:
+    np = None
+
+# Block size for cache-blocked loops: 64 x 64 doubles = 32 KB, about one L1 cache
+BLOCK_SIZE = 64
+
+
+class Matrix:
+    """
+    A rows x cols matrix of floats backed by one contiguous buffer.
+
+    Views returned by row(), col(), block() and .T share that buffer:
+    writing through a view changes the original matrix.
+    """
+
+    __slots__ = ("_data", "rows", "cols", "_offset", "_row_stride", "_col_stride")
+
+    def __init__(self, rows: int, cols: int, values: Iterable[float] | None = None):
+        if rows < 0 or cols < 0:
+            raise ValueError("rows and cols must be non-negative")
+        if values is None:
+            data = array("d", bytes(8 * rows * cols))  # All zeros, no Python loop
+        else:
+            data = array("d", values)
+            if len(data) != rows * cols:
+                raise ValueError(f"expected {rows * cols} values, got {len(data)}")
+        self._data = data
+        self.rows, self.cols = rows, cols
+        self._offset, self._row_stride, self._col_stride = 0, cols, 1
+
+    # --- Constructors ---
+    @classmethod
+    def from_nested(cls, nested: list[list[float]]) -> "Matrix":
+        """Build a Matrix from the nested-list form: [[1, 2], [3, 4]]."""
+        rows = len(nested)
+        cols = len(nested[0]) if rows else 0
+        if any(len(row) != cols for row in nested):
+            raise ValueError("all rows must have the same length")
+        return cls(rows, cols, (value for row in nested for value in row))
+
+    @classmethod
+    def identity(cls, size: int) -> "Matrix":
+        result = cls(size, size)
+        result._data[:: size + 1] = array("d", [1.0] * size)
+        return result
+
+    @classmethod
+    def _view(cls, data: array, rows: int, cols: int, offset: int, row_stride: int, col_stride: int) -> "Matrix":
+        view = cls.__new__(cls)
+        view._data = data
+        view.rows, view.cols = rows, cols
+        view._offset, view._row_stride, view._col_stride = offset, row_stride, col_stride
+        return view
+
+    # --- Shape & layout ---
+    @property
+    def shape(self) -> tuple[int, int]:
+        return (self.rows, self.cols)
+
+    @property
+    def is_contiguous(self) -> bool:
+        """True when the values are laid out row after row with no gaps."""
+        return self._col_stride == 1 and (self._row_stride == self.cols or self.rows <= 1)
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.rows}x{self.cols}, {self.tolist()!r})"
+
+    # --- Element access ---
+    def _index(self, r: int, c: int) -> int:
+        if r < 0:
+            r += self.rows
+        if c < 0:
+            c += self.cols
+        if not (0 <= r < self.rows and 0 <= c < self.cols):
+            raise IndexError(f"index ({r}, {c}) out of range for {self.rows}x{self.cols} matrix")
+        return self._offset + r * self._row_stride + c * self._col_stride
+
+    def __getitem__(self, key: tuple[int, int]) -> float:
+        r, c = key
+        return self._data[self._index(r, c)]
+
+    def __setitem__(self, key: tuple[int, int], value: float) -> None:
+        r, c = key
+        self._data[self._index(r, c)] = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.shape == other.shape and self.tolist() == other.tolist()
+
+    __hash__ = None
+
+    # --- Zero-copy views ---
+    def row(self, r: int) -> "Matrix":
+        """Row r as a 1 x cols view."""
+        return Matrix._view(self._data, 1, self.cols, self._index(r, 0), self._row_stride, self._col_stride)
+
+    def col(self, c: int) -> "Matrix":
+        """Column c as a rows x 1 view."""
+        return Matrix._view(self._data, self.rows, 1, self._index(0, c), self._row_stride, self._col_stride)
+
+    def block(self, row_start: int, row_stop: int, col_start: int, col_stop: int) -> "Matrix":
+        """The sub-matrix [row_start:row_stop, col_start:col_stop] as a view."""
+        row_start, row_stop, _ = slice(row_start, row_stop).indices(self.rows)
+        col_start, col_stop, _ = slice(col_start, col_stop).indices(self.cols)
+        rows, cols = max(row_stop - row_start, 0), max(col_stop - col_start, 0)
+        offset = self._offset + row_start * self._row_stride + col_start * self._col_stride
+        return Matrix._view(self._data, rows, cols, offset, self._row_stride, self._col_stride)
+
+    @property
+    def T(self) -> "Matrix":
+        """Transpose as a view (swap the strides, copy nothing)."""
+        return Matrix._view(self._data, self.cols, self.rows, self._offset, self._col_stride, self._row_stride)
+
+    # --- Copies ---
+    def _row_values(self, r: int):
+        start = self._offset + r * self._row_stride
+        stop = start + self.cols * self._col_stride
+        return self._data[start:stop:self._col_stride] if self.cols else array("d")
+
+    def copy(self) -> "Matrix":
+        """A new contiguous matrix with the same values."""
+        if self.is_contiguous:
+            values = self._data[self._offset : self._offset + self.rows * self.cols]
+        else:
+            values = array("d")
+            for r in range(self.rows):
+                values.extend(self._row_values(r))
+        return Matrix._view(values, self.rows, self.cols, 0, self.cols, 1)
+
+    def tolist(self) -> list[list[float]]:
+        """Back to the nested-list form."""
+        return [self._row_values(r).tolist() for r in range(self.rows)]
+
+    def transpose(self) -> "Matrix":
+        """A contiguous transposed copy, built one cache-sized tile at a time."""
+        if np is not None:
+            return _from_numpy(_as_numpy(self).T)
+        src = self.copy()._data
+        rows, cols = self.rows, self.cols
+        out = array("d", bytes(8 * rows * cols))
+        for r0 in range(0, rows, BLOCK_SIZE):
+            r1 = min(r0 + BLOCK_SIZE, rows)
+            for c0 in range(0, cols, BLOCK_SIZE):
+                c1 = min(c0 + BLOCK_SIZE, cols)
+                for c in range(c0, c1):
+                    # Column c of the tile becomes row c of the output
+                    out[c * rows + r0 : c * rows + r1] = src[r0 * cols + c : r1 * cols + c : cols]
+        return Matrix._view(out, cols, rows, 0, rows, 1)
+
+    # --- Arithmetic ---
+    def __matmul__(self, other: "Matrix") -> "Matrix":
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.cols != other.rows:
+            raise ValueError(f"shape mismatch: {self.shape} @ {other.shape}")
+        if np is not None:
+            return _from_numpy(_as_numpy(self) @ _as_numpy(other))
+        return _blocked_matmul(self, other)
+
+    def __add__(self, other: "Matrix") -> "Matrix":
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        if self.shape != other.shape:
+            raise ValueError(f"shape mismatch: {self.shape} + {other.shape}")
+        a, b = self.copy()._data, other.copy()._data
+        return Matrix._view(array("d", map(float.__add__, a, b)), self.rows, self.cols, 0, self.cols, 1)
+
+
+def _blocked_matmul(a: Matrix, b: Matrix) -> Matrix:
+    """
+    Pure-Python C = A @ B in (i, k, j) order over BLOCK_SIZE tiles.
+
+    The innermost step adds `a_ik * B[k, j0:j1]` to `C[i, j0:j1]`, so it walks
+    both rows left to right in memory instead of striding down a column.
+    """
+    n, m, p = a.rows, a.cols, b.cols
+    a_rows = [a._row_values(i).tolist() for i in range(n)]
+    b_rows = [b._row_values(k).tolist() for k in range(m)]
+    c_rows = [[0.0] * p for _ in range(n)]
+    for i0 in range(0, n, BLOCK_SIZE):
+        i1 = min(i0 + BLOCK_SIZE, n)
+        for k0 in range(0, m, BLOCK_SIZE):
+            k1 = min(k0 + BLOCK_SIZE, m)
+            for j0 in range(0, p, BLOCK_SIZE):
+                j1 = min(j0 + BLOCK_SIZE, p)
+                for i in range(i0, i1):
+                    a_row = a_rows[i]
+                    c_tile = c_rows[i][j0:j1]
+                    for k in range(k0, k1):
+                        a_ik = a_row[k]
+                        if a_ik:
+                            c_tile = [c + a_ik * b for c, b in zip(c_tile, b_rows[k][j0:j1])]
+                    c_rows[i][j0:j1] = c_tile
+    out = array("d")
+    for row in c_rows:
+        out.extend(row)
+    return Matrix._view(out, n, p, 0, p, 1)
+
+
+def _as_numpy(m: Matrix):
+    """Wrap the shared buffer as a strided NumPy array (no copy)."""
+    itemsize = m._data.itemsize
+    base = np.frombuffer(m._data, dtype=np.float64)
+    return np.lib.stride_tricks.as_strided(
+        base[m._offset :],
+        shape=m.shape,
+        strides=(m._row_stride * itemsize, m._col_stride * itemsize),
+        writeable=False,
+    )
+
+
+def _from_numpy(values) -> Matrix:
+    rows, cols = values.shape
+    out = array("d")
+    out.frombytes(np.ascontiguousarray(values, dtype=np.float64).tobytes())
+    return Matrix._view(out, rows, cols, 0, cols, 1)
+
+
+# Example of code that should only run when matrix.py is executed directly
+if __name__ == "__main__":
+    m = Matrix.from_nested([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+    print(f"Matrix: {m.tolist()}")
+    print(f"m[1, 2] = {m[1, 2]}  (same element as nested matrix[1][2])")
+    print(f"Row 0 view: {m.row(0).tolist()}")
+    print(f"Column 1 view: {m.col(1).tolist()}")
+    print(f"Block [0:2, 1:3] view: {m.block(0, 2, 1, 3).tolist()}")
+    print(f"Transpose view: {m.T.tolist()}")
+    m.col(0)[0, 0] = 100  # Writing through a view changes the original
+    print(f"After writing 100 through col(0): {m.tolist()}")
+    print(f"m @ identity: {(m @ Matrix.identity(3)).tolist()}")
+    print(f"NumPy fast path: {'on' if np is not None else 'off (NumPy not installed)'}")
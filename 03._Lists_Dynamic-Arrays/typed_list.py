@@ -0,0 +1,188 @@
+# typed_list.py: A compact, list-like container for numbers
+# A normal list stores a pointer to a separate int/float object for every item
+# (28+ bytes each). TypedList keeps the raw numbers side by side in one
+# contiguous `array.array` buffer, so an int64 costs exactly 8 bytes.
+
+from array import array
+from collections.abc import Iterable, MutableSequence
+
+# Typecodes from the `array` module that hold numbers (see `array.typecodes`)
+NUMERIC_TYPECODES = "bBhHiIlLqQfd"
+
+
+class TypedList(MutableSequence):
+    """
+    A list of numbers stored in a single contiguous buffer.
+
+    Supports the usual list methods (append, insert, extend, pop, remove,
+    index, count, sort, reverse, copy, clear) plus:
+    - view(): zero-copy slices through `memoryview`
+    - the buffer protocol, so `memoryview(tl)`, `bytes(tl)` and NumPy can read it
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, typecode: str = "q", values: Iterable = ()):
+        if typecode not in NUMERIC_TYPECODES:
+            raise ValueError(f"typecode must be one of {NUMERIC_TYPECODES!r}, got {typecode!r}")
+        self._data = array(typecode, values)
+
+    # --- Basic info ---
+    @property
+    def typecode(self) -> str:
+        """The `array` typecode, e.g. 'q' for int64 or 'd' for float64."""
+        return self._data.typecode
+
+    @property
+    def itemsize(self) -> int:
+        """Bytes used by one element."""
+        return self._data.itemsize
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the elements themselves (no per-item objects)."""
+        return len(self._data) * self._data.itemsize
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"TypedList({self.typecode!r}, {self._data.tolist()!r})"
+
+    # --- Element access ---
+    def __getitem__(self, index):
+        # Slicing returns a new TypedList, exactly like list slicing returns a new list.
+        # Use view() when you want a slice without copying.
+        if isinstance(index, slice):
+            return TypedList._wrap(self._data[index])
+        return self._data[index]
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice) and not isinstance(value, array):
+            value = array(self.typecode, value)
+        self._data[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._data[index]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, value) -> bool:
+        return value in self._data
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, TypedList):
+            return self._data == other._data
+        if isinstance(other, (list, array)):
+            return list(self._data) == list(other)
+        return NotImplemented
+
+    __hash__ = None  # Mutable, like list
+
+    # --- List methods (same names and behaviour as list) ---
+    def append(self, value) -> None:
+        self._data.append(value)
+
+    def insert(self, index: int, value) -> None:
+        self._data.insert(index, value)
+
+    def extend(self, values: Iterable) -> None:
+        if isinstance(values, TypedList):
+            values = values._data
+        if isinstance(values, array) and values.typecode == self.typecode:
+            self._data.extend(values)  # Fast path: one memcpy
+        else:
+            self._data.extend(array(self.typecode, values))
+
+    def pop(self, index: int = -1):
+        return self._data.pop(index)
+
+    def remove(self, value) -> None:
+        self._data.remove(value)
+
+    def index(self, value, start: int = 0, stop: int | None = None) -> int:
+        stop = len(self._data) if stop is None else stop
+        return self._data.index(value, start, stop)
+
+    def count(self, value) -> int:
+        return self._data.count(value)
+
+    def reverse(self) -> None:
+        self._data.reverse()
+
+    def sort(self, *, key=None, reverse: bool = False) -> None:
+        # array has no sort(); sorted() boxes the numbers temporarily,
+        # then the result is packed straight back into a flat buffer.
+        self._data = array(self.typecode, sorted(self._data, key=key, reverse=reverse))
+
+    def copy(self) -> "TypedList":
+        return TypedList._wrap(array(self.typecode, self._data))
+
+    def clear(self) -> None:
+        del self._data[:]
+
+    def __add__(self, other) -> "TypedList":
+        result = self.copy()
+        result.extend(other)
+        return result
+
+    def __iadd__(self, other) -> "TypedList":
+        self.extend(other)
+        return self
+
+    def __mul__(self, times: int) -> "TypedList":
+        return TypedList._wrap(self._data * times)
+
+    __rmul__ = __mul__
+
+    # --- Zero-copy access ---
+    def view(self, start: int | None = None, stop: int | None = None, step: int | None = None) -> memoryview:
+        """
+        Return a memoryview over part of the buffer WITHOUT copying.
+
+        Note: while any view is alive the list cannot grow or shrink
+        (append/pop raise BufferError). Call `.release()` on the view,
+        or use it in a `with` block, when you are done.
+        """
+        return memoryview(self._data)[start:stop:step]
+
+    def __buffer__(self, flags: int) -> memoryview:
+        # Python 3.12+ buffer protocol (PEP 688): memoryview(tl), bytes(tl), numpy.asarray(tl)
+        return memoryview(self._data)
+
+    def __release_buffer__(self, view: memoryview) -> None:
+        view.release()
+
+    def tobytes(self) -> bytes:
+        return self._data.tobytes()
+
+    @classmethod
+    def frombytes(cls, typecode: str, data: bytes) -> "TypedList":
+        result = cls(typecode)
+        result._data.frombytes(data)
+        return result
+
+    @classmethod
+    def _wrap(cls, data: array) -> "TypedList":
+        # Build a TypedList around an existing array without copying it
+        result = cls.__new__(cls)
+        result._data = data
+        return result
+
+
+# Example of code that should only run when typed_list.py is executed directly
+if __name__ == "__main__":
+    numbers = TypedList("q", [50, 10, 40, 20, 30])
+    print(f"Created: {numbers}")
+    numbers.append(60)
+    numbers.insert(0, 5)
+    numbers.extend([70, 80])
+    print(f"After append/insert/extend: {numbers}")
+    print(f"pop() -> {numbers.pop()}, pop(0) -> {numbers.pop(0)}")
+    numbers.sort()
+    print(f"After sort(): {numbers}")
+    print(f"numbers[1:4] (copy): {numbers[1:4]}")
+    with numbers.view(1, 4) as window:
+        print(f"numbers.view(1, 4) (zero-copy): {window.tolist()}")
+    print(f"{len(numbers)} items use {numbers.nbytes} bytes ({numbers.itemsize} per item)")
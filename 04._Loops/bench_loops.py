@@ -0,0 +1,54 @@
+# bench_loops.py: ns per element for every loop in the lesson, written every way
+# Runs loop_harness.run(): each task (for, enumerate, range, while, nested,
+# for/else, counting) as an explicit loop, a comprehension, map/itertools,
+# a built-in and, when NumPy is installed, a vectorized version. Every result
+# is checked against the explicit loop's. Then a summary: for each task, the
+# fastest kind at the largest size and how many times faster than the loop.
+# Usage: python bench_loops.py [--sizes 100 10000 1000000] [--tasks sum_squares ...] [--no-numpy]
+
+import argparse
+
+from loop_harness import KINDS, TASKS, np, print_report, run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+    parser.add_argument("--tasks", nargs="+", default=list(TASKS), choices=list(TASKS))
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    parser.add_argument("--no-numpy", action="store_true", help="skip the numpy variants even if installed")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timed batch")
+    args = parser.parse_args()
+
+    kinds = [kind for kind in args.kinds if not (args.no_numpy and kind == "numpy")]
+    print(f"NumPy: {'installed' if np is not None else 'not installed'}"
+          f"{'' if 'numpy' in kinds else ' (skipped)'}")
+    results = run(args.tasks, args.sizes, kinds, args.repeat, args.min_time)
+    print_report(results)
+
+    wrong = [result for result in results if not result.ok]
+    for result in wrong:
+        print(f"DIFFERENT RESULT: {result.task} / {result.variant} at n={result.size:,}")
+
+    largest = max(args.sizes)
+    baseline_name = "the first explicit loop" if "loop" in kinds else "the first variant that ran"
+    print(f"\nfastest at n={largest:,} (x = times faster than {baseline_name})")
+    for task in args.tasks:
+        rows = [r for r in results if r.task == task and r.size == largest and r.variant != "np.array(input)"]
+        if not rows:
+            continue
+        loop = next((r for r in rows if r.kind == "loop"), rows[0])  # --kinds may leave out "loop"
+        best = {}
+        for result in rows:
+            if result.ok and (result.kind not in best or result.ns_per_item < best[result.kind].ns_per_item):
+                best[result.kind] = result
+        cells = "  ".join(f"{kind} {loop.ns_per_item / result.ns_per_item:.1f}x"
+                          for kind, result in sorted(best.items(), key=lambda item: item[1].ns_per_item))
+        print(f"  {task:<22}{cells}")
+    if wrong:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,453 @@
+# loop_harness.py: The same loop written five ways, checked and timed together
+# Every loop in this lesson (for, enumerate, range, while, nested loops,
+# for/else) is a Task here, implemented several ways:
+#   loop            an explicit for / while loop, as in the README
+#   comprehension   a list comprehension or generator expression
+#   functional      map / filter / itertools
+#   builtin         a built-in that does the whole loop in C (sum, max, list.index, math.sumprod...)
+#   numpy           a vectorized NumPy version (only when NumPy is installed)
+# run() makes the input for each size, checks that every variant returns the
+# same result as the first one, then reports nanoseconds per element.
+#
+#   results = run(sizes=[100, 10_000, 1_000_000])
+#   print_report(results)
+#
+# New tasks: task = Task("name", "the loop in one line", make_input), then
+# @task.variant("loop", "for + append") on each implementation.
+
+import bisect
+import math
+import operator
+import random
+import time
+from collections import namedtuple
+from itertools import accumulate, compress, count, product, repeat, starmap
+
+try:  # Optional: vectorized versions run only when NumPy is installed
+    import numpy as np
+except ImportError:
+    np = None
+
+KINDS = ("loop", "comprehension", "functional", "builtin", "numpy")
+
+Result = namedtuple("Result", "task variant kind size ns_per_item ok")
+
+
+# --------------------------------------------------
+# Tasks and variants
+# --------------------------------------------------
+class Task:
+    """One loop, its input generator and every implementation of it."""
+
+    def __init__(self, name: str, example: str, make_input, items=len):
+        self.name = name
+        self.example = example
+        self.make_input = make_input      # (size, random.Random) -> input
+        self.items = items                # input -> number of elements processed
+        self.variants: dict[str, tuple[str, object]] = {}
+        TASKS[name] = self
+
+    def variant(self, kind: str, name: str):
+        """Register the decorated function as the `kind` implementation called `name`."""
+        if kind not in KINDS:
+            raise ValueError(f"kind must be one of {KINDS}, not {kind!r}")
+
+        def register(function):
+            self.variants[name] = (kind, function)
+            return function
+        return register
+
+    def __repr__(self) -> str:
+        return f"Task({self.name!r}, {len(self.variants)} variants)"
+
+
+TASKS: dict[str, Task] = {}
+
+
+def _numbers(size: int, rng: random.Random) -> list[int]:
+    return [rng.randrange(1000) for _ in range(size)]
+
+
+def _to_numpy(value):
+    """Inputs for the numpy variants: lists become arrays, tuples are converted item by item."""
+    if isinstance(value, tuple):
+        return tuple(_to_numpy(item) for item in value)
+    if isinstance(value, list):
+        return np.array(value)
+    return value
+
+
+# for item in my_list
+sum_squares = Task("sum_squares", "total = 0; for x in xs: total += x * x", _numbers)
+
+
+@sum_squares.variant("loop", "for + accumulator")
+def _(xs):
+    total = 0
+    for x in xs:
+        total += x * x
+    return total
+
+
+@sum_squares.variant("comprehension", "sum(generator)")
+def _(xs):
+    return sum(x * x for x in xs)
+
+
+@sum_squares.variant("comprehension", "sum([list])")
+def _(xs):
+    return sum([x * x for x in xs])
+
+
+@sum_squares.variant("functional", "sum(map(mul))")
+def _(xs):
+    return sum(map(operator.mul, xs, xs))
+
+
+@sum_squares.variant("builtin", "math.sumprod")
+def _(xs):
+    return math.sumprod(xs, xs)
+
+
+@sum_squares.variant("numpy", "np.dot")
+def _(xs):
+    return int(np.dot(xs, xs))
+
+
+# for index, value in enumerate(my_list)
+above = Task("indices_above", "for i, x in enumerate(xs): if x > 900: out.append(i)", _numbers)
+
+
+@above.variant("loop", "enumerate + append")
+def _(xs):
+    found = []
+    for index, value in enumerate(xs):
+        if value > 900:
+            found.append(index)
+    return found
+
+
+@above.variant("loop", "range(len) + index")
+def _(xs):
+    found = []
+    for index in range(len(xs)):
+        if xs[index] > 900:
+            found.append(index)
+    return found
+
+
+@above.variant("comprehension", "[i for i, x in enumerate]")
+def _(xs):
+    return [index for index, value in enumerate(xs) if value > 900]
+
+
+@above.variant("functional", "compress(count(), map(gt))")
+def _(xs):
+    return list(compress(count(), map(operator.gt, xs, repeat(900))))
+
+
+@above.variant("numpy", "np.flatnonzero")
+def _(xs):
+    return np.flatnonzero(xs > 900)
+
+
+# for i in range(n)
+squares = Task("squares", "out = []; for i in range(n): out.append(i * i)",
+               lambda size, rng: size, items=lambda n: n)
+
+
+@squares.variant("loop", "for + append")
+def _(n):
+    values = []
+    for i in range(n):
+        values.append(i * i)
+    return values
+
+
+@squares.variant("loop", "for + bound append")
+def _(n):
+    values = []
+    append = values.append
+    for i in range(n):
+        append(i * i)
+    return values
+
+
+@squares.variant("comprehension", "[i * i for i in range]")
+def _(n):
+    return [i * i for i in range(n)]
+
+
+@squares.variant("functional", "list(map(mul))")
+def _(n):
+    numbers = range(n)
+    return list(map(operator.mul, numbers, numbers))
+
+
+@squares.variant("numpy", "np.arange ** 2")
+def _(n):
+    return np.arange(n) ** 2
+
+
+# while condition
+first_over = Task("first_over_limit", "while total <= limit: total += xs[i]; i += 1",
+                  lambda size, rng: (_numbers(size, rng), 500 * size * 9 // 10),
+                  items=lambda value: len(value[0]))
+
+
+@first_over.variant("loop", "while")
+def _(xs, limit):
+    total, index = 0, 0
+    while index < len(xs):
+        total += xs[index]
+        if total > limit:
+            return index
+        index += 1
+    return -1
+
+
+@first_over.variant("loop", "for + break")
+def _(xs, limit):
+    total = 0
+    for index, value in enumerate(xs):
+        total += value
+        if total > limit:
+            return index
+    return -1
+
+
+@first_over.variant("comprehension", "next(generator)")
+def _(xs, limit):
+    return next((index for index, total in enumerate(accumulate(xs)) if total > limit), -1)
+
+
+@first_over.variant("builtin", "bisect(accumulate)")
+def _(xs, limit):
+    totals = list(accumulate(xs))
+    index = bisect.bisect_right(totals, limit)
+    return index if index < len(totals) else -1
+
+
+@first_over.variant("numpy", "searchsorted(cumsum)")
+def _(xs, limit):
+    totals = np.cumsum(xs)
+    index = int(np.searchsorted(totals, limit, side="right"))
+    return index if index < len(totals) else -1
+
+
+# for i in range(k): for j in range(k)
+table = Task("multiplication_table", "for i in range(k): for j in range(k): out.append(i * j)",
+             lambda size, rng: math.isqrt(size), items=lambda k: k * k)
+
+
+@table.variant("loop", "nested for")
+def _(k):
+    values = []
+    for i in range(k):
+        for j in range(k):
+            values.append(i * j)
+    return values
+
+
+@table.variant("comprehension", "nested comprehension")
+def _(k):
+    return [i * j for i in range(k) for j in range(k)]
+
+
+@table.variant("functional", "starmap(mul, product)")
+def _(k):
+    return list(starmap(operator.mul, product(range(k), repeat=2)))
+
+
+@table.variant("functional", "row by map(i.__mul__)")
+def _(k):
+    values = []
+    numbers = range(k)
+    for i in numbers:
+        values += map(i.__mul__, numbers)
+    return values
+
+
+@table.variant("numpy", "np.outer")
+def _(k):
+    numbers = np.arange(k)
+    return np.outer(numbers, numbers).ravel()
+
+
+# for ... else
+search = Task("find_or_minus_one", "for i, x in enumerate(xs): if x == target: break / else: i = -1",
+              lambda size, rng: (_numbers(size, rng), 1000),  # Never present: a full scan
+              items=lambda value: len(value[0]))
+
+
+@search.variant("loop", "for / else")
+def _(xs, target):
+    for index, value in enumerate(xs):
+        if value == target:
+            break
+    else:
+        index = -1
+    return index
+
+
+@search.variant("comprehension", "next(generator, -1)")
+def _(xs, target):
+    return next((index for index, value in enumerate(xs) if value == target), -1)
+
+
+@search.variant("functional", "next(compress)")
+def _(xs, target):
+    return next(compress(count(), map(target.__eq__, xs)), -1)
+
+
+@search.variant("builtin", "list.index")
+def _(xs, target):
+    try:
+        return xs.index(target)
+    except ValueError:
+        return -1
+
+
+@search.variant("numpy", "np.flatnonzero")
+def _(xs, target):
+    found = np.flatnonzero(xs == target)
+    return int(found[0]) if len(found) else -1
+
+
+# Counting in a loop
+evens = Task("count_even", "n = 0; for x in xs: if x % 2 == 0: n += 1", _numbers)
+
+
+@evens.variant("loop", "for + if")
+def _(xs):
+    total = 0
+    for x in xs:
+        if x % 2 == 0:
+            total += 1
+    return total
+
+
+@evens.variant("comprehension", "sum(1 for .. if)")
+def _(xs):
+    return sum(1 for x in xs if x % 2 == 0)
+
+
+@evens.variant("comprehension", "len([.. if])")
+def _(xs):
+    return len([x for x in xs if x % 2 == 0])
+
+
+@evens.variant("functional", "len - sum(map(1 .__and__))")
+def _(xs):
+    return len(xs) - sum(map((1).__and__, xs))
+
+
+@evens.variant("numpy", "count_nonzero")
+def _(xs):
+    return int(np.count_nonzero(xs % 2 == 0))
+
+
+# --------------------------------------------------
+# Harness
+# --------------------------------------------------
+def _plain(value):
+    """NumPy results as Python values, so they compare with the others."""
+    if np is not None and isinstance(value, (np.ndarray, np.generic)):
+        return value.tolist()
+    return value
+
+
+def same(a, b) -> bool:
+    """Equal, with float tolerance (NumPy sums in a different order)."""
+    a, b = _plain(a), _plain(b)
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(map(same, a, b))
+    return a == b
+
+
+def time_call(function, argument, repeat: int = 5, min_time: float = 0.05) -> float:
+    """Best seconds per call: calls are batched until a batch takes min_time, best of `repeat` batches."""
+    unpack = isinstance(argument, tuple)
+    calls = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(calls):
+            function(*argument) if unpack else function(argument)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        calls *= 10 if elapsed < min_time / 10 else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(calls):
+            function(*argument) if unpack else function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best / calls
+
+
+def run(tasks=None, sizes=(100, 10_000, 1_000_000), kinds=KINDS, repeat: int = 5,
+        min_time: float = 0.05, seed: int = 42) -> list[Result]:
+    """
+    Time every variant of every task at every size. The first variant is the
+    reference: a variant whose result differs gets ok=False (and is still timed).
+    NumPy variants get their input converted to arrays beforehand; that
+    conversion is reported as its own "np.array(input)" row.
+    """
+    results = []
+    for task in (TASKS[name] for name in (tasks or TASKS)):
+        for size in sizes:
+            data = task.make_input(size, random.Random(seed))
+            items = max(1, task.items(data))
+            expected = None
+            for name, (kind, function) in task.variants.items():
+                if kind not in kinds or (kind == "numpy" and np is None):
+                    continue
+                argument = _to_numpy(data) if kind == "numpy" else data
+                unpack = isinstance(argument, tuple)
+                result = function(*argument) if unpack else function(argument)
+                if expected is None:
+                    expected = result
+                seconds = time_call(function, argument, repeat, min_time)
+                results.append(Result(task.name, name, kind, size, seconds / items * 1e9, same(result, expected)))
+            if "numpy" in kinds and np is not None and any(kind == "numpy" for kind, _ in task.variants.values()):
+                seconds = time_call(_to_numpy, (data,), repeat, min_time)
+                results.append(Result(task.name, "np.array(input)", "numpy", size, seconds / items * 1e9, True))
+    return results
+
+
+def print_report(results: list[Result]) -> None:
+    """
+    One table per task: a row per variant, a column per size, in ns per element.
+    The fastest is marked *, a result different from the reference !.
+    """
+    sizes = sorted({result.size for result in results})
+    for task in dict.fromkeys(result.task for result in results):
+        rows = [result for result in results if result.task == task]
+        print(f"\n{task}: {TASKS[task].example}")
+        print(f"{'kind':<14}{'variant':<28}" + "".join(f"{f'n={size:,}':>14}" for size in sizes))
+        fastest = {size: min((r.ns_per_item for r in rows if r.size == size and r.variant != "np.array(input)"),
+                             default=0) for size in sizes}
+        for variant in dict.fromkeys(result.variant for result in rows):
+            cells = {r.size: r for r in rows if r.variant == variant}
+            kind = next(iter(cells.values())).kind
+            line = f"{kind:<14}{variant:<28}"
+            for size in sizes:
+                result = cells.get(size)
+                if result is None:
+                    line += f"{'':>14}"
+                    continue
+                mark = "!" if not result.ok else "*" if result.ns_per_item == fastest[size] else " "
+                line += f"{result.ns_per_item:>13,.1f}{mark}"
+            print(line)
+
+
+# Example of code that should only run when loop_harness.py is executed directly
+if __name__ == "__main__":
+    print(f"NumPy: {'installed' if np is not None else 'not installed (numpy variants skipped)'}")
+    report = run(sizes=(100, 10_000), min_time=0.01, repeat=3)
+    print_report(report)
+    wrong = [r for r in report if not r.ok]
+    print(f"\n{len(report)} timings, {len(wrong)} with a different result")
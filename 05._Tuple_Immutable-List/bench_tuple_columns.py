@@ -0,0 +1,109 @@
+# bench_tuple_columns.py: A list of namedtuples vs the same records in a ColumnStore
+# Records: Order(customer: 12-byte text, quantity: int, price: float).
+#   namedtuples   list[Order]; scans are generator expressions; persisted with pickle
+#   columns       ColumnStore; scans run over typed arrays; persisted with save()/open() (mmap)
+# Measured: memory (tracemalloc, separate pass), build, a filtered count,
+# a column sum, sort by price, save, and reopen + read one row.
+# Each variant runs in its own process.
+# Usage: python bench_tuple_columns.py [--rows 1000000]
+
+import argparse
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import namedtuple
+
+from tuple_columns import ColumnStore
+
+Order = namedtuple("Order", "customer quantity price")
+TYPES = {"customer": "12s", "quantity": "I", "price": "d"}
+
+
+def generate(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    customers = [f"cust{i:05d}" for i in range(5000)]
+    return (Order(rng.choice(customers), rng.randint(1, 50), round(rng.uniform(1, 500), 2)) for _ in range(n))
+
+
+def build(variant: str, n: int):
+    if variant == "namedtuples":
+        return list(generate(n))
+    return ColumnStore(Order, TYPES, generate(n))
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def worker(variant: str, n: int) -> dict:
+    tracemalloc.start()
+    data = build(variant, n)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del data
+
+    data, build_s = timed(lambda: build(variant, n))
+    path = os.path.join(tempfile.mkdtemp(), "orders.bin")
+    if variant == "namedtuples":
+        expensive, scan_s = timed(lambda: sum(1 for order in data if order.price > 400))
+        total, sum_s = timed(lambda: sum(order.quantity for order in data))
+        _, sort_s = timed(lambda: data.sort(key=lambda order: order.price))
+
+        def save():
+            with open(path, "wb") as f:
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def reopen():
+            with open(path, "rb") as f:
+                return pickle.load(f)[n // 2].price
+    else:
+        expensive, scan_s = timed(lambda: data.count("price", ">", 400))
+        total, sum_s = timed(lambda: data.sum("quantity"))
+        _, sort_s = timed(lambda: data.sort("price"))
+
+        def save():
+            data.save(path)
+
+        def reopen():
+            return ColumnStore.open(path, Order)[n // 2].price
+
+    _, save_s = timed(save)
+    middle, reopen_s = timed(reopen)
+    return {"memory": memory, "build": build_s, "scan": scan_s, "sum": sum_s, "sort": sort_s,
+            "save": save_s, "reopen": reopen_s, "file": os.path.getsize(path),
+            "check": [expensive, total, middle]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--worker", nargs=2, metavar=("VARIANT", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], int(args.worker[1]))))
+        return
+
+    print(f"{args.rows:,} orders (customer, quantity, price)")
+    print(f"{'variant':<13}{'MB':>7}{'build s':>9}{'scan s':>8}{'sum s':>8}{'sort s':>8}"
+          f"{'save s':>8}{'reopen s':>10}{'file MB':>9}")
+    checks = []
+    for variant in ("namedtuples", "columns"):
+        output = subprocess.run([sys.executable, __file__, "--worker", variant, str(args.rows)],
+                                check=True, capture_output=True, text=True).stdout
+        r = json.loads(output)
+        checks.append(r["check"])
+        print(f"{variant:<13}{r['memory'] / 2**20:>7.0f}{r['build']:>9.2f}{r['scan']:>8.3f}{r['sum']:>8.3f}"
+              f"{r['sort']:>8.2f}{r['save']:>8.2f}{r['reopen']:>10.4f}{r['file'] / 2**20:>9.1f}")
+    print("results match" if checks[0] == checks[1] else f"MISMATCH: {checks}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,408 @@
+# tuple_columns.py: A columnar store for namedtuple records
+# A list of a million namedtuples is a million tuple objects plus an object
+# for every int, float and str in them: ~100+ bytes per row. ColumnStore keeps
+# the same records as one typed array per field (8 bytes for an int or float,
+# the declared width for text), and hands out rows only when you ask:
+#
+#   Person = namedtuple("Person", "name age height")
+#   people = ColumnStore(Person, types={"name": "16s", "age": "B", "height": "d"})
+#   people.append(Person("Riaz", 28, 1.80))
+#   people[0].name                        # 'Riaz' (a lightweight view, not a copy)
+#   people.where("age", ">=", 18)         # indices, found by one C-level pass over the column
+#   people.sort("age")                    # reorders every column
+#   people.save("people.col"); ColumnStore.open("people.col")   # memory-mapped: opens instantly
+#
+# Field types are array typecodes ('b' 'B' 'h' 'H' 'i' 'I' 'l' 'L' 'q' 'Q' 'f' 'd')
+# or "<n>s" for UTF-8 text of at most n bytes. typing.NamedTuple classes get
+# int -> 'q' and float -> 'd' from their annotations.
+
+import mmap
+import operator
+import struct
+import sys
+from array import array
+from collections import namedtuple
+from itertools import compress, islice, repeat
+from operator import itemgetter
+
+OPERATORS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+             ">": operator.gt, ">=": operator.ge}
+NUMERIC = "bBhHiIlLqQfd"
+_first = itemgetter(0)
+
+# File layout (all fixed width, written with struct):
+#   header   magic, version, byte order, row count, field count, record name
+#   fields   per field: name, type ("q", "d", "16s"...), item size
+#   columns  each column's raw bytes, starting on an 8-byte boundary (so mmap views line up)
+_MAGIC = b"TUPCOLS1"
+_HEADER = struct.Struct("<8sBcQI64s")
+_FIELD = struct.Struct("<64s8sI")
+
+
+# --------------------------------------------------
+# Fixed-width text column
+# --------------------------------------------------
+class TextColumn:
+    """str values stored back to back in `width` bytes each (UTF-8, padded with NUL)."""
+
+    __slots__ = ("width", "buffer")
+
+    def __init__(self, width: int, buffer=None):
+        self.width = width
+        self.buffer = bytearray() if buffer is None else buffer
+
+    def _encode(self, value: str) -> bytes:
+        raw = value.encode()
+        if len(raw) > self.width:
+            raise ValueError(f"{value!r} is {len(raw)} bytes; the column holds at most {self.width}")
+        return raw.ljust(self.width, b"\0")
+
+    def append(self, value: str) -> None:
+        self.buffer += self._encode(value)
+
+    def extend(self, values) -> None:
+        self.buffer += b"".join(map(self._encode, values))
+
+    def __len__(self) -> int:
+        return len(self.buffer) // self.width
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        start = index * self.width
+        if not 0 <= start < len(self.buffer):
+            raise IndexError("text column index out of range")
+        return bytes(self.buffer[start:start + self.width]).rstrip(b"\0").decode()
+
+    def _cells(self):
+        """Every value's raw padded bytes, split by struct in C (works on bytearray and mmap alike)."""
+        return map(_first, struct.iter_unpack(f"{self.width}s", self.buffer))
+
+    def __iter__(self):
+        return (cell.rstrip(b"\0").decode() for cell in self._cells())
+
+    def matches(self, op, value) -> "map":
+        """op(item, value) for every item; == and != compare the raw bytes without decoding."""
+        if op in (operator.eq, operator.ne) and isinstance(value, str):
+            try:
+                padded = self._encode(value)
+            except ValueError:
+                return repeat(op is operator.ne, len(self))  # Too long to be in the column at all
+            return map(op, self._cells(), repeat(padded))
+        return map(op, self, repeat(value))
+
+    def take(self, indices) -> "TextColumn":
+        cells = list(self._cells())
+        return TextColumn(self.width, bytearray(b"".join(map(cells.__getitem__, indices))))
+
+    def tobytes(self) -> bytes:
+        return bytes(self.buffer)
+
+
+def _new_column(spec: str):
+    if spec.endswith("s"):
+        return TextColumn(int(spec[:-1]))
+    if spec not in NUMERIC:
+        raise ValueError(f"unknown field type {spec!r}: use one of {NUMERIC!r} or '<width>s'")
+    return array(spec)
+
+
+def _itemsize(spec: str) -> int:
+    return int(spec[:-1]) if spec.endswith("s") else array(spec).itemsize
+
+
+# --------------------------------------------------
+# Row views
+# --------------------------------------------------
+class RowView:
+    """One row of a ColumnStore: reads its fields from the columns, stores nothing else."""
+
+    __slots__ = ("_store", "_index")
+    _fields: tuple = ()
+
+    def __init__(self, store: "ColumnStore", index: int):
+        self._store = store
+        self._index = index
+
+    def __iter__(self):
+        index = self._index
+        return (column[index] for column in self._store._columns)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __eq__(self, other) -> bool:
+        return tuple(self) == tuple(other)
+
+    def record(self):
+        """The row as a real namedtuple."""
+        return self._store.record_type(*self)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self))
+        return f"{self._store.record_type.__name__}View({values})"
+
+
+def _field_property(position: int) -> property:
+    def get(view):
+        return view._store._columns[position][view._index]
+    return property(get)
+
+
+def _view_class(record_type) -> type:
+    namespace = {name: _field_property(i) for i, name in enumerate(record_type._fields)}
+    namespace.update(__slots__=(), _fields=record_type._fields)
+    return type(f"{record_type.__name__}View", (RowView,), namespace)
+
+
+# --------------------------------------------------
+# Store
+# --------------------------------------------------
+def _field_types(record_type, types: dict | None) -> list[str]:
+    types = dict(types or {})
+    annotations = getattr(record_type, "__annotations__", {})
+    specs = []
+    for name in record_type._fields:
+        spec = types.pop(name, None)
+        if spec is None:
+            kind = annotations.get(name)
+            spec = {int: "q", float: "d"}.get(kind)
+            if spec is None:
+                raise TypeError(f"field {name!r} needs a type: types={{{name!r}: 'q' / 'd' / '16s' ...}}")
+        specs.append(spec)
+    if types:
+        raise ValueError(f"{sorted(types)} are not fields of {record_type.__name__}")
+    return specs
+
+
+class ColumnStore:
+    """Records of one namedtuple type, stored one typed array per field."""
+
+    def __init__(self, record_type, types: dict | None = None, rows=()):
+        self.record_type = record_type
+        self.fields: tuple[str, ...] = record_type._fields
+        self.types = _field_types(record_type, types)
+        self._columns = [_new_column(spec) for spec in self.types]
+        self._view = _view_class(record_type)
+        self._mmap: mmap.mmap | None = None
+        self.extend(rows)
+
+    # ---------- adding rows ----------
+    def _writable(self) -> None:
+        if self._mmap is not None:
+            raise TypeError("this store is a read-only memory map; call copy() for a writable one")
+
+    def append(self, row) -> None:
+        self._writable()
+        if len(row) != len(self._columns):
+            raise ValueError(f"expected {len(self._columns)} fields, got {len(row)}")
+        start = len(self)
+        try:
+            for column, value in zip(self._columns, row):
+                column.append(value)
+        except (TypeError, ValueError, OverflowError):
+            self._truncate(start)
+            raise
+
+    def extend(self, rows, batch: int = 65_536) -> None:
+        """Append many rows, transposed into columns a batch at a time (no full copy of `rows`)."""
+        self._writable()
+        rows = iter(rows)
+        while chunk := list(islice(rows, batch)):
+            if any(len(row) != len(self._columns) for row in chunk):
+                raise ValueError(f"every row needs {len(self._columns)} fields")
+            start = len(self)
+            try:
+                for column, values in zip(self._columns, zip(*chunk)):
+                    column.extend(values)
+            except (TypeError, ValueError, OverflowError):
+                self._truncate(start)  # Keep the columns the same length
+                raise
+
+    def _truncate(self, length: int) -> None:
+        for column in self._columns:
+            if isinstance(column, TextColumn):
+                del column.buffer[length * column.width:]
+            else:
+                del column[length:]
+
+    # ---------- reading ----------
+    def __len__(self) -> int:
+        return len(self._columns[0]) if self._columns else 0
+
+    def __getitem__(self, index: int) -> RowView:
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("ColumnStore index out of range")
+        return self._view(self, index)
+
+    def __iter__(self):
+        return map(self._view, repeat(self), range(len(self)))
+
+    def record(self, index: int):
+        return self[index].record()
+
+    def records(self):
+        """All rows as namedtuples, built straight from the columns."""
+        return map(self.record_type, *self._columns)
+
+    def column(self, field: str):
+        """The column itself: an array (or memoryview when memory-mapped), or a TextColumn."""
+        return self._columns[self.fields.index(field)]
+
+    # ---------- whole-column operations ----------
+    def _matches(self, field: str, op: str, value):
+        try:
+            compare = OPERATORS[op]
+        except KeyError:
+            raise ValueError(f"unknown operator {op!r}; use one of {list(OPERATORS)}") from None
+        column = self.column(field)
+        if isinstance(column, TextColumn):
+            return column.matches(compare, value)
+        return map(compare, column, repeat(value))  # One C loop: no Python code per row
+
+    def where(self, field: str, op: str, value, within=None) -> array:
+        """Indices of rows where `field op value`; `within` narrows an earlier result (AND)."""
+        if within is None:
+            return array("q", compress(range(len(self)), self._matches(field, op, value)))
+        column = self.column(field)
+        compare = OPERATORS[op]
+        return array("q", (i for i in within if compare(column[i], value)))
+
+    def count(self, field: str, op: str, value) -> int:
+        return sum(self._matches(field, op, value))
+
+    def take(self, indices) -> "ColumnStore":
+        """A new store with the given rows (e.g. the result of where()), in that order."""
+        result = ColumnStore(self.record_type, dict(zip(self.fields, self.types)))
+        result._columns = [column.take(indices) if isinstance(column, TextColumn)
+                           else array(spec, map(column.__getitem__, indices))
+                           for column, spec in zip(self._columns, self.types)]
+        return result
+
+    def copy(self) -> "ColumnStore":
+        """An in-memory, writable copy (also of a memory-mapped store)."""
+        return self.take(range(len(self)))
+
+    def sum(self, field: str):
+        return sum(self.column(field))
+
+    def min(self, field: str):
+        return min(self.column(field))
+
+    def max(self, field: str):
+        return max(self.column(field))
+
+    def mean(self, field: str) -> float:
+        return self.sum(field) / len(self) if len(self) else float("nan")
+
+    def sort(self, *by: str, reverse: bool = False) -> None:
+        """Sort rows in place by one or more fields (the first field is the main key)."""
+        self._writable()
+        if not by:
+            raise ValueError("sort() needs at least one field")
+        order = list(range(len(self)))
+        for field in reversed(by):  # Stable sorts from the last key to the first = sort by all keys
+            column = self.column(field)
+            key = list(column) if isinstance(column, TextColumn) else column
+            order.sort(key=key.__getitem__, reverse=reverse)
+        self._columns = self.take(order)._columns
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(self) * _itemsize(spec) for spec in self.types)
+
+    def __repr__(self) -> str:
+        columns = ", ".join(f"{name}:{spec}" for name, spec in zip(self.fields, self.types))
+        return f"ColumnStore({self.record_type.__name__}[{columns}], {len(self):,} rows)"
+
+    # ---------- persistence ----------
+    def save(self, path: str) -> None:
+        with open(path, "wb") as f:
+            name = self.record_type.__name__.encode()
+            f.write(_HEADER.pack(_MAGIC, 1, sys.byteorder[0].encode(), len(self), len(self.fields), name))
+            for field, spec in zip(self.fields, self.types):
+                f.write(_FIELD.pack(field.encode(), spec.encode(), _itemsize(spec)))
+            for column in self._columns:
+                f.write(b"\0" * (-f.tell() % 8))
+                f.write(column.tobytes() if hasattr(column, "tobytes") else bytes(column))
+
+    @classmethod
+    def open(cls, path: str, record_type=None) -> "ColumnStore":
+        """
+        Reopen a saved store without reading it: the columns are views into a
+        read-only memory map, so only the pages you touch are loaded from disk.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, order, rows, nfields, name = _HEADER.unpack_from(mapped, 0)
+        if magic != _MAGIC or version != 1:
+            raise ValueError(f"{path} is not a saved ColumnStore")
+        offset = _HEADER.size
+        fields, types = [], []
+        for _ in range(nfields):
+            field, spec, itemsize = _FIELD.unpack_from(mapped, offset)
+            offset += _FIELD.size
+            spec = spec.rstrip(b"\0").decode()
+            if itemsize != _itemsize(spec):
+                raise ValueError(f"{path}: type {spec!r} has size {itemsize} there, {_itemsize(spec)} here")
+            fields.append(field.rstrip(b"\0").decode())
+            types.append(spec)
+        if record_type is None:
+            record_type = namedtuple(name.rstrip(b"\0").decode(), fields)
+        elif tuple(fields) != record_type._fields:
+            raise ValueError(f"{path} has fields {fields}, {record_type.__name__} has {record_type._fields}")
+
+        store = cls(record_type, dict(zip(fields, types)))
+        swap = order.decode() != sys.byteorder[0]
+        view = memoryview(mapped)
+        columns = []
+        for spec in types:
+            offset += -offset % 8
+            size = rows * _itemsize(spec)
+            raw = view[offset:offset + size]
+            offset += size
+            if spec.endswith("s"):
+                columns.append(TextColumn(int(spec[:-1]), raw))
+            elif swap:  # Written on a machine with the other byte order: convert a copy
+                column = array(spec, raw.tobytes())
+                column.byteswap()
+                columns.append(column)
+            else:
+                columns.append(raw.cast(spec))
+        store._columns = columns
+        store._mmap = mapped
+        return store
+
+    @property
+    def readonly(self) -> bool:
+        return self._mmap is not None
+
+
+# Example of code that should only run when tuple_columns.py is executed directly
+if __name__ == "__main__":
+    import os
+    import tempfile
+    from typing import NamedTuple
+
+    class Person(NamedTuple):
+        name: str
+        age: int
+        height: float
+
+    people = ColumnStore(Person, types={"name": "12s", "age": "B"})  # height: float -> 'd'
+    people.extend([Person("Riaz", 28, 1.80), Person("Ana", 17, 1.62), Person("Li", 35, 1.75),
+                   Person("Sam", 17, 1.90)])
+    print(people, people[0], people[0].name)
+    adults = people.where("age", ">=", 18)
+    print(f"adults: {list(adults)} -> {[p.name for p in people.take(adults)]}")
+    print(f"mean height {people.mean('height'):.2f}, named Ana: {people.count('name', '==', 'Ana')}")
+    people.sort("age", "name")
+    print([tuple(p) for p in people])
+
+    path = os.path.join(tempfile.mkdtemp(), "people.col")
+    people.save(path)
+    reopened = ColumnStore.open(path, Person)
+    print(f"{os.path.getsize(path)} bytes on disk; reopened: {list(reopened.records())}")
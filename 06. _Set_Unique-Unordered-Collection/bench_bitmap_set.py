@@ -0,0 +1,65 @@
+# bench_bitmap_set.py: Compare BitmapSet against the built-in set for bulk set algebra
+# Usage: python bench_bitmap_set.py [--max-power 8] [--density 0.5]
+# Two sets of user IDs are drawn from [0, universe) with the given density.
+
+import argparse
+import operator
+import random
+import sys
+import time
+
+from bitmap_set import BitmapSet
+
+
+def time_it(func) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def set_bytes(values: set) -> int:
+    return sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+
+
+def run(size: int, density: float, rng: random.Random) -> None:
+    universe = int(size / density)
+    a = set(rng.sample(range(universe), size))
+    b = set(rng.sample(range(universe), size))
+    bitmap_a, build_time = time_it(lambda: BitmapSet(a))
+    bitmap_b = BitmapSet(b)
+
+    print(f"\n--- {size:,} IDs per set, universe {universe:,} ---")
+    print(f"memory:      set {set_bytes(a) / 1e6:10.2f} MB   BitmapSet {bitmap_a.nbytes / 1e6:10.2f} MB"
+          f"   (built in {build_time:.3f} s)")
+    operators = (
+        (operator.and_, "intersection"),
+        (operator.or_, "union"),
+        (operator.xor, "sym. diff"),
+        (operator.sub, "difference"),
+    )
+    for op, name in operators:
+        expected, set_time = time_it(lambda: op(a, b))
+        result, bitmap_time = time_it(lambda: op(bitmap_a, bitmap_b))
+        assert len(result) == len(expected)
+        print(f"{name:<13}set {set_time:10.4f} s    BitmapSet {bitmap_time:10.4f} s   ({len(expected):,} IDs)")
+    _, count_time = time_it(lambda: bitmap_a.intersection_len(bitmap_b))
+    print(f"{'len(a & b)':<13}set {'(builds result)':>12}  BitmapSet {count_time:10.4f} s   (no result built)")
+    data, dump_time = time_it(bitmap_a.tobytes)
+    _, load_time = time_it(lambda: BitmapSet.frombytes(data))
+    print(f"serialize:   {len(data):,} bytes, tobytes {dump_time:.4f} s, frombytes {load_time:.4f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-power", type=int, default=4)
+    parser.add_argument("--max-power", type=int, default=6)
+    parser.add_argument("--density", type=float, default=0.5, help="fraction of the ID range that is present")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    for power in range(args.min_power, args.max_power + 1):
+        run(10**power, args.density, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# bench_membership.py: Measure the "Fast Membership Testing" claim from README.md
+# Compares `x in container` for list, tuple, set, frozenset, a sorted list
+# searched with bisect, and a BloomFilter, on hit and miss workloads.
+# Usage: python bench_membership.py [--max-power 8] [--seed 42]
+# list/tuple lookups are O(n), so they only get a few queries at large sizes.
+
+import argparse
+import random
+import sys
+import time
+from bisect import bisect_left
+
+from bloom_filter import BloomFilter
+
+
+class SortedList:
+    """A sorted list searched with binary search: O(log n) lookups, list-sized memory."""
+
+    def __init__(self, items):
+        self.items = sorted(items)
+
+    def __contains__(self, item) -> bool:
+        items = self.items
+        i = bisect_left(items, item)
+        return i < len(items) and items[i] == item
+
+
+def container_bytes(container) -> int:
+    """Bytes used by the container itself (the int elements are shared by all of them)."""
+    if isinstance(container, BloomFilter):
+        return container.nbytes
+    if isinstance(container, SortedList):
+        return sys.getsizeof(container.items)
+    return sys.getsizeof(container)
+
+
+def ns_per_lookup(container, queries) -> float:
+    start = time.perf_counter_ns()
+    for q in queries:
+        q in container
+    return (time.perf_counter_ns() - start) / len(queries)
+
+
+def run(size: int, rng: random.Random, linear_queries: int, fast_queries: int) -> None:
+    # Even numbers are members, odd numbers are guaranteed misses
+    items = [2 * i for i in range(size)]
+    rng.shuffle(items)
+    bloom = BloomFilter(size, fp_rate=0.01)
+    bloom.update(items)
+    containers = {
+        "list": items,
+        "tuple": tuple(items),
+        "set": set(items),
+        "frozenset": frozenset(items),
+        "sorted+bisect": SortedList(items),
+        "BloomFilter": bloom,
+    }
+
+    print(f"\n--- n = {size:,} ---")
+    print(f"{'container':<15}{'bytes':>16}{'hit ns/op':>12}{'miss ns/op':>12}")
+    for name, container in containers.items():
+        count = linear_queries if name in ("list", "tuple") else fast_queries
+        hits = [2 * rng.randrange(size) for _ in range(count)]
+        misses = [2 * rng.randrange(size) + 1 for _ in range(count)]
+        print(f"{name:<15}{container_bytes(container):>16,}"
+              f"{ns_per_lookup(container, hits):>12,.0f}{ns_per_lookup(container, misses):>12,.0f}")
+    false_hits = sum(2 * rng.randrange(size) + 1 in bloom for _ in range(fast_queries))
+    print(f"BloomFilter measured false-positive rate: {false_hits / fast_queries:.2%} (target 1.00%)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--min-power", type=int, default=3)
+    parser.add_argument("--max-power", type=int, default=6, help="largest size is 10**max-power (up to 8)")
+    parser.add_argument("--queries", type=int, default=10_000, help="lookups per workload for hashed/sorted containers")
+    parser.add_argument("--linear-queries", type=int, default=100, help="lookups per workload for list/tuple")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)  # Fixed seed: same data and queries on every run
+    for power in range(args.min_power, args.max_power + 1):
+        run(10**power, rng, args.linear_queries, args.queries)
+
+
+if __name__ == "__main__":
+    main()
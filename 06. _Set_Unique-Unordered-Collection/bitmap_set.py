@@ -0,0 +1,635 @@
+# bitmap_set.py: A compressed integer set in the "Roaring bitmap" style
+# A built-in set of ints costs ~60 bytes per element and `&`/`|` walk the
+# elements one at a time. BitmapSet splits each non-negative int into
+#     high = x >> 16   (which container)      low = x & 0xFFFF  (position inside it)
+# and stores each 65,536-wide range in whichever container is smallest:
+#   - array  container: sorted uint16 values          (2 bytes per element, sparse ranges)
+#   - bitmap container: 1,024 uint64 words = 8 KB     (1 bit per possible value, dense ranges)
+#   - run    container: (start, length - 1) pairs     (4 bytes per run, consecutive ranges)
+# Bulk set algebra converts bitmaps to Python ints, so `&`, `|`, `^` run in C
+# over 64-bit words instead of looping element by element.
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from collections.abc import Collection, Iterable, MutableSet
+from operator import sub
+
+CHUNK_BITS = 16
+CHUNK_SIZE = 1 << CHUNK_BITS          # 65,536 values per container
+BITMAP_WORDS = CHUNK_SIZE // 64       # 1,024 words
+BITMAP_BYTES = CHUNK_SIZE // 8        # 8,192 bytes
+ARRAY_MAX = 4096                      # Above this an array container is bigger than a bitmap
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+_ARRAY, _BITMAP, _RUN = 0, 1, 2       # Container type codes used in serialization
+
+
+def _le_bytes(values: array) -> bytes:
+    """Array contents as little-endian bytes (the on-disk format)."""
+    if _LITTLE_ENDIAN:
+        return values.tobytes()
+    swapped = array(values.typecode, values)
+    swapped.byteswap()
+    return swapped.tobytes()
+
+
+def _le_array(typecode: str, data: bytes) -> array:
+    values = array(typecode)
+    values.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        values.byteswap()
+    return values
+
+
+def _positions(bits: int) -> list[int]:
+    """Positions of the set bits of a 65,536-bit int, in increasing order."""
+    words = _le_array("Q", bits.to_bytes(BITMAP_BYTES, "little"))
+    out = []
+    append = out.append
+    for index, word in enumerate(words):
+        if word:
+            base = index << 6
+            while word:
+                lowest = word & -word
+                append(base + lowest.bit_length() - 1)
+                word ^= lowest
+    return out
+
+
+def _from_int(bits: int):
+    """Pick the smallest container for a 65,536-bit int (None if it is empty)."""
+    if not bits:
+        return None
+    cardinality = bits.bit_count()
+    num_runs = (bits & ~(bits << 1)).bit_count()  # Count of bits that start a run
+    array_bytes, run_bytes = 2 * cardinality, 4 * num_runs
+    if run_bytes < min(array_bytes, BITMAP_BYTES):
+        starts = _positions(bits & ~(bits << 1))
+        ends = _positions(bits & ~(bits >> 1))
+        runs = array("H")
+        for start, end in zip(starts, ends):
+            runs.extend((start, end - start))
+        return _RunContainer(runs)
+    if cardinality <= ARRAY_MAX:
+        return _ArrayContainer(array("H", _positions(bits)))
+    words = _le_array("Q", bits.to_bytes(BITMAP_BYTES, "little"))
+    return _BitmapContainer(words, cardinality)
+
+
+def _from_sorted(lows: list[int]):
+    """
+    Pick the smallest container for sorted, distinct lows (None if there are
+    none). Sparse chunks never go through an 8 KB bitmap.
+    """
+    if len(lows) > ARRAY_MAX:
+        return _from_int(_ArrayContainer(lows).to_int())
+    if len(lows) < 3:  # Runs need 4 bytes each: only smaller than the array from 3 values on
+        return _ArrayContainer(array("H", lows)) if lows else None
+    num_runs = len(lows) - list(map(sub, lows[1:], lows)).count(1)  # Steps of 1 continue a run
+    if 4 * num_runs >= 2 * len(lows):
+        return _ArrayContainer(array("H", lows))
+    runs = array("H")
+    start = previous = lows[0]
+    for low in lows[1:]:
+        if low != previous + 1:
+            runs.extend((start, previous - start))
+            start = low
+        previous = low
+    runs.extend((start, previous - start))
+    return _RunContainer(runs)
+
+
+class _ArrayContainer:
+    """Sparse chunk: a sorted array of uint16 values."""
+
+    __slots__ = ("values",)
+    kind = _ARRAY
+
+    def __init__(self, values: array):
+        self.values = values
+
+    def cardinality(self) -> int:
+        return len(self.values)
+
+    def __contains__(self, low: int) -> bool:
+        values = self.values
+        i = bisect_left(values, low)
+        return i < len(values) and values[i] == low
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def add(self, low: int):
+        values = self.values
+        i = bisect_left(values, low)
+        if i < len(values) and values[i] == low:
+            return self
+        if len(values) >= ARRAY_MAX:
+            return _from_int(self.to_int() | (1 << low))
+        values.insert(i, low)
+        return self
+
+    def discard(self, low: int):
+        values = self.values
+        i = bisect_left(values, low)
+        if i < len(values) and values[i] == low:
+            del values[i]
+        return self if values else None
+
+    def to_int(self) -> int:
+        buf = bytearray(BITMAP_BYTES)
+        for low in self.values:
+            buf[low >> 3] |= 1 << (low & 7)
+        return int.from_bytes(buf, "little")
+
+    def nbytes(self) -> int:
+        return 2 * len(self.values)
+
+    def payload(self) -> bytes:
+        return _le_bytes(self.values)
+
+    def copy(self):
+        return _ArrayContainer(array("H", self.values))
+
+
+class _BitmapContainer:
+    """Dense chunk: 1,024 64-bit words, one bit per possible value."""
+
+    __slots__ = ("words", "count")
+    kind = _BITMAP
+
+    def __init__(self, words: array, count: int):
+        self.words = words
+        self.count = count
+
+    def cardinality(self) -> int:
+        return self.count
+
+    def __contains__(self, low: int) -> bool:
+        return bool(self.words[low >> 6] >> (low & 63) & 1)
+
+    def __iter__(self):
+        return iter(_positions(self.to_int()))
+
+    def add(self, low: int):
+        mask = 1 << (low & 63)
+        word = self.words[low >> 6]
+        if not word & mask:
+            self.words[low >> 6] = word | mask
+            self.count += 1
+        return self
+
+    def discard(self, low: int):
+        mask = 1 << (low & 63)
+        word = self.words[low >> 6]
+        if word & mask:
+            self.words[low >> 6] = word ^ mask
+            self.count -= 1
+            if self.count <= ARRAY_MAX:
+                return _from_int(self.to_int())
+        return self
+
+    def to_int(self) -> int:
+        return int.from_bytes(_le_bytes(self.words), "little")
+
+    def nbytes(self) -> int:
+        return BITMAP_BYTES
+
+    def payload(self) -> bytes:
+        return _le_bytes(self.words)
+
+    def copy(self):
+        return _BitmapContainer(array("Q", self.words), self.count)
+
+
+class _RunContainer:
+    """Consecutive chunk: flat (start, length - 1) pairs of uint16."""
+
+    __slots__ = ("runs",)
+    kind = _RUN
+
+    def __init__(self, runs: array):
+        self.runs = runs
+
+    def cardinality(self) -> int:
+        return sum(self.runs[1::2]) + len(self.runs) // 2
+
+    def __contains__(self, low: int) -> bool:
+        runs = self.runs
+        i = bisect_right(range(0, len(runs), 2), low, key=runs.__getitem__) - 1  # Over the starts, no copy
+        return i >= 0 and low <= runs[2 * i] + runs[2 * i + 1]
+
+    def __iter__(self):
+        runs = self.runs
+        for i in range(0, len(runs), 2):
+            yield from range(runs[i], runs[i] + runs[i + 1] + 1)
+
+    # Run containers are built for bulk/static data; single-value edits
+    # go through the int form and re-pick the best container.
+    def add(self, low: int):
+        return self if low in self else _from_int(self.to_int() | (1 << low))
+
+    def discard(self, low: int):
+        return _from_int(self.to_int() & ~(1 << low)) if low in self else self
+
+    def to_int(self) -> int:
+        bits = 0
+        runs = self.runs
+        for i in range(0, len(runs), 2):
+            bits |= ((1 << (runs[i + 1] + 1)) - 1) << runs[i]
+        return bits
+
+    def nbytes(self) -> int:
+        return 2 * len(self.runs)
+
+    def payload(self) -> bytes:
+        return _le_bytes(self.runs)
+
+    def copy(self):
+        return _RunContainer(array("H", self.runs))
+
+
+def _combine(a, b, op: str):
+    """Apply a set operator to two containers of the same chunk."""
+    if a.kind == _ARRAY and b.kind == _ARRAY:
+        # Two small sorted arrays: cheaper to merge than to build 8 KB bitmaps
+        if op == "&":
+            result = sorted(set(a.values).intersection(b.values))
+        elif op == "|":
+            result = list(dict.fromkeys(sorted(a.values + b.values)))  # Sorted merge, duplicates dropped
+        elif op == "^":
+            result = sorted(set(a.values).symmetric_difference(b.values))
+        else:
+            exclude = set(b.values)
+            result = [low for low in a.values if low not in exclude]  # Already sorted
+        if not result:
+            return None
+        if len(result) <= ARRAY_MAX:
+            return _ArrayContainer(array("H", result))
+        return _from_int(_ArrayContainer(array("H", result)).to_int())
+    x, y = a.to_int(), b.to_int()
+    if op == "&":
+        return _from_int(x & y)
+    if op == "|":
+        return _from_int(x | y)
+    if op == "^":
+        return _from_int(x ^ y)
+    return _from_int(x & ~y)
+
+
+class BitmapSet(MutableSet):
+    """
+    A compressed set of non-negative ints with the same operators as `set`:
+    `in`, `len`, `|`, `&`, `^`, `-`, `<=`, `>=`, `==` and their in-place forms.
+
+    Iteration is always in increasing order.
+    """
+
+    __slots__ = ("_containers",)
+
+    def __init__(self, values: Iterable[int] = ()):
+        self._containers = {}
+        self.update(values)
+
+    # --- Constructors ---
+    @classmethod
+    def from_range(cls, start: int, stop: int) -> "BitmapSet":
+        result = cls()
+        result.add_range(start, stop)
+        return result
+
+    @classmethod
+    def _from_containers(cls, containers: dict) -> "BitmapSet":
+        result = cls.__new__(cls)
+        result._containers = containers
+        return result
+
+    @classmethod
+    def _from_iterable(cls, values):
+        # Used by the MutableSet mixin methods
+        return cls(values)
+
+    # --- Single elements ---
+    @staticmethod
+    def _split(value: int) -> tuple[int, int]:
+        if value < 0:
+            raise ValueError(f"BitmapSet only holds non-negative ints, got {value}")
+        return value >> CHUNK_BITS, value & (CHUNK_SIZE - 1)
+
+    def __contains__(self, value) -> bool:
+        if not isinstance(value, int) or value < 0:
+            return False
+        container = self._containers.get(value >> CHUNK_BITS)
+        return container is not None and (value & (CHUNK_SIZE - 1)) in container
+
+    def add(self, value: int) -> None:
+        high, low = self._split(value)
+        container = self._containers.get(high)
+        if container is None:
+            self._containers[high] = _ArrayContainer(array("H", [low]))
+        else:
+            self._containers[high] = container.add(low)
+
+    def discard(self, value: int) -> None:
+        if value not in self:
+            return
+        high, low = self._split(value)
+        container = self._containers[high].discard(low)
+        if container is None:
+            del self._containers[high]
+        else:
+            self._containers[high] = container
+
+    def remove(self, value: int) -> None:
+        if value not in self:
+            raise KeyError(value)
+        self.discard(value)
+
+    def pop(self) -> int:
+        if not self._containers:
+            raise KeyError("pop from an empty BitmapSet")
+        smallest = self.min()
+        self.discard(smallest)
+        return smallest
+
+    def clear(self) -> None:
+        self._containers.clear()
+
+    # --- Bulk loading ---
+    def update(self, *iterables: Iterable[int]) -> None:
+        for values in iterables:
+            if isinstance(values, BitmapSet):
+                self |= values
+                continue
+            if isinstance(values, range) and values.step == 1:
+                self.add_range(values.start, values.stop)
+                continue
+            # Group the lows by chunk, then build each chunk's container from them once sorted
+            chunks: defaultdict[int, list[int]] = defaultdict(list)
+            for value in values:
+                chunks[value >> CHUNK_BITS].append(value & (CHUNK_SIZE - 1))
+            if chunks and min(chunks) < 0:  # Negative values land in negative chunks
+                high = min(chunks)
+                self._split((high << CHUNK_BITS) | chunks[high][0])
+            containers = self._containers
+            for high, lows in chunks.items():
+                existing = containers.get(high)
+                if len(lows) > ARRAY_MAX or existing is not None and existing.kind != _ARRAY:
+                    self._merge_chunk(high, _ArrayContainer(lows).to_int())  # Dense: one bitmap, no sort
+                elif existing is None:
+                    containers[high] = _from_sorted(sorted(set(lows)))
+                else:
+                    containers[high] = _from_sorted(sorted(set(lows).union(existing.values)))
+
+    def add_range(self, start: int, stop: int) -> None:
+        """Add every int in range(start, stop) without looping over them."""
+        if start >= stop:
+            return
+        self._split(start)
+        value = start
+        while value < stop:
+            high, low = value >> CHUNK_BITS, value & (CHUNK_SIZE - 1)
+            end = min(stop - (high << CHUNK_BITS), CHUNK_SIZE)
+            self._merge_chunk(high, ((1 << (end - low)) - 1) << low)
+            value = (high + 1) << CHUNK_BITS
+
+    def _merge_chunk(self, high: int, bits: int) -> None:
+        existing = self._containers.get(high)
+        if existing is not None:
+            bits |= existing.to_int()
+        self._containers[high] = _from_int(bits)
+
+    # --- Size & iteration ---
+    def __len__(self) -> int:
+        """Cardinality, computed from per-container counts (nothing is materialised)."""
+        return sum(container.cardinality() for container in self._containers.values())
+
+    def __iter__(self):
+        for high in sorted(self._containers):
+            base = high << CHUNK_BITS
+            for low in self._containers[high]:
+                yield base | low
+
+    def min(self) -> int:
+        high = min(self._containers)
+        return (high << CHUNK_BITS) | next(iter(self._containers[high]))
+
+    def __repr__(self) -> str:
+        if len(self) <= 10:
+            return f"BitmapSet({list(self)!r})"
+        return f"BitmapSet(<{len(self):,} values in {len(self._containers):,} containers, {self.nbytes:,} bytes>)"
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by container payloads."""
+        return sum(container.nbytes() for container in self._containers.values())
+
+    def copy(self) -> "BitmapSet":
+        return BitmapSet._from_containers({h: c.copy() for h, c in self._containers.items()})
+
+    # --- Set algebra ---
+    def _binary(self, other: "BitmapSet", op: str) -> "BitmapSet":
+        mine, theirs = self._containers, other._containers
+        if op == "&":
+            keys = mine.keys() & theirs.keys()
+        elif op == "-":
+            keys = mine.keys()
+        else:
+            keys = mine.keys() | theirs.keys()
+        result = {}
+        for high in keys:
+            a, b = mine.get(high), theirs.get(high)
+            if a is None or b is None:
+                container = (a or b).copy()  # Only one side has this chunk: | ^ - keep it
+            else:
+                container = _combine(a, b, op)
+            if container is not None:
+                result[high] = container
+        return BitmapSet._from_containers(result)
+
+    def _coerce(self, other) -> "BitmapSet | None":
+        if isinstance(other, BitmapSet):
+            return other
+        if isinstance(other, (set, frozenset)):
+            return BitmapSet(other)
+        return None
+
+    @staticmethod
+    def _within(values) -> tuple["BitmapSet", bool]:
+        """
+        (BitmapSet of the elements of `values` it can hold, whether any were left
+        out). For operations where the others cannot change the result: &, -, <=.
+        """
+        if isinstance(values, BitmapSet):
+            return values, False
+        if not isinstance(values, Collection):
+            values = list(values)  # Read a second time if it holds negative ints or non-ints
+        try:
+            return BitmapSet(values), False
+        except (TypeError, ValueError):
+            return BitmapSet([v for v in values if isinstance(v, int) and v >= 0]), True
+
+    def __and__(self, other):
+        if not isinstance(other, (BitmapSet, set, frozenset)):
+            return NotImplemented
+        return self._binary(self._within(other)[0], "&")
+
+    def __or__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else self._binary(other, "|")
+
+    def __xor__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else self._binary(other, "^")
+
+    def __sub__(self, other):
+        if not isinstance(other, (BitmapSet, set, frozenset)):
+            return NotImplemented
+        return self._binary(self._within(other)[0], "-")
+
+    __rand__, __ror__, __rxor__ = __and__, __or__, __xor__  # | ^ raise for elements a BitmapSet cannot hold
+
+    def __rsub__(self, other):
+        other = self._coerce(other)
+        return NotImplemented if other is None else other._binary(self, "-")
+
+    def __iand__(self, other):
+        self._containers = (self & other)._containers
+        return self
+
+    def __ior__(self, other):
+        self._containers = (self | other)._containers
+        return self
+
+    def __ixor__(self, other):
+        self._containers = (self ^ other)._containers
+        return self
+
+    def __isub__(self, other):
+        self._containers = (self - other)._containers
+        return self
+
+    # Method names from `set`
+    def union(self, *others) -> "BitmapSet":
+        result = self.copy()
+        for other in others:
+            result |= other if isinstance(other, BitmapSet) else BitmapSet(other)
+        return result
+
+    def intersection(self, *others) -> "BitmapSet":
+        result = self.copy()
+        for other in others:
+            result &= self._within(other)[0]
+        return result
+
+    def difference(self, *others) -> "BitmapSet":
+        result = self.copy()
+        for other in others:
+            result -= self._within(other)[0]
+        return result
+
+    def symmetric_difference(self, other) -> "BitmapSet":
+        return self ^ (other if isinstance(other, BitmapSet) else BitmapSet(other))
+
+    def isdisjoint(self, other) -> bool:
+        return self.intersection_len(self._within(other)[0]) == 0
+
+    def intersection_len(self, other: "BitmapSet") -> int:
+        """len(self & other) without building the result."""
+        total = 0
+        for high in self._containers.keys() & other._containers.keys():
+            a, b = self._containers[high], other._containers[high]
+            if a.kind == _ARRAY and b.kind == _ARRAY:
+                total += len(set(a.values).intersection(b.values))
+            else:
+                total += (a.to_int() & b.to_int()).bit_count()
+        return total
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (BitmapSet, set, frozenset)):
+            return NotImplemented
+        other, foreign = self._within(other)
+        if foreign or self._containers.keys() != other._containers.keys():
+            return False
+        return all(c.to_int() == other._containers[h].to_int() for h, c in self._containers.items())
+
+    def __le__(self, other) -> bool:
+        if not isinstance(other, (BitmapSet, set, frozenset)):
+            return NotImplemented
+        return len(self - self._within(other)[0]) == 0
+
+    def __ge__(self, other) -> bool:
+        if not isinstance(other, (BitmapSet, set, frozenset)):
+            return NotImplemented
+        other, foreign = self._within(other)
+        return not foreign and len(other - self) == 0
+
+    def __lt__(self, other) -> bool:
+        return self <= other and self != other
+
+    def __gt__(self, other) -> bool:
+        return self >= other and self != other
+
+    issubset, issuperset = __le__, __ge__
+
+    __hash__ = None
+
+    # --- Serialization ---
+    # Format (little-endian): b"BMS1", container count (uint32), then per container:
+    #   high key (uint64), kind (uint8), payload length in bytes (uint32), payload
+    _HEADER = struct.Struct("<4sI")
+    _ENTRY = struct.Struct("<QBI")
+
+    def tobytes(self) -> bytes:
+        parts = [self._HEADER.pack(b"BMS1", len(self._containers))]
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            payload = container.payload()
+            parts.append(self._ENTRY.pack(high, container.kind, len(payload)))
+            parts.append(payload)
+        return b"".join(parts)
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> "BitmapSet":
+        view = memoryview(data)
+        magic, count = cls._HEADER.unpack_from(view, 0)
+        if magic != b"BMS1":
+            raise ValueError("not a BitmapSet serialization")
+        offset = cls._HEADER.size
+        containers = {}
+        for _ in range(count):
+            high, kind, length = cls._ENTRY.unpack_from(view, offset)
+            offset += cls._ENTRY.size
+            payload = bytes(view[offset : offset + length])
+            offset += length
+            if kind == _ARRAY:
+                containers[high] = _ArrayContainer(_le_array("H", payload))
+            elif kind == _BITMAP:
+                words = _le_array("Q", payload)
+                containers[high] = _BitmapContainer(words, int.from_bytes(payload, "little").bit_count())
+            elif kind == _RUN:
+                containers[high] = _RunContainer(_le_array("H", payload))
+            else:
+                raise ValueError(f"unknown container kind {kind}")
+        return cls._from_containers(containers)
+
+
+# Example of code that should only run when bitmap_set.py is executed directly
+if __name__ == "__main__":
+    set1, set2 = BitmapSet({1, 2, 3}), BitmapSet({3, 4, 5})
+    print(f"Union:                {set1 | set2}")
+    print(f"Intersection:         {set1 & set2}")
+    print(f"Difference:           {set1 - set2}")
+    print(f"Symmetric difference: {set1 ^ set2}")
+
+    users_a = BitmapSet.from_range(0, 50_000_000)                  # Consecutive IDs -> run containers
+    users_b = BitmapSet(range(45_000_000, 60_000_000, 3))          # Every 3rd ID -> bitmap containers
+    print(f"\nusers_a: {users_a!r}")
+    print(f"users_b: {users_b!r}")
+    common = users_a & users_b
+    print(f"users_a & users_b: {len(common):,} IDs in {common.nbytes:,} bytes")
+    restored = BitmapSet.frombytes(common.tobytes())
+    print(f"Round-trip through tobytes()/frombytes() equal? {restored == common}")
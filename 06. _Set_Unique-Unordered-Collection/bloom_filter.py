@@ -0,0 +1,120 @@
+# bloom_filter.py: Memory-bounded "probably in the set" membership testing
+# A Python set stores every element (plus hash table slots). A Bloom filter
+# stores only k bits per element in a fixed-size bit array, so a deny-list of
+# 100 million entries fits in ~120 MB at a 1% false-positive rate.
+#   - "x not in bf" is ALWAYS correct (no false negatives).
+#   - "x in bf" may be wrong with probability ~fp_rate (false positives).
+
+import math
+import sys
+from collections.abc import Iterable
+from hashlib import blake2b
+
+
+def _key_bytes(item) -> bytes:
+    """Turn str/bytes/int items into bytes so they hash the same on every run."""
+    if isinstance(item, bytes):
+        return item
+    if isinstance(item, str):
+        return item.encode("utf-8")
+    if isinstance(item, int):
+        return item.to_bytes((item.bit_length() + 8) // 8, "little", signed=True)
+    raise TypeError(f"BloomFilter items must be str, bytes or int, not {type(item).__name__}")
+
+
+class BloomFilter:
+    """
+    A fixed-size Bloom filter sized from an expected capacity and a target
+    false-positive rate.
+
+    Unlike the built-in `hash()`, the hashes come from blake2b, so a filter
+    saved with `tobytes()` gives the same answers in another process.
+    """
+
+    __slots__ = ("capacity", "fp_rate", "num_bits", "num_hashes", "count", "_bits")
+
+    def __init__(self, capacity: int, fp_rate: float = 0.01):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < fp_rate < 1:
+            raise ValueError("fp_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        # Optimal sizes: m = -n * ln(p) / ln(2)^2 bits, k = (m / n) * ln(2) hashes
+        self.num_bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.count = 0
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, item):
+        # Double hashing: position_i = h1 + i * h2 (Kirsch & Mitzenmacher),
+        # so one 128-bit digest gives all k positions.
+        digest = blake2b(_key_bytes(item), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item) -> None:
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def update(self, items: Iterable) -> None:
+        for item in items:
+            self.add(item)
+
+    def __contains__(self, item) -> bool:
+        bits = self._bits
+        for pos in self._positions(item):
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False  # One clear bit means "definitely not added"
+        return True
+
+    def __len__(self) -> int:
+        """Number of add() calls (duplicates are counted again)."""
+        return self.count
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes used by the bit array."""
+        return len(self._bits)
+
+    def estimated_fp_rate(self) -> float:
+        """Expected false-positive rate for the items added so far: (1 - e^(-kn/m))^k."""
+        k, n, m = self.num_hashes, self.count, self.num_bits
+        return (1 - math.exp(-k * n / m)) ** k
+
+    def __repr__(self) -> str:
+        return (f"BloomFilter(capacity={self.capacity:,}, fp_rate={self.fp_rate}, "
+                f"bits={self.num_bits:,}, hashes={self.num_hashes}, bytes={self.nbytes:,})")
+
+    # --- Save / load ---
+    def tobytes(self) -> bytes:
+        header = f"{self.capacity},{self.fp_rate!r},{self.count}\n".encode("ascii")
+        return header + bytes(self._bits)
+
+    @classmethod
+    def frombytes(cls, data: bytes) -> "BloomFilter":
+        header, _, bits = data.partition(b"\n")
+        capacity, fp_rate, count = header.decode("ascii").split(",")
+        bf = cls(int(capacity), float(fp_rate))
+        if len(bits) != bf.nbytes:
+            raise ValueError("bit array size does not match the header")
+        bf._bits[:] = bits
+        bf.count = int(count)
+        return bf
+
+
+# Example of code that should only run when bloom_filter.py is executed directly
+if __name__ == "__main__":
+    deny_list = BloomFilter(capacity=100_000, fp_rate=0.01)
+    deny_list.update(f"user{i}" for i in range(100_000))
+    print(deny_list)
+    print(f"'user42' in deny_list? {'user42' in deny_list}")
+    false_hits = sum(f"guest{i}" in deny_list for i in range(100_000))
+    print(f"False positives on 100,000 unseen keys: {false_hits} ({false_hits / 1000:.2f}%)")
+    as_set = {f"user{i}" for i in range(100_000)}
+    set_bytes = sys.getsizeof(as_set) + sum(sys.getsizeof(s) for s in as_set)
+    print(f"Same data as a set: {set_bytes:,} bytes vs Bloom filter: {deny_list.nbytes:,} bytes")
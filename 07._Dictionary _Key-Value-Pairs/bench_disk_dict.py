@@ -0,0 +1,83 @@
+# bench_disk_dict.py: Compare DiskDict with shelve and a pickled dict
+# Measures bulk load, open (the "worker startup" cost) and random get().
+# Usage: python bench_disk_dict.py [--sizes 10000 100000] [--gets 10000]
+# "open" runs right after writing, so files are in the OS page cache; drop the
+# cache between runs (e.g. `echo 3 > /proc/sys/vm/drop_caches`) for a truly cold start.
+
+import argparse
+import os
+import pickle
+import random
+import shelve
+import tempfile
+import time
+
+from disk_dict import DiskDict
+
+
+def time_it(func) -> tuple[object, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def bench_disk_dict(path: str, data: dict, keys: list) -> tuple[float, float, float]:
+    def load():
+        with DiskDict(path, "n") as store:
+            store.update(data)
+
+    _, load_time = time_it(load)
+    store, open_time = time_it(lambda: DiskDict(path, "r"))
+    _, get_time = time_it(lambda: [store[k] for k in keys])
+    store.close()
+    return load_time, open_time, get_time
+
+
+def bench_shelve(path: str, data: dict, keys: list) -> tuple[float, float, float]:
+    def load():
+        with shelve.open(path, "n") as store:
+            store.update(data)
+
+    _, load_time = time_it(load)
+    store, open_time = time_it(lambda: shelve.open(path, "r"))
+    _, get_time = time_it(lambda: [store[k] for k in keys])
+    store.close()
+    return load_time, open_time, get_time
+
+
+def bench_pickle(path: str, data: dict, keys: list) -> tuple[float, float, float]:
+    def load():
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def reopen():
+        with open(path, "rb") as f:
+            return pickle.load(f)  # Must deserialize everything before the first lookup
+
+    _, load_time = time_it(load)
+    store, open_time = time_it(reopen)
+    _, get_time = time_it(lambda: [store[k] for k in keys])
+    return load_time, open_time, get_time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--gets", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for size in args.sizes:
+            data = {f"user:{i}": {"id": i, "name": f"name-{i}", "score": i * 0.5} for i in range(size)}
+            keys = [f"user:{rng.randrange(size)}" for _ in range(args.gets)]
+            print(f"\n--- {size:,} keys, {len(keys):,} random gets ---")
+            print(f"{'store':<14}{'bulk load s':>12}{'open s':>12}{'get us/op':>12}")
+            for name, bench in (("DiskDict", bench_disk_dict), ("shelve", bench_shelve), ("pickle dict", bench_pickle)):
+                load_time, open_time, get_time = bench(os.path.join(folder, f"{name}-{size}".replace(" ", "_")), data, keys)
+                print(f"{name:<14}{load_time:>12.3f}{open_time:>12.5f}{get_time / len(keys) * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
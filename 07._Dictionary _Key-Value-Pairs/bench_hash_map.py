@@ -0,0 +1,76 @@
+# bench_hash_map.py: Run HashMap (each probing strategy) and dict on uniform and adversarial keys
+# Usage: python bench_hash_map.py [--size 20000] [--seed 42]
+# Look for large mean/max probe lengths: those are the hash pathologies that
+# slow down lookup-heavy code even though dict hides them from you.
+
+import argparse
+import random
+import time
+
+from hash_map import PROBING, HashMap
+
+
+class ConstantHashKey:
+    """A key type whose __hash__ ignores its value (a common bug in custom classes)."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __hash__(self) -> int:
+        return 42
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ConstantHashKey) and self.value == other.value
+
+
+def key_sets(size: int, rng: random.Random) -> dict[str, list]:
+    return {
+        "uniform random ints": rng.sample(range(2**40), size),
+        "uniform strings": [f"user-{rng.getrandbits(64):x}" for _ in range(size)],
+        "sequential ints": list(range(size)),
+        # hash(int) == int, so these all share the low bits the table masks with.
+        # Quadratic cost, so the two adversarial sets are capped at 2,000 keys.
+        "multiples of 2**16": [i << 16 for i in range(min(size, 2000))],
+        # (a, b) tuples with few distinct values: many similar hashes
+        "small tuples": [(i % 97, i // 97) for i in range(size)],
+        "constant __hash__": [ConstantHashKey(i) for i in range(min(size, 2000))],
+    }
+
+
+def run_workload(factory, keys: list, lookups: list) -> tuple[object, float, float]:
+    start = time.perf_counter()
+    table = factory()
+    for i, key in enumerate(keys):
+        table[key] = i
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    for key in lookups:
+        table[key]
+    lookup = time.perf_counter() - start
+    return table, build, lookup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--size", type=int, default=20_000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+
+    for name, keys in key_sets(args.size, rng).items():
+        lookups = [rng.choice(keys) for _ in range(len(keys))]
+        print(f"\n--- {name} ({len(keys):,} keys) ---")
+        print(f"{'table':<22}{'insert us/op':>13}{'lookup us/op':>14}{'mean probe':>12}{'max probe':>11}{'resizes':>9}")
+        _, build, lookup = run_workload(dict, keys, lookups)
+        print(f"{'dict':<22}{build / len(keys) * 1e6:>13.3f}{lookup / len(keys) * 1e6:>14.3f}{'-':>12}{'-':>11}{'-':>9}")
+        for probing in PROBING:
+            table, build, lookup = run_workload(lambda: HashMap(probing=probing), keys, lookups)
+            stats = table.stats
+            print(f"{'HashMap ' + probing:<22}{build / len(keys) * 1e6:>13.3f}{lookup / len(keys) * 1e6:>14.3f}"
+                  f"{stats.mean_probe:>12.2f}{stats.max_probe:>11}{stats.resizes:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+# disk_dict.py: A persistent dict that opens instantly, whatever its size
+# A normal dict lives in memory, so every process has to rebuild it at startup.
+# DiskDict keeps the data in two files:
+#   <path>.log  append-only log of (key, pickled value) records
+#   <path>.idx  open-addressing hash table of (key hash, log offset) slots
+# Both files are memory-mapped. Opening only reads a 32-byte header, and a
+# lookup reads one index slot and one log record straight from the page cache.
+# Overwrites and deletes append to the log; compact() rewrites it without the
+# dead records.
+
+import mmap
+import os
+import pickle
+import struct
+from collections.abc import Iterable, Mapping, MutableMapping
+from hashlib import blake2b
+
+_HEADER = struct.Struct("<8sQQQ")  # magic, capacity, live keys, filled slots (live + deleted)
+_SLOT = struct.Struct("<QQ")       # key hash, log offset + 1 (0 = empty)
+_RECORD = struct.Struct("<II")     # key length, value length
+_MAGIC = b"DDIDX001"
+_DELETED = 2**64 - 1               # Slot offset marking a deleted key
+_TOMBSTONE = 2**32 - 1             # Record value length marking a delete in the log
+_MAX_LOAD = 0.5
+
+
+def _hash(key: bytes) -> int:
+    # Stable across processes (the built-in hash() of str is randomised per run)
+    return int.from_bytes(blake2b(key, digest_size=8).digest(), "little")
+
+
+class DiskDict(MutableMapping):
+    """
+    A dict-like store with str keys and picklable values, persisted on disk.
+
+    flag: "c" open or create (default), "n" always start empty, "r" read-only
+    (the same flags as `dbm` and `shelve`).
+    """
+
+    def __init__(self, path: str, flag: str = "c", initial_capacity: int = 1024):
+        if flag not in ("c", "n", "r"):
+            raise ValueError(f"flag must be 'c', 'n' or 'r', got {flag!r}")
+        self.path = os.fspath(path)
+        self.readonly = flag == "r"
+        self._log_path, self._idx_path = self.path + ".log", self.path + ".idx"
+        if flag == "n":
+            for name in (self._log_path, self._idx_path):
+                if os.path.exists(name):
+                    os.remove(name)
+        if not os.path.exists(self._log_path):
+            if self.readonly:
+                raise FileNotFoundError(self._log_path)
+            open(self._log_path, "wb").close()
+        self._log = open(self._log_path, "rb" if self.readonly else "a+b")
+        self._log_size = os.path.getsize(self._log_path)
+        self._log_map = None
+        self._log_mapped = 0
+        if not os.path.exists(self._idx_path):
+            if self.readonly:
+                raise FileNotFoundError(self._idx_path)
+            self._write_index(self._idx_path, self._live_from_log(), initial_capacity)
+        self._open_index()
+
+    # --- Files & mapping ---
+    def _open_index(self) -> None:
+        self._idx = open(self._idx_path, "rb" if self.readonly else "r+b")
+        access = mmap.ACCESS_READ if self.readonly else mmap.ACCESS_WRITE
+        self._idx_map = mmap.mmap(self._idx.fileno(), 0, access=access)
+        magic, self._capacity, _, _ = _HEADER.unpack_from(self._idx_map, 0)
+        if magic != _MAGIC:
+            raise ValueError(f"{self._idx_path} is not a DiskDict index")
+        self._mask = self._capacity - 1
+
+    def _close_index(self) -> None:
+        self._idx_map.close()
+        self._idx.close()
+
+    def _log_view(self, end: int) -> mmap.mmap:
+        """The log mapping, remapped if it does not yet cover byte `end`."""
+        if end > self._log_mapped:
+            self._log.flush()
+            if self._log_map is not None:
+                self._log_map.close()
+            self._log_map = mmap.mmap(self._log.fileno(), 0, access=mmap.ACCESS_READ)
+            self._log_mapped = len(self._log_map)
+        return self._log_map
+
+    def _read_record(self, offset: int) -> tuple[bytes, int, int]:
+        """Return (key, value offset, value length) for the record at `offset`."""
+        view = self._log_view(offset + _RECORD.size)
+        key_len, value_len = _RECORD.unpack_from(view, offset)
+        start = offset + _RECORD.size
+        view = self._log_view(start + key_len + (0 if value_len == _TOMBSTONE else value_len))
+        return view[start : start + key_len], start + key_len, value_len
+
+    def _append(self, records: Iterable[tuple[bytes, bytes | None]]) -> list[int]:
+        """Append (key, value-or-None-for-delete) records in one write; return their offsets."""
+        chunks, offsets = [], []
+        offset = self._log_size
+        for key, value in records:
+            value_len = _TOMBSTONE if value is None else len(value)
+            chunks.append(_RECORD.pack(len(key), value_len) + key + (value or b""))
+            offsets.append(offset)
+            offset += len(chunks[-1])
+        self._log.write(b"".join(chunks))
+        self._log_size = offset
+        return offsets
+
+    def _live_from_log(self) -> dict[bytes, int]:
+        """Scan the whole log (only used when the index file is missing)."""
+        live = {}
+        with open(self._log_path, "rb") as f:
+            data = f.read()
+        offset = 0
+        while offset < len(data):
+            key_len, value_len = _RECORD.unpack_from(data, offset)
+            key = data[offset + _RECORD.size : offset + _RECORD.size + key_len]
+            if value_len == _TOMBSTONE:
+                live.pop(key, None)
+                value_len = 0
+            else:
+                live[key] = offset
+            offset += _RECORD.size + key_len + value_len
+        return live
+
+    @staticmethod
+    def _write_index(path: str, live: Mapping[bytes, int], min_capacity: int) -> None:
+        """Write a fresh index for {key: log offset} to `path`."""
+        capacity = 8
+        while capacity < max(min_capacity, len(live) / _MAX_LOAD * 2):
+            capacity *= 2
+        table = bytearray(_HEADER.size + capacity * _SLOT.size)
+        _HEADER.pack_into(table, 0, _MAGIC, capacity, len(live), len(live))
+        mask = capacity - 1
+        for key, offset in live.items():
+            h = _hash(key)
+            i = h & mask
+            while _SLOT.unpack_from(table, _HEADER.size + i * _SLOT.size)[1]:
+                i = (i + 1) & mask
+            _SLOT.pack_into(table, _HEADER.size + i * _SLOT.size, h, offset + 1)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(table)
+        os.replace(tmp, path)  # Atomic: readers see the old or the new index, never half of one
+
+    # --- Index probing ---
+    def _probe(self, key: bytes, h: int) -> tuple[int, int]:
+        """Return (slot of key or -1, first free slot on the probe path)."""
+        idx, mask = self._idx_map, self._mask
+        i, free = h & mask, -1
+        while True:
+            slot_hash, ref = _SLOT.unpack_from(idx, _HEADER.size + i * _SLOT.size)
+            if ref == 0:
+                return -1, (i if free < 0 else free)
+            if ref == _DELETED:
+                if free < 0:
+                    free = i
+            elif slot_hash == h and self._read_record(ref - 1)[0] == key:
+                return i, free
+            i = (i + 1) & mask
+
+    def _counts(self) -> tuple[int, int]:
+        _, _, live, filled = _HEADER.unpack_from(self._idx_map, 0)
+        return live, filled
+
+    def _set_counts(self, live: int, filled: int) -> None:
+        _HEADER.pack_into(self._idx_map, 0, _MAGIC, self._capacity, live, filled)
+
+    def _slot_offsets(self):
+        """Yield the log offset of every live key, straight from the index."""
+        for _, ref in _SLOT.iter_unpack(memoryview(self._idx_map)[_HEADER.size :]):
+            if ref and ref != _DELETED:
+                yield ref - 1
+
+    def _check_writable(self) -> None:
+        if self.readonly:
+            raise PermissionError("DiskDict was opened read-only")
+
+    # --- Mapping API ---
+    def __len__(self) -> int:
+        return self._counts()[0]
+
+    def __getitem__(self, key: str):
+        if not isinstance(key, str):
+            raise KeyError(key)  # Cannot be stored (update() takes only str), so get(1) gives the default
+        raw = key.encode("utf-8")
+        slot, _ = self._probe(raw, _hash(raw))
+        if slot < 0:
+            raise KeyError(key)
+        _, ref = _SLOT.unpack_from(self._idx_map, _HEADER.size + slot * _SLOT.size)
+        _, start, length = self._read_record(ref - 1)
+        return pickle.loads(self._log_map[start : start + length])
+
+    def __contains__(self, key) -> bool:
+        if not isinstance(key, str):
+            return False
+        raw = key.encode("utf-8")
+        return self._probe(raw, _hash(raw))[0] >= 0
+
+    def __iter__(self):
+        for offset in list(self._slot_offsets()):
+            yield bytes(self._read_record(offset)[0]).decode("utf-8")
+
+    def __setitem__(self, key: str, value) -> None:
+        self.update(((key, value),))
+
+    def __delitem__(self, key: str) -> None:
+        self._check_writable()
+        if not isinstance(key, str):
+            raise KeyError(key)
+        raw = key.encode("utf-8")
+        slot, _ = self._probe(raw, _hash(raw))
+        if slot < 0:
+            raise KeyError(key)
+        self._append([(raw, None)])
+        _SLOT.pack_into(self._idx_map, _HEADER.size + slot * _SLOT.size, 0, _DELETED)
+        live, filled = self._counts()
+        self._set_counts(live - 1, filled)
+
+    def update(self, other=(), /, **kwargs) -> None:
+        """Bulk insert: one log write and at most one index resize for the whole batch."""
+        self._check_writable()
+        items = list(other.items() if isinstance(other, Mapping) else other) + list(kwargs.items())
+        if not items:
+            return
+        encoded = {}
+        for key, value in items:
+            if not isinstance(key, str):
+                raise TypeError(f"DiskDict keys must be str, not {type(key).__name__}")
+            encoded[key.encode("utf-8")] = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        live, filled = self._counts()
+        if filled + len(encoded) > _MAX_LOAD * self._capacity:
+            self._resize(live + len(encoded))
+            live, filled = self._counts()
+        offsets = self._append(encoded.items())
+        for (raw, _), offset in zip(encoded.items(), offsets):
+            h = _hash(raw)
+            slot, free = self._probe(raw, h)
+            if slot < 0:
+                slot = free
+                live += 1
+                if _SLOT.unpack_from(self._idx_map, _HEADER.size + slot * _SLOT.size)[1] == 0:
+                    filled += 1
+            _SLOT.pack_into(self._idx_map, _HEADER.size + slot * _SLOT.size, h, offset + 1)
+        self._set_counts(live, filled)
+
+    def _resize(self, expected: int) -> None:
+        live = {bytes(self._read_record(offset)[0]): offset for offset in self._slot_offsets()}
+        self._log.flush()
+        self._close_index()
+        self._write_index(self._idx_path, live, max(self._capacity, int(expected / _MAX_LOAD) + 1))
+        self._open_index()
+
+    # --- Maintenance ---
+    def compact(self) -> None:
+        """Rewrite the log with only the live records and rebuild the index."""
+        self._check_writable()
+        self._log.flush()
+        tmp_log = self._log_path + ".tmp"
+        live, offset = {}, 0
+        with open(tmp_log, "wb") as out:
+            for old in self._slot_offsets():
+                key, start, length = self._read_record(old)
+                record = _RECORD.pack(len(key), length) + bytes(key) + self._log_map[start : start + length]
+                out.write(record)
+                live[bytes(key)] = offset
+                offset += len(record)
+        self._close_index()
+        if self._log_map is not None:  # Nothing mapped yet: an empty log, or no reads since opening
+            self._log_map.close()
+        self._log.close()
+        os.replace(tmp_log, self._log_path)
+        self._write_index(self._idx_path, live, self._capacity)
+        self._log = open(self._log_path, "a+b")
+        self._log_size, self._log_map, self._log_mapped = offset, None, 0
+        self._open_index()
+
+    def sync(self) -> None:
+        """Push buffered log writes and index changes to the OS."""
+        if not self.readonly:
+            self._log.flush()
+            self._idx_map.flush()
+
+    def close(self) -> None:
+        if self._idx.closed:
+            return
+        self.sync()
+        self._close_index()
+        if self._log_map is not None:
+            self._log_map.close()
+        self._log.close()
+
+    def __enter__(self) -> "DiskDict":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"DiskDict({self.path!r}, {len(self):,} keys)"
+
+
+# Example of code that should only run when disk_dict.py is executed directly
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "users")
+        with DiskDict(path) as users:
+            users.update({"user1": {"name": "Riaz", "age": 28}, "user2": {"name": "Alex", "age": 30}})
+            users["user1"] = {"name": "Riaz", "age": 29}  # Appends a new record
+            print(f"Stored: {dict(users.items())}")
+            print(f"Log size before compact: {os.path.getsize(path + '.log')} bytes")
+            users.compact()
+            print(f"Log size after compact:  {os.path.getsize(path + '.log')} bytes")
+        with DiskDict(path, "r") as users:  # Reopen: no rebuild, just mmap
+            print(f"Reopened read-only: user1 -> {users['user1']}")
@@ -0,0 +1,247 @@
+# hash_map.py: An instrumented open-addressing hash map you can watch working
+# Python's dict is a hash table written in C, so you cannot see its probes.
+# HashMap stores keys in a flat table and, when the "home" slot (hash & mask)
+# is taken, probes other slots. Every probe, collision and resize is counted.
+# Probing strategies:
+#   - "linear":     home, home+1, home+2, ...                (great locality, clusters)
+#   - "quadratic":  home, home+1, home+3, home+6, ...        (triangular steps, fewer clusters)
+#   - "robin_hood": linear, but a new key steals the slot of any key that is
+#                   closer to its own home ("rob the rich"), keeping probe lengths even.
+
+from collections import Counter
+from collections.abc import Iterable, Mapping, MutableMapping
+
+_EMPTY = object()    # Slot never used
+_DELETED = object()  # Tombstone: slot was used, keep probing past it
+
+PROBING = ("linear", "quadratic", "robin_hood")
+
+
+class HashMapStats:
+    """Live counters for one HashMap."""
+
+    __slots__ = ("lookups", "probes", "max_probe", "collisions", "resizes", "probe_histogram")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self) -> None:
+        self.lookups = 0         # get/set/delete operations
+        self.probes = 0          # Slots inspected by those operations
+        self.max_probe = 0       # Longest probe sequence seen
+        self.collisions = 0      # Inserts whose home slot was already taken
+        self.resizes = 0         # Times the table grew
+        self.probe_histogram = Counter()  # probe length -> number of operations
+
+    def record(self, probe_length: int) -> None:
+        self.lookups += 1
+        self.probes += probe_length
+        self.probe_histogram[probe_length] += 1
+        if probe_length > self.max_probe:
+            self.max_probe = probe_length
+
+    @property
+    def mean_probe(self) -> float:
+        return self.probes / self.lookups if self.lookups else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "lookups": self.lookups,
+            "mean_probe": round(self.mean_probe, 3),
+            "max_probe": self.max_probe,
+            "collisions": self.collisions,
+            "resizes": self.resizes,
+        }
+
+    def __repr__(self) -> str:
+        return f"HashMapStats({self.as_dict()})"
+
+
+class HashMap(MutableMapping):
+    """
+    A MutableMapping backed by open addressing, with counters in `.stats`.
+
+    Unlike dict, iteration order is table order, not insertion order.
+    """
+
+    def __init__(self, data: Mapping | Iterable = (), *, probing: str = "linear",
+                 capacity: int = 8, max_load: float = 2 / 3):
+        if probing not in PROBING:
+            raise ValueError(f"probing must be one of {PROBING}, got {probing!r}")
+        if not 0 < max_load < 1:
+            raise ValueError("max_load must be between 0 and 1")
+        self.probing = probing
+        self.max_load = max_load
+        self.stats = HashMapStats()
+        size = 8
+        while size < capacity:
+            size *= 2  # Power of two, so `hash & mask` replaces `hash % size`
+        self._allocate(size)
+        self.update(data)
+
+    def _allocate(self, size: int) -> None:
+        self._mask = size - 1
+        self._hashes = [0] * size
+        self._keys = [_EMPTY] * size
+        self._values = [None] * size
+        self._used = 0   # Live keys
+        self._filled = 0  # Live keys + tombstones (both make probes longer)
+
+    # --- Introspection ---
+    @property
+    def capacity(self) -> int:
+        return self._mask + 1
+
+    @property
+    def load_factor(self) -> float:
+        return self._used / self.capacity
+
+    def __len__(self) -> int:
+        return self._used
+
+    def __repr__(self) -> str:
+        return f"HashMap({dict(self.items())!r}, probing={self.probing!r})"
+
+    def _slot(self, home: int, n: int) -> int:
+        """The n-th slot to try for a key whose home slot is `home`."""
+        if self.probing == "quadratic":
+            return (home + n * (n + 1) // 2) & self._mask
+        return (home + n) & self._mask
+
+    def _distance(self, index: int) -> int:
+        """How far the key stored at `index` sits from its home slot (Robin Hood)."""
+        return (index - self._hashes[index]) & self._mask
+
+    # --- Lookup ---
+    def _find(self, key, h: int) -> tuple[int, int]:
+        """Return (index of key or -1, probe length)."""
+        keys, hashes = self._keys, self._hashes
+        home = h & self._mask
+        for n in range(self.capacity):
+            i = self._slot(home, n)
+            k = keys[i]
+            if k is _EMPTY:
+                return -1, n + 1
+            if k is not _DELETED:
+                if hashes[i] == h and (k is key or k == key):
+                    return i, n + 1
+                if self.probing == "robin_hood" and self._distance(i) < n:
+                    return -1, n + 1  # Our key would have displaced this one: it is absent
+        return -1, self.capacity
+
+    def __getitem__(self, key):
+        h = hash(key)
+        i, probes = self._find(key, h)
+        self.stats.record(probes)
+        if i < 0:
+            raise KeyError(key)
+        return self._values[i]
+
+    def __contains__(self, key) -> bool:
+        i, probes = self._find(key, hash(key))
+        self.stats.record(probes)
+        return i >= 0
+
+    # --- Insert ---
+    def __setitem__(self, key, value) -> None:
+        h = hash(key)
+        i, probes = self._find(key, h)
+        if i >= 0:
+            self._values[i] = value
+            self.stats.record(probes)
+            return
+        if (self._filled + 1) > self.max_load * self.capacity:
+            self._resize()
+        self.stats.record(self._insert(h, key, value))
+        self._used += 1
+
+    def _insert(self, h: int, key, value) -> int:
+        """Place a key that is known to be absent; return the probe length."""
+        keys, hashes, values = self._keys, self._hashes, self._values
+        home = h & self._mask
+        if keys[home] is not _EMPTY:
+            self.stats.collisions += 1
+        if self.probing == "robin_hood":
+            n = 0
+            while True:
+                i = (home + n) & self._mask
+                if keys[i] is _EMPTY:
+                    hashes[i], keys[i], values[i] = h, key, value
+                    self._filled += 1
+                    return n + 1
+                existing = self._distance(i)
+                if existing < n:
+                    # Swap with the "richer" key and keep placing the evicted one
+                    hashes[i], h = h, hashes[i]
+                    keys[i], key = key, keys[i]
+                    values[i], value = value, values[i]
+                    home, n = h & self._mask, existing
+                n += 1
+        for n in range(self.capacity):
+            i = self._slot(home, n)
+            k = keys[i]
+            if k is _EMPTY or k is _DELETED:
+                if k is _EMPTY:
+                    self._filled += 1
+                hashes[i], keys[i], values[i] = h, key, value
+                return n + 1
+        raise RuntimeError("hash table is full")  # Unreachable while max_load < 1
+
+    def _resize(self) -> None:
+        old = [(h, k, v) for h, k, v in zip(self._hashes, self._keys, self._values)
+               if k is not _EMPTY and k is not _DELETED]
+        size = self.capacity
+        while len(old) + 1 > self.max_load * size / 2:
+            size *= 2  # Grow so the table is at most half of max_load full afterwards
+        self._allocate(size)
+        collisions = self.stats.collisions
+        for h, k, v in old:
+            self._insert(h, k, v)
+        self._used = len(old)
+        self.stats.collisions = collisions  # Re-inserts are not new collisions
+        self.stats.resizes += 1
+
+    # --- Delete ---
+    def __delitem__(self, key) -> None:
+        i, probes = self._find(key, hash(key))
+        self.stats.record(probes)
+        if i < 0:
+            raise KeyError(key)
+        self._used -= 1
+        if self.probing != "robin_hood":
+            self._keys[i], self._values[i] = _DELETED, None
+            return
+        # Robin Hood uses backward-shift deletion: pull followers one slot
+        # closer to home instead of leaving a tombstone.
+        keys, hashes, values, mask = self._keys, self._hashes, self._values, self._mask
+        nxt = (i + 1) & mask
+        while keys[nxt] is not _EMPTY and self._distance(nxt) > 0:
+            hashes[i], keys[i], values[i] = hashes[nxt], keys[nxt], values[nxt]
+            i, nxt = nxt, (nxt + 1) & mask
+        keys[i], values[i] = _EMPTY, None
+        self._filled -= 1
+
+    def __iter__(self):
+        for k in self._keys:
+            if k is not _EMPTY and k is not _DELETED:
+                yield k
+
+    def clear(self) -> None:
+        self._allocate(8)
+
+
+# Example of code that should only run when hash_map.py is executed directly
+if __name__ == "__main__":
+    for probing in PROBING:
+        table = HashMap(probing=probing)
+        for i in range(1000):
+            table[f"user{i}"] = i
+        for i in range(1000):
+            table[f"user{i}"]
+        print(f"{probing:<11} capacity={table.capacity:<5} load={table.load_factor:.2f} {table.stats}")
+
+    # Ints hash to themselves, so multiples of the table size all share one home slot
+    table = HashMap(capacity=1024)
+    for i in range(500):
+        table[i * 1024] = i
+    print(f"\nAdversarial ints (i * 1024): {table.stats}")
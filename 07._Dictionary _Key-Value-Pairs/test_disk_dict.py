@@ -0,0 +1,30 @@
+# test_disk_dict.py: DiskDict.compact() on stores with nothing to keep
+# Usage: python -m pytest test_disk_dict.py   (or: python test_disk_dict.py)
+
+import os
+import tempfile
+
+from disk_dict import DiskDict
+
+
+def test_compact_empty_store():
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "store")
+        with DiskDict(path) as store:
+            store.compact()  # Was AttributeError: the log was never memory-mapped
+            store["a"] = 1
+            assert store["a"] == 1
+        with DiskDict(path) as store:
+            del store["a"]
+            store.compact()
+            assert len(store) == 0
+        with DiskDict(path) as store:  # Reopened with zero live keys
+            store.compact()
+            store["b"] = 2
+        with DiskDict(path, "r") as store:
+            assert dict(store.items()) == {"b": 2}
+
+
+if __name__ == "__main__":
+    test_compact_empty_store()
+    print("ok")
@@ -0,0 +1,70 @@
+# bench_word_count.py: Throughput of the streaming word counter vs the dict comprehension
+# Usage: python bench_word_count.py [--mb 200] [--workers 8] [--comprehension-kb 200]
+# The comprehension is O(words x words), so it only runs on a small sample
+# (--comprehension-kb) and its MB/s is reported for that sample.
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from collections import Counter
+
+from word_count import word_count
+
+
+def make_log(path: str, megabytes: int, seed: int = 42) -> None:
+    """Write a synthetic log with a Zipf-like vocabulary (few common words, long tail)."""
+    rng = random.Random(seed)
+    vocabulary = [f"word{i}" for i in range(50_000)]
+    weights = [1 / (i + 1) for i in range(len(vocabulary))]
+    line_words = rng.choices(vocabulary, weights, k=200_000)
+    block = "\n".join(" ".join(line_words[i : i + 12]) for i in range(0, len(line_words), 12)) + "\n"
+    with open(path, "w") as f:
+        written = 0
+        while written < megabytes * 1024 * 1024:
+            f.write(block)
+            written += len(block)
+
+
+def comprehension_count(text: str) -> dict:
+    # The README's version: one full rescan per word
+    return {word: text.split().count(word) for word in text.split()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=int, default=100, help="size of the generated log")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-mb", type=int, default=16)
+    parser.add_argument("--comprehension-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "app.log")
+        make_log(path, args.mb)
+        size_mb = os.path.getsize(path) / 1e6
+
+        with open(path) as f:
+            sample = f.read(args.comprehension_kb * 1024).rsplit(" ", 1)[0]
+        start = time.perf_counter()
+        comprehension_count(sample)
+        elapsed = time.perf_counter() - start
+        print(f"dict comprehension ({len(sample) / 1e6:.2f} MB sample): {len(sample) / 1e6 / elapsed:10.2f} MB/s")
+
+        start = time.perf_counter()
+        with open(path) as f:
+            single = Counter(f.read().split())
+        elapsed = time.perf_counter() - start
+        print(f"Counter(text.split()), whole file:     {size_mb / elapsed:10.2f} MB/s")
+
+        for workers in sorted({1, args.workers}):
+            start = time.perf_counter()
+            counts = word_count(path, workers=workers, chunk_size=args.chunk_mb * 1024 * 1024)
+            elapsed = time.perf_counter() - start
+            print(f"word_count(workers={workers:<2}), streaming:     {size_mb / elapsed:10.2f} MB/s")
+        assert counts == single
+
+
+if __name__ == "__main__":
+    main()
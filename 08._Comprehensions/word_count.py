@@ -0,0 +1,167 @@
+# word_count.py: Count words in files far bigger than memory, on every CPU core
+# The README's dict comprehension
+#     {word: sentence.split().count(word) for word in sentence.split()}
+# rescans the whole text once per word (O(n^2)) and needs the text in memory.
+# This module instead:
+#   1. splits the file into byte ranges that end on whitespace (no word is cut in half),
+#   2. counts each range with collections.Counter in a process pool (one pass, O(n)),
+#   3. merges the partial Counters pairwise, like a tournament bracket (tree reduction).
+# top_words() keeps memory bounded by pruning every partial result to a fixed
+# number of counters (the Misra-Gries "frequent items" summary).
+
+import os
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from heapq import nlargest
+
+DEFAULT_CHUNK_SIZE = 32 * 1024 * 1024  # 32 MB of text per task
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+
+def chunk_ranges(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[int, int]]:
+    """Split a file into (start, end) byte ranges that each end right after whitespace."""
+    size = os.path.getsize(path)
+    ranges, start = [], 0
+    with open(path, "rb") as f:
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                # Walk forward to the next whitespace byte. UTF-8 never uses these
+                # byte values inside a multi-byte character, so this is always safe.
+                f.seek(end)
+                while end < size:
+                    block = f.read(4096)
+                    cut = next((i for i, b in enumerate(block) if b in _WHITESPACE), -1)
+                    if cut >= 0:
+                        end += cut + 1
+                        break
+                    end += len(block)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def count_range(path: str, start: int, end: int, lowercase: bool = False) -> Counter:
+    """Count the words in one byte range of a file (runs inside a worker process)."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+    if lowercase:
+        data = data.lower()
+    return Counter(data.split())
+
+
+def _prune(counts: Counter, capacity: int) -> Counter:
+    """
+    Misra-Gries step: keep at most `capacity` words by subtracting the
+    (capacity + 1)-th largest count from every count and dropping what reaches 0.
+    Every true count is under-estimated by at most total_words / (capacity + 1).
+    """
+    if len(counts) <= capacity:
+        return counts
+    threshold = nlargest(capacity + 1, counts.values())[-1]
+    return Counter({word: n - threshold for word, n in counts.items() if n > threshold})
+
+
+def _count_and_prune(path: str, start: int, end: int, lowercase: bool, capacity: int | None) -> Counter:
+    counts = count_range(path, start, end, lowercase)
+    return counts if capacity is None else _prune(counts, capacity)
+
+
+def tree_reduce(counters: list[Counter], capacity: int | None = None) -> Counter:
+    """Merge Counters in pairs, level by level, until one is left."""
+    if not counters:
+        return Counter()
+    while len(counters) > 1:
+        merged = []
+        for i in range(0, len(counters) - 1, 2):
+            left = counters[i]
+            left.update(counters[i + 1])  # In place: no third Counter per merge
+            merged.append(left if capacity is None else _prune(left, capacity))
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+    return counters[0]
+
+
+def _push(stack: list[tuple[int, Counter]], counts: Counter, capacity: int | None) -> None:
+    """
+    Binary-counter merging: a new result merges with the partial on top of
+    the stack while both cover the same number of ranges, so only ~log2(n)
+    partial Counters are alive at once.
+    """
+    level = 0
+    while stack and stack[-1][0] == level:
+        counts = tree_reduce([stack.pop()[1], counts], capacity)
+        level += 1
+    stack.append((level, counts))
+
+
+def _count_file(path: str, workers: int | None, chunk_size: int, lowercase: bool,
+                capacity: int | None) -> Counter:
+    ranges = chunk_ranges(path, chunk_size)
+    stack: list[tuple[int, Counter]] = []
+    if workers == 1 or len(ranges) == 1:
+        for start, end in ranges:
+            _push(stack, _count_and_prune(path, start, end, lowercase, capacity), capacity)
+        return tree_reduce([counts for _, counts in stack], capacity)
+    # Ranges are submitted in a window of 2 per worker, so finished results
+    # (each held by its Future) do not pile up while the stack stays small.
+    todo = iter(ranges)
+    window = 2 * (workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = {pool.submit(_count_and_prune, path, start, end, lowercase, capacity)
+                   for start, end in islice(todo, window)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for start, end in islice(todo, len(done)):
+                pending.add(pool.submit(_count_and_prune, path, start, end, lowercase, capacity))
+            while done:
+                _push(stack, done.pop().result(), capacity)
+    return tree_reduce([counts for _, counts in stack], capacity)
+
+
+def word_count(path: str, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+               lowercase: bool = False) -> Counter:
+    """
+    Exact word counts for a file (words are whitespace-separated, like str.split()).
+
+    Keys are decoded back to str. workers=None uses every CPU core; workers=1
+    runs in this process.
+    """
+    decoded = Counter()
+    for word, n in _count_file(path, workers, chunk_size, lowercase, capacity=None).items():
+        decoded[word.decode("utf-8", "replace")] += n  # Different invalid bytes can decode to the same str
+    return decoded
+
+
+def top_words(path: str, k: int = 10, workers: int | None = None, chunk_size: int = DEFAULT_CHUNK_SIZE,
+              lowercase: bool = False, capacity: int | None = None) -> list[tuple[str, int]]:
+    """
+    The k most common words, keeping at most `capacity` counters per partial
+    result (default 100 * k) so memory stays bounded on huge vocabularies.
+
+    Counts are lower bounds: the true count is at most total_words / (capacity + 1) higher.
+    """
+    capacity = capacity or 100 * k
+    counts = _count_file(path, workers, chunk_size, lowercase, capacity)
+    return [(word.decode("utf-8", "replace"), n) for word, n in counts.most_common(k)]
+
+
+# Example of code that should only run when word_count.py is executed directly
+if __name__ == "__main__":
+    import tempfile
+
+    sentence = "hello world hello python"
+    word_count_comp = {word: sentence.split().count(word) for word in sentence.split()}
+    print(f"Comprehension: {word_count_comp}")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as f:
+        f.write((sentence + "\n") * 100_000)
+        path = f.name
+    try:
+        print(f"word_count():  {dict(word_count(path, chunk_size=256 * 1024))}")
+        print(f"top_words(k=2): {top_words(path, k=2, chunk_size=256 * 1024)}")
+    finally:
+        os.remove(path)
@@ -0,0 +1,55 @@
+# bench_parallel.py: Where do pmap/pfilter/preduce beat the built-ins?
+# Runs a cheap lambda and an expensive lambda through map/filter/reduce and
+# their parallel versions at several input sizes.
+# Usage: python bench_parallel.py [--sizes 1000 100000 1000000] [--workers 4]
+# Cheap lambdas lose to the built-ins (pickling costs more than the work);
+# expensive ones win once there is enough work to keep every core busy.
+
+import argparse
+import os
+import time
+from functools import reduce
+
+from parallel import pfilter, pmap, preduce
+
+WORKLOADS = {
+    "cheap x * 2": lambda x: x * 2,
+    "expensive sum(range(2000))": lambda x: sum(range(x % 7, 2000)),
+}
+
+
+def time_it(func) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    print(f"workers = {args.workers}")
+
+    for name, func in WORKLOADS.items():
+        print(f"\n=== {name} ===")
+        print(f"{'n':>10}{'map':>10}{'pmap/proc':>11}{'pmap/thr':>10}{'filter':>10}{'pfilter':>10}"
+              f"{'reduce':>10}{'preduce':>10}   (seconds)")
+        for size in args.sizes:
+            data = range(size)
+            keep = lambda x: func(x) % 3 == 0
+            combine = lambda a, b: a + func(b) - func(b)  # Associative, with the same per-item cost
+            row = [
+                time_it(lambda: list(map(func, data))),
+                time_it(lambda: list(pmap(func, data, workers=args.workers))),
+                time_it(lambda: list(pmap(func, data, workers=args.workers, executor="thread"))),
+                time_it(lambda: list(filter(keep, data))),
+                time_it(lambda: list(pfilter(keep, data, workers=args.workers))),
+                time_it(lambda: reduce(combine, data)),
+                time_it(lambda: preduce(combine, data, workers=args.workers)),
+            ]
+            print(f"{size:>10,}{row[0]:>10.3f}{row[1]:>11.3f}" + "".join(f"{t:>10.3f}" for t in row[2:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+# parallel.py: Drop-in parallel versions of map, filter and functools.reduce
+#   pmap(func, *iterables)      like map(), but chunks run in a process/thread pool
+#   pfilter(func, iterable)     like filter()
+#   preduce(func, iterable)     like functools.reduce(), as a tree (func must be associative)
+# Results are streamed lazily: only a few chunks are in flight at once, so an
+# input with billions of items is never turned into one big list.
+#
+# Lambdas cannot be pickled, so a process pool cannot normally run them.
+# On systems with the "fork" start method (Linux), an unpicklable function is
+# registered in a module-level table before the pool starts; the forked
+# workers inherit that table and only a small integer token is sent per task.
+
+import itertools
+import multiprocessing
+import os
+import pickle
+import time
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import reduce
+
+TARGET_TASK_SECONDS = 0.02   # Auto chunk sizing aims for ~20 ms of work per task
+MAX_CHUNKSIZE = 1 << 16
+_MISSING = object()
+
+_FORK_FUNCS: dict[int, Callable] = {}   # Token -> function, inherited by forked workers
+_fork_tokens = itertools.count()
+
+
+def _resolve(func):
+    return _FORK_FUNCS[func] if isinstance(func, int) else func
+
+
+def _run_chunk(mode: str, func, chunk: list):
+    """Apply one task in a worker; return (result, seconds spent)."""
+    func = _resolve(func)
+    start = time.perf_counter()
+    if mode == "map":
+        result = [func(*args) for args in chunk]
+    elif mode == "filter":
+        result = [item for item in chunk if func(item)]
+    else:
+        result = reduce(func, chunk)
+    return result, time.perf_counter() - start
+
+
+class _ChunkSizer:
+    """Grow or shrink the chunk size so each task takes about TARGET_TASK_SECONDS."""
+
+    def __init__(self, chunksize: int | None):
+        self.fixed = chunksize is not None
+        self.size = chunksize or 1
+
+    def update(self, items: int, seconds: float) -> None:
+        if self.fixed or items < self.size:
+            return
+        ideal = items * TARGET_TASK_SECONDS / max(seconds, 1e-6)
+        # Move at most 4x per step so one noisy measurement cannot swing it wildly
+        self.size = int(min(MAX_CHUNKSIZE, max(1, self.size / 4, min(ideal, self.size * 4))))
+
+
+def _make_executor(executor: str | Executor, workers: int | None, func) -> tuple[Executor, object, bool]:
+    """Return (executor, function or fork token, whether we own the executor)."""
+    if isinstance(executor, Executor):
+        return executor, func, False
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers), func, True
+    if executor != "process":
+        raise ValueError(f"executor must be 'process', 'thread' or an Executor, got {executor!r}")
+    try:
+        pickle.dumps(func)
+        return ProcessPoolExecutor(max_workers=workers), func, True
+    except (pickle.PicklingError, AttributeError, TypeError):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            raise TypeError(
+                f"{func!r} cannot be pickled for a process pool; use a def function or executor='thread'"
+            ) from None
+        token = next(_fork_tokens)
+        _FORK_FUNCS[token] = func
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork"))
+        return pool, token, True
+
+
+def _run(mode: str, func, items: Iterator, *, executor, workers, chunksize, ordered) -> Iterator:
+    """Submit chunks of `items` lazily and yield each chunk's result."""
+    pool, task_func, owned = _make_executor(executor, workers, func)
+    max_in_flight = 2 * (workers or getattr(pool, "_max_workers", None) or os.cpu_count() or 1)
+    sizer = _ChunkSizer(chunksize)
+    pending: deque = deque()
+    try:
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                chunk = list(itertools.islice(items, sizer.size))
+                if not chunk:
+                    exhausted = True
+                    break
+                future = pool.submit(_run_chunk, mode, task_func, chunk)
+                future.items = len(chunk)
+                pending.append(future)
+            if not pending:
+                return
+            if ordered:
+                future = pending.popleft()
+            else:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                future = done.pop()
+                pending.remove(future)
+            result, seconds = future.result()
+            sizer.update(future.items, seconds)
+            yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        if owned:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if isinstance(task_func, int):
+            del _FORK_FUNCS[task_func]
+
+
+def pmap(func: Callable, *iterables: Iterable, executor: str | Executor = "process",
+         workers: int | None = None, chunksize: int | None = None, ordered: bool = True) -> Iterator:
+    """
+    Parallel map(func, *iterables), yielding results lazily.
+
+    - executor: "process" (CPU-bound work), "thread" (I/O-bound work) or an existing Executor
+    - chunksize: items per task; None picks it automatically (~20 ms of work per task)
+    - ordered: False yields results as soon as any chunk finishes (input order is lost)
+    """
+    items = zip(*iterables)
+    for results in _run("map", func, items, executor=executor, workers=workers,
+                        chunksize=chunksize, ordered=ordered):
+        yield from results
+
+
+def pfilter(func: Callable, iterable: Iterable, *, executor: str | Executor = "process",
+            workers: int | None = None, chunksize: int | None = None, ordered: bool = True) -> Iterator:
+    """Parallel filter(func, iterable), yielding kept items lazily."""
+    if func is None:
+        func = bool
+    for kept in _run("filter", func, iter(iterable), executor=executor, workers=workers,
+                     chunksize=chunksize, ordered=ordered):
+        yield from kept
+
+
+def preduce(func: Callable, iterable: Iterable, initial=_MISSING, *, executor: str | Executor = "process",
+            workers: int | None = None, chunksize: int | None = None):
+    """
+    Parallel functools.reduce(func, iterable[, initial]) for an ASSOCIATIVE func
+    such as +, *, max, min or set union.
+
+    Each chunk is reduced in a worker, then the partial results are combined
+    pairwise like a tournament bracket, keeping left-to-right order so the
+    operator does not have to be commutative.
+    """
+    stack: list[tuple[int, object]] = []  # (level, partial) — binary-counter merge in order
+    for partial in _run("reduce", func, iter(iterable), executor=executor, workers=workers,
+                        chunksize=chunksize, ordered=True):
+        level = 0
+        while stack and stack[-1][0] == level:
+            partial = func(stack.pop()[1], partial)
+            level += 1
+        stack.append((level, partial))
+    if not stack:
+        if initial is _MISSING:
+            raise TypeError("preduce() of empty iterable with no initial value")
+        return initial
+    result = stack.pop()[1]
+    while stack:
+        result = func(stack.pop()[1], result)
+    return result if initial is _MISSING else func(initial, result)
+
+
+# Example of code that should only run when parallel.py is executed directly
+if __name__ == "__main__":
+    numbers = range(1, 11)
+    print(f"pmap(lambda x: x ** 2):          {list(pmap(lambda x: x ** 2, numbers))}")
+    print(f"pfilter(lambda x: x % 2 == 0):   {list(pfilter(lambda x: x % 2 == 0, numbers))}")
+    print(f"preduce(lambda x, y: x + y):     {preduce(lambda x, y: x + y, numbers)}")
+    print(f"preduce(max, thread pool):       {preduce(max, numbers, executor='thread')}")
+    print(f"unordered pmap (any order):      {sorted(pmap(str.upper, ['a', 'b', 'c'], ordered=False))}")
@@ -0,0 +1,356 @@
+# caching.py: Memoization decorators for pure-but-expensive functions
+# functools.lru_cache treats f(1, 2), f(1, b=2) and f(a=1, b=2) as three
+# different calls, and offers only LRU eviction. @cached:
+#   - builds ONE canonical key per call by binding the arguments to the
+#     signature (positional, keyword, defaults, *args and **kwargs),
+#   - evicts by LRU (least recently used), LFU (least frequently used) or TTL (age),
+#   - can cap the cache by memory (max_bytes) as well as by entry count,
+#   - splits the cache into shards, each with its own lock, so threads that
+#     hit different keys do not wait for each other,
+#   - reports hit rate and the compute time saved in cache_info().
+
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+CacheInfo = namedtuple(
+    "CacheInfo", "hits misses hit_rate maxsize currsize bytes evictions time_saved"
+)
+
+_MISSING = object()
+POLICIES = ("lru", "lfu", "ttl")
+
+
+# --------------------------------------------------
+# Canonical keys
+# --------------------------------------------------
+def _freeze(value):
+    """Hashable stand-in for lists, dicts and sets (so f([1, 2]) can be cached)."""
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_freeze(v) for v in value))
+    if isinstance(value, dict):
+        return ("dict", frozenset((_freeze(k), _freeze(v)) for k, v in value.items()))  # Keys need not sort
+    if isinstance(value, (set, frozenset)):
+        return ("set", frozenset(_freeze(v) for v in value))
+    hash(value)  # Raises TypeError for anything else that is unhashable
+    return value
+
+
+def make_key_function(func, typed: bool = False):
+    """
+    Return key(args, kwargs) for func. Every way of passing the same values
+    gives the same key: greet("Riaz") == greet(name="Riaz").
+    """
+    signature = inspect.signature(func)
+    params = list(signature.parameters.values())
+    simple = all(p.kind is p.POSITIONAL_OR_KEYWORD for p in params)
+    n_params = len(params)
+    defaults = [p.default for p in params]
+    index = {p.name: i for i, p in enumerate(params)}
+    empty = inspect.Parameter.empty
+
+    def bind_slow(args: tuple, kwargs: dict) -> tuple:
+        bound = signature.bind(*args, **kwargs)  # Raises TypeError for bad calls, like the real call would
+        bound.apply_defaults()
+        values = []
+        for p in params:
+            value = bound.arguments[p.name]
+            if p.kind is p.VAR_KEYWORD:
+                value = tuple(sorted(value.items()))  # **kwargs order does not matter
+            values.append(value)
+        return tuple(values)
+
+    def bind_fast(args: tuple, kwargs: dict) -> tuple | None:
+        # Plain (a, b=1) signatures: fill in defaults and keywords by position
+        if len(args) > n_params:
+            return None
+        values = list(args) + defaults[len(args):]
+        for name, value in kwargs.items():
+            i = index.get(name, -1)
+            if i < len(args):
+                return None  # Unknown name or given twice: let bind() raise the error
+            values[i] = value
+        if any(v is empty for v in values):
+            return None
+        return tuple(values)
+
+    def key(args: tuple, kwargs: dict):
+        values = None
+        if simple:
+            values = args if not kwargs and len(args) == n_params else bind_fast(args, kwargs)
+        if values is None:
+            values = bind_slow(args, kwargs)
+        if typed:
+            values += tuple(type(v) for v in values)  # f(1) and f(1.0) cached separately
+        return values
+
+    return key
+
+
+def _deep_sizeof(value, seen=None) -> int:
+    """Approximate bytes used by a value, including what its containers hold."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_deep_sizeof(k, seen) + _deep_sizeof(v, seen) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_deep_sizeof(v, seen) for v in value)
+    return size
+
+
+# --------------------------------------------------
+# Eviction policies (one store per shard, always used under the shard lock)
+# Entries are (value, size_in_bytes, compute_seconds, expires_at)
+# --------------------------------------------------
+class _LRUStore:
+    """Least recently used: an OrderedDict whose end is the most recent use."""
+
+    def __init__(self):
+        self.data = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def get(self, key):
+        entry = self.data.get(key, _MISSING)
+        if entry is not _MISSING:
+            self.data.move_to_end(key)
+        return entry
+
+    def put(self, key, entry) -> None:
+        self.data[key] = entry
+        self.data.move_to_end(key)
+
+    def pop(self, key):
+        return self.data.pop(key)
+
+    def victim(self):
+        return next(iter(self.data))
+
+    def clear(self) -> None:
+        self.data.clear()
+
+
+class _TTLStore(_LRUStore):
+    """
+    Entries expire `ttl` seconds after they were computed; otherwise LRU.
+    get() returns expired entries too: the wrapper pops them, so their size
+    leaves the shard's byte count.
+    """
+
+    def victim(self):
+        # Prefer an expired entry, else the least recently used one
+        now = time.monotonic()
+        for key, entry in self.data.items():
+            if entry[3] <= now:
+                return key
+        return next(iter(self.data))
+
+
+class _LFUStore:
+    """
+    Least frequently used, O(1) per operation: keys are grouped into buckets
+    by hit count, and each bucket is ordered by recency to break ties.
+    """
+
+    def __init__(self):
+        self.data = {}                     # key -> entry
+        self.counts = {}                   # key -> use count
+        self.buckets: dict[int, OrderedDict] = {}
+        self.min_count = 0
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def _touch(self, key) -> None:
+        count = self.counts[key]
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = count + 1
+        self.counts[key] = count + 1
+        self.buckets.setdefault(count + 1, OrderedDict())[key] = None
+
+    def get(self, key):
+        entry = self.data.get(key, _MISSING)
+        if entry is not _MISSING:
+            self._touch(key)
+        return entry
+
+    def put(self, key, entry) -> None:
+        if key in self.data:
+            self.data[key] = entry
+            self._touch(key)
+            return
+        self.data[key] = entry
+        self.counts[key] = 1
+        self.buckets.setdefault(1, OrderedDict())[key] = None
+        self.min_count = 1
+
+    def pop(self, key):
+        count = self.counts.pop(key)
+        bucket = self.buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[count]
+            if self.min_count == count:
+                self.min_count = min(self.buckets, default=0)
+        return self.data.pop(key)
+
+    def victim(self):
+        return next(iter(self.buckets[self.min_count]))
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.counts.clear()
+        self.buckets.clear()
+        self.min_count = 0
+
+
+_STORES = {"lru": _LRUStore, "lfu": _LFUStore, "ttl": _TTLStore}
+
+
+class _Shard:
+    __slots__ = ("lock", "store", "bytes", "hits", "misses", "evictions", "time_saved")
+
+    def __init__(self, policy: str):
+        self.lock = threading.Lock()
+        self.store = _STORES[policy]()
+        self.bytes = self.hits = self.misses = self.evictions = 0
+        self.time_saved = 0.0
+
+
+# --------------------------------------------------
+# The decorator
+# --------------------------------------------------
+def cached(func=None, *, policy: str = "lru", maxsize: int | None = 128, ttl: float | None = None,
+           max_bytes: int | None = None, shards: int = 8, typed: bool = False):
+    """
+    Memoize a pure function.
+
+    - policy: "lru", "lfu" or "ttl" (ttl= seconds is required for "ttl")
+    - maxsize: maximum number of entries (None = unlimited)
+    - max_bytes: maximum approximate size of the cached values
+    - shards: number of independently locked sub-caches (1 = a single lock)
+
+    Usable as @cached or @cached(policy="lfu", maxsize=1000).
+    The wrapped function gets cache_info() and cache_clear() like functools.lru_cache.
+    """
+    if func is None:
+        return lambda f: cached(f, policy=policy, maxsize=maxsize, ttl=ttl,
+                                max_bytes=max_bytes, shards=shards, typed=typed)
+    if policy not in POLICIES:
+        raise ValueError(f"policy must be one of {POLICIES}, got {policy!r}")
+    if (policy == "ttl") != (ttl is not None):
+        raise ValueError("ttl= is required with policy='ttl' and only allowed with it")
+    shards = max(1, shards if maxsize is None else min(shards, maxsize or 1))
+    shard_list = [_Shard(policy) for _ in range(shards)]
+    shard_maxsize = None if maxsize is None else maxsize // shards  # 0 only for maxsize=0: no caching
+    shard_max_bytes = None if max_bytes is None else max_bytes // shards
+    make_key = make_key_function(func, typed)
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(args, kwargs)
+        try:
+            shard = shard_list[hash(key) % shards]
+        except TypeError:
+            key = _freeze(key)  # Unhashable arguments such as lists or dicts
+            shard = shard_list[hash(key) % shards]
+        with shard.lock:
+            entry = shard.store.get(key)
+            if entry is not _MISSING:
+                if not entry[3] or entry[3] > time.monotonic():
+                    shard.hits += 1
+                    shard.time_saved += entry[2]
+                    return entry[0]
+                shard.bytes -= shard.store.pop(key)[1]  # Expired (policy="ttl")
+            shard.misses += 1
+        # Compute outside the lock so a slow call does not block its whole shard
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        cost = time.perf_counter() - start
+        size = _deep_sizeof(value) if shard_max_bytes is not None else 0
+        if shard_maxsize == 0 or shard_max_bytes is not None and size > shard_max_bytes:
+            return value  # maxsize=0 (like functools.lru_cache), or too big to ever fit: do not cache
+        expires = time.monotonic() + ttl if ttl is not None else 0.0
+        with shard.lock:
+            store = shard.store
+            if key in store.data:
+                shard.bytes -= store.pop(key)[1]  # Another thread computed it meanwhile
+            # Make room first: the new key must not be its own victim (LFU would always pick it)
+            while len(store) and (
+                (shard_maxsize is not None and len(store) >= shard_maxsize)
+                or (shard_max_bytes is not None and shard.bytes + size > shard_max_bytes)
+            ):
+                shard.bytes -= store.pop(store.victim())[1]
+                shard.evictions += 1
+            store.put(key, (value, size, cost, expires))
+            shard.bytes += size
+        return value
+
+    def cache_info() -> CacheInfo:
+        hits = misses = currsize = used = evictions = 0
+        saved = 0.0
+        for shard in shard_list:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                currsize += len(shard.store)
+                used += shard.bytes
+                evictions += shard.evictions
+                saved += shard.time_saved
+        calls = hits + misses
+        return CacheInfo(hits, misses, hits / calls if calls else 0.0, maxsize, currsize, used, evictions, saved)
+
+    def cache_clear() -> None:
+        for shard in shard_list:
+            with shard.lock:
+                shard.store.clear()
+                shard.bytes = shard.hits = shard.misses = shard.evictions = 0
+                shard.time_saved = 0.0
+
+    wrapper.cache_info = cache_info
+    wrapper.cache_clear = cache_clear
+    return wrapper
+
+
+def lru_cached(maxsize: int | None = 128, **options):
+    return cached(policy="lru", maxsize=maxsize, **options)
+
+
+def lfu_cached(maxsize: int | None = 128, **options):
+    return cached(policy="lfu", maxsize=maxsize, **options)
+
+
+def ttl_cached(seconds: float, maxsize: int | None = 128, **options):
+    return cached(policy="ttl", ttl=seconds, maxsize=maxsize, **options)
+
+
+# Example of code that should only run when caching.py is executed directly
+if __name__ == "__main__":
+    @cached
+    def power_level(character, level=100, unit="points"):
+        time.sleep(0.01)  # Pretend this is expensive
+        return f"{character} has a power level of {level} {unit}."
+
+    @lfu_cached(maxsize=2)
+    def build_profile(first_name, last_name, **user_info):
+        return {"first": first_name, "last": last_name, **user_info}
+
+    print(power_level("Goku"))
+    print(power_level("Goku", 100))                       # Same call as above -> hit
+    print(power_level(character="Goku", unit="points"))   # Same call again -> hit
+    print(power_level.cache_info())
+
+    build_profile("Ada", "Lovelace", field="Mathematics", title="Countess")
+    build_profile("Ada", "Lovelace", title="Countess", field="Mathematics")  # **kwargs order ignored -> hit
+    print(build_profile.cache_info())
@@ -0,0 +1,24 @@
+# test_caching.py: cached() keys for unhashable arguments
+# Usage: python -m pytest test_caching.py   (or: python test_caching.py)
+
+from caching import cached
+
+
+def test_dict_argument_with_mixed_keys():
+    calls = []
+
+    @cached(maxsize=8)
+    def size(mapping: dict) -> int:
+        calls.append(mapping)
+        return len(mapping)
+
+    assert size({1: "a", "b": 2}) == 2  # Was TypeError: keys 1 and "b" cannot be sorted
+    assert size({"b": 2, 1: "a"}) == 2  # Same items in another order: same key
+    assert size({1: "a", "b": 3}) == 2
+    assert len(calls) == 2
+    assert size.cache_info().hits == 1
+
+
+if __name__ == "__main__":
+    test_dict_argument_with_mixed_keys()
+    print("ok")
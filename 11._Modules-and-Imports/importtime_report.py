@@ -0,0 +1,107 @@
+# importtime_report.py: Measure how much startup time each lesson spends on imports
+# Runs every lesson's main.py under `python -X importtime`, which prints one
+# line per imported module to stderr:
+#     import time: self [us] | cumulative | imported package
+# and reports, per lesson, the total import cost and the most expensive modules.
+# Usage: python importtime_report.py [--top 5] [--repeat 3] [--lessons 11 16]
+#        python importtime_report.py --script some_cli.py   (any single script)
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_importtime(stderr: str) -> dict[str, tuple[int, int, int]]:
+    """Return {module: (self_us, cumulative_us, nesting_depth)} from -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us), (len(indent) - 1) // 2)
+    return modules
+
+
+def run_importtime(script: str | None, timeout: float = 60) -> dict[str, tuple[int, int, int]]:
+    """Run a script (or an empty program) with -X importtime and parse the result."""
+    command = [sys.executable, "-X", "importtime"]
+    command += [os.path.basename(script)] if script else ["-c", "pass"]
+    result = subprocess.run(
+        command,
+        cwd=os.path.dirname(script) if script else None,
+        stdin=subprocess.DEVNULL,       # Lessons that call input() get EOF instead of hanging
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        timeout=timeout,
+    )
+    return parse_importtime(result.stderr)
+
+
+def measure(script: str | None, repeat: int) -> dict[str, tuple[int, int, int]]:
+    """Median self/cumulative time per module over `repeat` runs (imports are noisy)."""
+    runs = [run_importtime(script) for _ in range(repeat)]
+    samples = defaultdict(list)
+    for run in runs:
+        for name, timing in run.items():
+            samples[name].append(timing)
+    return {
+        name: (int(statistics.median(t[0] for t in timings)),
+               int(statistics.median(t[1] for t in timings)),
+               timings[0][2])
+        for name, timings in samples.items()
+    }
+
+
+def lesson_scripts(selected: list[str] | None) -> list[str]:
+    scripts = []
+    for folder in sorted(os.listdir(REPO_ROOT)):
+        path = os.path.join(REPO_ROOT, folder, "main.py")
+        if os.path.isfile(path) and (not selected or any(folder.startswith(prefix) for prefix in selected)):
+            scripts.append(path)
+    return scripts
+
+
+def report(name: str, modules: dict, baseline: set[str], top: int) -> int:
+    # Only modules the script itself caused; the interpreter's own startup imports are excluded
+    own = {m: t for m, t in modules.items() if m not in baseline}
+    top_level_total = sum(cumulative for _, cumulative, depth in own.values() if depth == 0)
+    print(f"\n--- {name}: {len(own)} modules, {top_level_total / 1000:.2f} ms cumulative ---")
+    ranked = sorted(own.items(), key=lambda item: item[1][1], reverse=True)[:top]
+    for module, (self_us, cumulative_us, depth) in ranked:
+        print(f"  {module:<40}{'  ' * depth}self {self_us / 1000:7.2f} ms   cumulative {cumulative_us / 1000:7.2f} ms")
+    return top_level_total
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lessons", nargs="*", help="folder prefixes to include, e.g. 11 16")
+    parser.add_argument("--script", help="measure this script instead of the lessons")
+    parser.add_argument("--top", type=int, default=5, help="modules to list per script")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    baseline = set(measure(None, args.repeat))
+    scripts = [os.path.abspath(args.script)] if args.script else lesson_scripts(args.lessons)
+    totals = {}
+    for script in scripts:
+        name = os.path.relpath(script, REPO_ROOT)
+        try:
+            totals[name] = report(name, measure(script, args.repeat), baseline, args.top)
+        except subprocess.TimeoutExpired:
+            print(f"\n--- {name}: timed out ---")
+
+    print("\n=== Summary (import cost beyond bare interpreter startup) ===")
+    for name, total in sorted(totals.items(), key=lambda item: item[1], reverse=True):
+        print(f"{total / 1000:9.2f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
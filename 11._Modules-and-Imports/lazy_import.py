@@ -0,0 +1,107 @@
+# lazy_import.py: Import a module only when it is first USED, not when the script starts
+# `import utils as ut` runs all of utils.py (and everything IT imports) right away,
+# even if this run of the program never calls ut.anything. For CLIs with many
+# sub-commands that adds up to most of the startup time.
+#
+#   ut = lazy_import("utils")            # instead of: import utils as ut
+#   greet = lazy_from("app", "greet")    # instead of: from app import greet
+#   add, is_even = lazy_from("utils", "add_numbers", "is_even")
+#
+# Nothing is loaded until the first attribute access or call.
+
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return module `name`, deferring the execution of its code until the
+    first attribute access (uses importlib.util.LazyLoader from the standard library).
+    """
+    if name in sys.modules:
+        return sys.modules[name]  # Already loaded: nothing to defer
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    if spec.loader is None or not hasattr(spec.loader, "exec_module"):
+        return importlib.import_module(name)  # Namespace/builtin modules cannot be made lazy
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)  # With LazyLoader this only arms the first-access hook
+    return module
+
+
+class LazyAttribute:
+    """
+    Stand-in for `from module import name`. The module is imported the first
+    time the object is called or one of its attributes is read.
+    """
+
+    __slots__ = ("_module_name", "_attr_name", "_target")
+
+    def __init__(self, module_name: str, attr_name: str):
+        self._module_name = module_name
+        self._attr_name = attr_name
+        self._target = None
+
+    def _resolve(self):
+        if self._target is None:
+            module = importlib.import_module(self._module_name)
+            try:
+                self._target = getattr(module, self._attr_name)
+            except AttributeError:
+                raise ImportError(
+                    f"cannot import name {self._attr_name!r} from {self._module_name!r}"
+                ) from None
+        return self._target
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._target is not None
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self._resolve(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._target is not None else "not loaded yet"
+        return f"<lazy {self._module_name}.{self._attr_name} ({state})>"
+
+
+def lazy_from(module_name: str, *names: str):
+    """
+    Lazy `from module import a, b`. Returns one LazyAttribute for a single
+    name, or a tuple of them for several names.
+
+    Import errors (a misspelled name) appear at first use, not at this line.
+    """
+    if not names:
+        raise TypeError("lazy_from() needs at least one name to import")
+    proxies = tuple(LazyAttribute(module_name, name) for name in names)
+    return proxies[0] if len(proxies) == 1 else proxies
+
+
+def is_loaded(module_name: str) -> bool:
+    """True once a module's code has actually run (not just been made lazy)."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        return False
+    # Until the first access, LazyLoader gives the module a special class
+    # (importlib.util._LazyModule); it swaps back to ModuleType when the code runs
+    return type(module).__name__ != "_LazyModule"
+
+
+# Example of code that should only run when lazy_import.py is executed directly
+if __name__ == "__main__":
+    ut = lazy_import("utils")
+    greet = lazy_from("app", "greet")
+    print(f"After lazy imports:  utils loaded? {is_loaded('utils')}, app loaded? {is_loaded('app')}")
+    print(greet("Bob"))
+    print(f"After calling greet: utils loaded? {is_loaded('utils')}, app loaded? {is_loaded('app')}")
+    print(f"Sum of 3 and 4: {ut.add_numbers(3, 4)}")
+    print(f"After using ut:      utils loaded? {is_loaded('utils')}, app loaded? {is_loaded('app')}")
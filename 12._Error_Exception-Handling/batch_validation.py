@@ -0,0 +1,467 @@
+# batch_validation.py: Validate millions of records, raise once at the end
+# Wrapping each record in try/except works, but when many records are bad,
+# creating, raising and catching one exception per bad value dominates the run.
+# Here the checks run column by column over a whole batch of records:
+#   - plain checks (Required, Range, Pattern, OneOf, Length, Check) are
+#     comprehensions that look before they leap: no exceptions at all,
+#   - conversions (Convert(int), Convert(date.fromisoformat)...) map over the
+#     whole column in C; a bad value costs one exception, then the same map
+#     resumes after it (no Python-level loop over the good values); with a
+#     `guard` (a cheap look-before-you-leap test) a column where many values
+#     fail switches to rejecting them without raising,
+#   - every problem becomes one (row, field, code) entry in a compact report,
+#   - ValidationErrors (an ExceptionGroup) is raised only at the end, if at all.
+#
+#   validator = Validator({
+#       "id":    [Required(), Convert(int, guard=int_text), Range(1)],
+#       "email": [Required(), Pattern(r"[^@\s]+@[^@\s]+\.\w+")],
+#       "age":   [Convert(int), Range(0, 150)],              # Optional: None / "" is skipped
+#   })
+#   result = validator.validate(records)       # dicts or tuples, any iterable
+#   result.report.by_code()                    # Counter({'range': 12, 'pattern': 3})
+#   result.raise_errors()                      # ExceptionGroup of the first 100 problems
+
+import re
+from array import array
+from collections import Counter, namedtuple
+from collections.abc import Mapping
+from itertools import batched, compress, repeat
+from operator import eq, itemgetter
+
+Issue = namedtuple("Issue", "row field code")
+
+_INT_TEXT = re.compile(r"\s*[+-]?\d[\d_]*\s*").fullmatch
+
+
+def _failed(results) -> list[int]:
+    """Positions of the falsy results. all() runs in C, so a clean column costs one pass."""
+    results = list(results)
+    if all(results):
+        return []
+    return [position for position, ok in enumerate(results) if not ok]
+
+
+def _failed_each(check, values: list) -> tuple[list[int], list[int]]:
+    """
+    check.failures() one value at a time, after it raised TypeError for the
+    whole column: (positions that fail the check, positions of the wrong type).
+    """
+    failed, mistyped = [], []
+    for position, value in enumerate(values):
+        try:
+            if check.failures([value]):
+                failed.append(position)
+        except TypeError:
+            mistyped.append(position)
+    return failed, mistyped
+
+
+# --------------------------------------------------
+# Checks
+# --------------------------------------------------
+class Required:
+    """Value must be present: not None and not "". Without it, missing values skip the field's checks."""
+
+    code = "missing"
+
+
+class Check:
+    """A value passes when predicate(value) is true; subclasses set up the predicate."""
+
+    code = "invalid"
+
+    def __init__(self, predicate=None, code: str | None = None):
+        if predicate is not None:
+            self.predicate = predicate
+        if code is not None:
+            self.code = code
+
+    def failures(self, values: list) -> list[int]:
+        """Positions in `values` that fail."""
+        return _failed(map(self.predicate, values))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(code={self.code!r})"
+
+
+class Type(Check):
+    code = "type"
+
+    def __init__(self, *types: type, code: str | None = None):
+        super().__init__(None, code)
+        self.types = types
+
+    def failures(self, values: list) -> list[int]:
+        return _failed(map(isinstance, values, repeat(self.types)))
+
+
+class Range(Check):
+    """low <= value <= high; either bound may be None."""
+
+    code = "range"
+
+    def __init__(self, low=None, high=None, code: str | None = None):
+        super().__init__(None, code)
+        self.low, self.high = low, high
+
+    def failures(self, values: list) -> list[int]:
+        low, high = self.low, self.high
+        if ((low is None or min(values) >= low) and (high is None or max(values) <= high)
+                and all(map(eq, values, values))):
+            return []  # min(), max() and the NaN check (NaN != NaN: it never wins min or max) run in C
+        if high is None:
+            return [position for position, value in enumerate(values) if not value >= low]
+        if low is None:
+            return [position for position, value in enumerate(values) if not value <= high]
+        return [position for position, value in enumerate(values) if not low <= value <= high]
+
+
+class Length(Range):
+    """low <= len(value) <= high."""
+
+    code = "length"
+
+    def failures(self, values: list) -> list[int]:
+        return super().failures(list(map(len, values)))
+
+
+class Pattern(Check):
+    """The whole str matches the regular expression."""
+
+    code = "pattern"
+
+    def __init__(self, pattern: str, code: str | None = None):
+        super().__init__(None, code)
+        self.pattern = re.compile(pattern)
+
+    def failures(self, values: list) -> list[int]:
+        return _failed(map(self.pattern.fullmatch, values))
+
+
+class OneOf(Check):
+    code = "choice"
+
+    def __init__(self, choices, code: str | None = None):
+        super().__init__(None, code)
+        self.choices = frozenset(choices)
+
+    def failures(self, values: list) -> list[int]:
+        return _failed(map(self.choices.__contains__, values))
+
+
+def int_text(value: str) -> bool:
+    """
+    Guard for Convert(int) over str values: false only for text int() rejects.
+    A few it lets through ("1__0", "²") still fail, by raising.
+    """
+    return value.isdigit() or _INT_TEXT(value) is not None
+
+
+class Convert:
+    """
+    Replace each value with function(value); a value for which it raises one
+    of `errors` fails with `code`. Later checks of the field see the converted
+    values, and they end up in ValidationResult.columns.
+
+    guard(value) must be false only for values `function` rejects. It is not
+    called while failures are rare; once a batch has many, the rest of it is
+    guarded first, so most bad values fail without an exception.
+    """
+
+    def __init__(self, function, code: str = "convert", errors=(ValueError, TypeError, ArithmeticError),
+                 guard=None):
+        self.function, self.code, self.errors, self.guard = function, code, errors, guard
+
+    def convert(self, values: list) -> tuple[list, list[int]]:
+        """(converted values, with None at the failing positions; failing positions)."""
+        function, errors = self.function, self.errors
+        converted, failed = [], []
+        remaining = iter(values)
+        # One raise costs about as much as guarding 5-10 values: switch after 1 failure in 8
+        limit = len(values) // 8 if self.guard is not None else len(values)
+        while len(failed) <= limit:
+            try:  # list.extend keeps what map produced before the exception...
+                converted.extend(map(function, remaining))
+                return converted, failed
+            except errors:  # ...and `remaining` is already past the bad value
+                failed.append(len(converted))
+                converted.append(None)
+        start, rest = len(converted), list(remaining)
+        passed = list(map(self.guard, rest))
+        positions = list(compress(range(start, start + len(rest)), passed))
+        results, raised = Convert(function, self.code, errors).convert(list(compress(rest, passed)))
+        converted += [None] * len(rest)
+        for position, value in zip(positions, results):
+            converted[position] = value
+        failed += [start + i for i, ok in enumerate(passed) if not ok]
+        failed += [positions[i] for i in raised]
+        failed.sort()
+        return converted, failed
+
+    def __repr__(self) -> str:
+        return f"Convert({getattr(self.function, '__name__', self.function)}, code={self.code!r})"
+
+
+class RowCheck:
+    """
+    A rule across fields: predicate(*values of `fields`) must be true. It runs
+    after the field checks, only on rows where those fields all passed, and
+    reports `code` against `field` (default: the last of `fields`).
+    """
+
+    def __init__(self, fields, predicate, code: str, field: str | None = None):
+        self.fields, self.predicate, self.code = tuple(fields), predicate, code
+        self.field = field or self.fields[-1]
+
+
+# --------------------------------------------------
+# Report and exceptions
+# --------------------------------------------------
+class FieldError(ValueError):
+    """One problem: record `row`, field `field`, error code `code`."""
+
+    def __init__(self, row: int, field: str, code: str):
+        super().__init__(f"row {row}, field {field!r}: {code}")
+        self.row, self.field, self.code = row, field, code
+
+
+class ValidationErrors(ExceptionGroup):
+    """Raised once for a whole validation run. `report` holds every problem, not just the ones in the group."""
+
+    def __new__(cls, message: str, exceptions, report: "ErrorReport | None" = None):
+        group = super().__new__(cls, message, exceptions)
+        group.report = report
+        return group
+
+    def __init__(self, message: str, exceptions, report: "ErrorReport | None" = None):
+        super().__init__(message, exceptions)
+
+    def derive(self, exceptions) -> "ValidationErrors":  # Keeps the type through except* and split()
+        return ValidationErrors(self.message, exceptions, self.report)
+
+
+class ErrorReport:
+    """
+    Every (row, field, code) found, stored as three typed arrays (14 bytes per
+    problem) plus the field and code names, instead of one exception object each.
+    """
+
+    def __init__(self, fields):
+        self.fields: list[str] = list(fields)
+        self.codes: list[str] = []
+        self._code_ids: dict[str, int] = {}
+        self.rows = array("Q")
+        self.field_ids = array("H")
+        self.code_ids = array("H")
+
+    def add(self, rows, field: int, code: str) -> None:
+        """Record the same (field, code) problem for every row in `rows`."""
+        code_id = self._code_ids.get(code)
+        if code_id is None:
+            code_id = self._code_ids[code] = len(self.codes)
+            self.codes.append(code)
+        before = len(self.rows)
+        self.rows.extend(rows)
+        added = len(self.rows) - before
+        self.field_ids.extend([field] * added)
+        self.code_ids.extend([code_id] * added)
+
+    def sort(self) -> None:
+        """Order by row, then by field."""
+        width = len(self.fields)
+        keys = [row * width + field for row, field in zip(self.rows, self.field_ids)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        self.rows = array("Q", [self.rows[i] for i in order])
+        self.field_ids = array("H", [self.field_ids[i] for i in order])
+        self.code_ids = array("H", [self.code_ids[i] for i in order])
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __bool__(self) -> bool:
+        return bool(self.rows)
+
+    def _columns(self):
+        return self.rows, map(self.fields.__getitem__, self.field_ids), map(self.codes.__getitem__, self.code_ids)
+
+    def __iter__(self):
+        return map(Issue, *self._columns())
+
+    def as_tuples(self) -> list[tuple[int, str, str]]:
+        """Every problem as a plain (row, field, code) tuple; built in C, faster than list(report)."""
+        return list(zip(*self._columns()))
+
+    def bad_rows(self) -> set[int]:
+        return set(self.rows)
+
+    def by_code(self) -> Counter:
+        return Counter({self.codes[code]: n for code, n in Counter(self.code_ids).items()})
+
+    def by_field(self) -> Counter:
+        return Counter({self.fields[field]: n for field, n in Counter(self.field_ids).items()})
+
+    def to_exception(self, limit: int = 100) -> ValidationErrors | None:
+        """An ExceptionGroup of the first `limit` problems (None if there are none)."""
+        if not self:
+            return None
+        shown = [FieldError(*issue) for _, issue in zip(range(limit), self)]
+        more = f" (first {len(shown):,} shown)" if len(shown) < len(self) else ""
+        message = f"{len(self):,} validation errors in {len(self.bad_rows()):,} records{more}"
+        return ValidationErrors(message, shown, self)
+
+    def __repr__(self) -> str:
+        return f"<ErrorReport {len(self):,} errors: {dict(self.by_code())}>"
+
+
+class ValidationResult(namedtuple("ValidationResult", "rows report columns")):
+    """Rows validated, the ErrorReport, and {field: values} (converted; None where invalid)."""
+
+    __slots__ = ()
+
+    def raise_errors(self, limit: int = 100) -> None:
+        """Raise ValidationErrors holding the first `limit` problems, if there are any."""
+        error = self.report.to_exception(limit)
+        if error is not None:
+            raise error
+
+
+# --------------------------------------------------
+# Validator
+# --------------------------------------------------
+class Validator:
+    """
+    {field: [checks]} applied column by column. Records are mappings
+    (missing keys count as missing values) or sequences in the order of
+    `fields` (default: the schema's field order).
+    """
+
+    def __init__(self, schema: dict, row_checks=(), fields=None):
+        self.schema = {field: list(checks) for field, checks in schema.items()}
+        self.row_checks = list(row_checks)
+        self.fields = list(fields) if fields is not None else list(self.schema)
+        for rule in self.row_checks:
+            unknown = set(rule.fields) - set(self.schema)
+            if unknown:
+                raise ValueError(f"row check on fields not in the schema: {sorted(unknown)}")
+
+    def _column(self, records: tuple, field: str) -> list:
+        if not records or not isinstance(records[0], Mapping):
+            index = self.fields.index(field)
+            if not records or min(map(len, records)) > index:
+                return list(map(itemgetter(index), records))
+            return [record[index] if len(record) > index else None for record in records]  # Short rows: missing
+        if type(records[0]) is dict:  # dict.get mapped in C, no Python-level loop
+            return list(map(dict.get, records, repeat(field)))
+        return [record.get(field) for record in records]
+
+    def _field(self, column: list, checks: list, first_row: int, field: int, report: ErrorReport,
+               keep: bool = True) -> list | None:
+        """
+        Run one field's checks over one batch. Returns the column with converted
+        values and None where invalid (if `keep`).
+        """
+        live, values = None, column  # live: positions of `values` in the column, None while that is all of them
+        if None in column or "" in column:
+            present = [value is not None and value != "" for value in column]
+            if any(isinstance(check, Required) for check in checks):
+                report.add([first_row + i for i, ok in enumerate(present) if not ok], field, Required.code)
+            live = list(compress(range(len(column)), present))
+            values = list(compress(column, present))
+        for check in checks:
+            if isinstance(check, Required) or not values:
+                continue
+            mistyped = []
+            if isinstance(check, Convert):
+                values, failed = check.convert(values)
+            else:
+                try:
+                    failed = check.failures(values)
+                except TypeError:  # Some value the check cannot take ("x" under Range, an int under Pattern)
+                    failed, mistyped = _failed_each(check, values)
+            if failed or mistyped:
+                if live is None:
+                    live = list(range(len(column)))
+                if failed:
+                    report.add([first_row + live[position] for position in failed], field, check.code)
+                if mistyped:
+                    report.add([first_row + live[position] for position in mistyped], field, Type.code)
+                passed = [True] * len(values)
+                for position in failed + mistyped:
+                    passed[position] = False
+                live = list(compress(live, passed))
+                values = list(compress(values, passed))
+        if not keep:
+            return None
+        if live is None:
+            return values
+        result = [None] * len(column)
+        for i, value in zip(live, values):
+            result[i] = value
+        return result
+
+    def validate(self, records, batch: int = 4096, keep_columns: bool = True) -> ValidationResult:
+        """
+        Check every record; never raises for bad data. Records are read `batch`
+        at a time, so any iterable works (a csv.reader, a generator...), and the
+        columns of a batch stay in the CPU cache between checks.
+        """
+        report = ErrorReport(self.fields)
+        field_ids = {field: self.fields.index(field) for field in self.schema}
+        columns = {field: [] for field in self.schema} if keep_columns else None
+        needed = {field for rule in self.row_checks for field in rule.fields}
+        rows = 0
+        for chunk in batched(records, batch):
+            checked = {}
+            for field, checks in self.schema.items():
+                checked[field] = self._field(self._column(chunk, field), checks, rows, field_ids[field], report,
+                                             keep_columns or field in needed)
+            for rule in self.row_checks:
+                values = [checked[field] for field in rule.fields]
+                predicate = rule.predicate
+                failed = [rows + i for i, row in enumerate(zip(*values))
+                          if None not in row and not predicate(*row)]
+                if failed:
+                    report.add(failed, field_ids[rule.field], rule.code)
+                    for row in failed:
+                        checked[rule.field][row - rows] = None
+            if keep_columns:
+                for field, values in checked.items():
+                    columns[field] += values
+            rows += len(chunk)
+        report.sort()
+        return ValidationResult(rows, report, columns)
+
+    def check(self, records, limit: int = 100, **options) -> dict:
+        """validate(), then raise ValidationErrors if anything failed; returns the converted columns."""
+        result = self.validate(records, **options)
+        result.raise_errors(limit)
+        return result.columns
+
+
+# Example of code that should only run when batch_validation.py is executed directly
+if __name__ == "__main__":
+    from datetime import date
+
+    validator = Validator({
+        "id": [Required(), Convert(int, guard=int_text), Range(1)],
+        "email": [Required(), Pattern(r"[^@\s]+@[^@\s]+\.\w+")],
+        "age": [Convert(int, guard=int_text), Range(0, 150)],
+        "country": [OneOf({"DE", "FR", "PK", "US"})],
+        "joined": [Convert(date.fromisoformat, code="date")],
+        "left": [Convert(date.fromisoformat, code="date")],
+    }, row_checks=[RowCheck(("joined", "left"), lambda joined, left: joined <= left, "before_joined")])
+
+    records = [
+        {"id": "1", "email": "riaz@example.com", "age": "28", "country": "PK", "joined": "2020-01-05"},
+        {"id": "x", "email": "not-an-email", "age": "200", "country": "PK", "joined": "2021-02-30"},
+        {"id": "3", "email": "", "age": "", "country": "XX", "joined": "2022-03-01", "left": "2021-01-01"},
+    ]
+    result = validator.validate(records)
+    print(result.report, list(result.report))
+    print("ages:", result.columns["age"])
+    try:
+        result.raise_errors()
+    except* FieldError as group:
+        print(group.message)
+        for error in group.exceptions:
+            print("  ", error)
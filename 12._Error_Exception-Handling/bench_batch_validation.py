@@ -0,0 +1,187 @@
+# bench_batch_validation.py: EAFP vs LBYL vs batch validation at different error rates
+# Records are dicts of strings, as csv.DictReader gives them: id, email, age, country.
+# A given fraction of the records has one bad field (bad number, out of range, bad email, unknown country).
+#   eafp-record  one try per record around validators that raise: stops at the record's first error
+#   eafp-field   one try per field: every error of the record is found
+#   lbyl         per record, if-checks before converting (str.isdigit before int): never raises
+#   batch        batch_validation.Validator: column by column, int() mapped over each column
+#   batch-guard  the same with Convert(int, guard=int_text): a column with many bad numbers stops raising
+# Reported: ns per record. All variants must find the same (row, field, code) errors.
+# Usage: python bench_batch_validation.py [--records 200000] [--rates 0 0.001 0.01 0.1 0.5 1]
+
+import argparse
+import random
+import re
+import time
+from functools import partial
+
+from batch_validation import Convert, FieldError, OneOf, Pattern, Range, Required, Validator, int_text
+
+EMAIL = r"[^@\s]+@[^@\s]+\.\w+"
+COUNTRIES = frozenset({"DE", "FR", "IN", "PK", "US"})
+VARIANTS = ("eafp-record", "eafp-field", "lbyl", "batch", "batch-guard")
+
+
+def make_records(n: int, error_rate: float, seed: int = 42) -> list[dict]:
+    rng = random.Random(seed)
+    countries = sorted(COUNTRIES)
+    records = []
+    for row in range(n):
+        record = {"id": str(row + 1), "email": f"user{row}@example.com",
+                  "age": str(rng.randint(0, 99)), "country": rng.choice(countries)}
+        if rng.random() < error_rate:
+            field = rng.choice(("id", "email", "age", "age", "country"))
+            record[field] = {"id": f"#{row}", "email": f"user{row}.example.com",
+                             "age": rng.choice(("abc", "1.5", "", "999")), "country": "ZZ"}[field]
+        records.append(record)
+    return records
+
+
+# --------------------------------------------------
+# EAFP: validators that raise
+# --------------------------------------------------
+_email = re.compile(EMAIL).fullmatch
+
+
+def _check_id(value: str) -> int:
+    if not value:
+        raise FieldError(-1, "id", "missing")
+    try:
+        number = int(value)
+    except ValueError:
+        raise FieldError(-1, "id", "convert") from None
+    if number < 1:
+        raise FieldError(-1, "id", "range")
+    return number
+
+
+def _check_email(value: str) -> str:
+    if not value:
+        raise FieldError(-1, "email", "missing")
+    if not _email(value):
+        raise FieldError(-1, "email", "pattern")
+    return value
+
+
+def _check_age(value: str) -> int | None:
+    if not value:
+        return None
+    try:
+        age = int(value)
+    except ValueError:
+        raise FieldError(-1, "age", "convert") from None
+    if not 0 <= age <= 150:
+        raise FieldError(-1, "age", "range")
+    return age
+
+
+def _check_country(value: str) -> str | None:
+    if value and value not in COUNTRIES:
+        raise FieldError(-1, "country", "choice")
+    return value or None
+
+
+CHECKS = (("id", _check_id), ("email", _check_email), ("age", _check_age), ("country", _check_country))
+
+
+def eafp_record(records: list[dict]) -> list[tuple]:
+    errors = []
+    for row, record in enumerate(records):
+        try:
+            for field, check in CHECKS:
+                check(record.get(field))
+        except FieldError as error:
+            errors.append((row, error.field, error.code))
+    return errors
+
+
+def eafp_field(records: list[dict]) -> list[tuple]:
+    errors = []
+    for row, record in enumerate(records):
+        for field, check in CHECKS:
+            try:
+                check(record.get(field))
+            except FieldError as error:
+                errors.append((row, field, error.code))
+    return errors
+
+
+# --------------------------------------------------
+# LBYL: look before converting
+# --------------------------------------------------
+def _integer(value: str) -> bool:
+    return value.isascii() and (value.isdigit() or value[:1] in "+-" and value[1:].isdigit())
+
+
+def lbyl(records: list[dict]) -> list[tuple]:
+    errors = []
+    append = errors.append
+    for row, record in enumerate(records):
+        value = record.get("id")
+        if not value:
+            append((row, "id", "missing"))
+        elif not _integer(value):
+            append((row, "id", "convert"))
+        elif int(value) < 1:
+            append((row, "id", "range"))
+        value = record.get("email")
+        if not value:
+            append((row, "email", "missing"))
+        elif not _email(value):
+            append((row, "email", "pattern"))
+        value = record.get("age")
+        if value:
+            if not _integer(value):
+                append((row, "age", "convert"))
+            elif not 0 <= int(value) <= 150:
+                append((row, "age", "range"))
+        value = record.get("country")
+        if value and value not in COUNTRIES:
+            append((row, "country", "choice"))
+    return errors
+
+
+# --------------------------------------------------
+# Batch
+# --------------------------------------------------
+def make_validator(guard=None) -> Validator:
+    return Validator({
+        "id": [Required(), Convert(int, guard=guard), Range(1)],
+        "email": [Required(), Pattern(EMAIL)],
+        "age": [Convert(int, guard=guard), Range(0, 150)],
+        "country": [OneOf(COUNTRIES)],
+    })
+
+
+def batch(validator: Validator, records: list[dict]) -> list[tuple]:
+    return validator.validate(records, keep_columns=False).report.as_tuples()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=200_000)
+    parser.add_argument("--rates", type=float, nargs="+", default=[0, 0.001, 0.01, 0.1, 0.5, 1])
+    parser.add_argument("--repeat", type=int, default=3, help="best of")
+    args = parser.parse_args()
+
+    functions = {"eafp-record": eafp_record, "eafp-field": eafp_field, "lbyl": lbyl,
+                 "batch": partial(batch, make_validator()), "batch-guard": partial(batch, make_validator(int_text))}
+    print(f"{args.records:,} records, ns per record (best of {args.repeat})")
+    print(f"{'bad records':>12}" + "".join(f"{variant:>13}" for variant in VARIANTS) + f"{'errors':>10}")
+    for rate in args.rates:
+        records = make_records(args.records, rate)
+        best, reports = dict.fromkeys(VARIANTS, float("inf")), set()
+        for _ in range(args.repeat):  # Round robin, so a noisy moment does not hit one variant only
+            for variant in VARIANTS:
+                start = time.perf_counter()
+                errors = functions[variant](records)
+                best[variant] = min(best[variant], time.perf_counter() - start)
+                reports.add(tuple(sorted(errors)))
+        if len(reports) > 1:
+            raise SystemExit(f"error rate {rate}: the variants found different errors")
+        print(f"{rate:>12.1%}" + "".join(f"{best[variant] / args.records * 1e9:>13,.0f}" for variant in VARIANTS)
+              + f"{len(errors):>10,}")
+
+
+if __name__ == "__main__":
+    main()
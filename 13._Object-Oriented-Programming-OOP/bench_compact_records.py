@@ -0,0 +1,106 @@
+# bench_compact_records.py: Memory and speed of millions of small objects
+# N students (name, age, student_id) stored as:
+#   dict         Student: ordinary class, instance __dict__
+#   slots        SlottedStudent: __slots__
+#   dataclass    DataStudent: @dataclass(slots=True)
+#   namedtuple   StudentTuple
+#   columns      StudentColumns: one array per field (struct of arrays)
+# Measured per variant: memory of the finished collection (tracemalloc, in
+# its own pass because tracing slows allocation down), then the time to
+# create it, to read an attribute of every record (sum of ages), and to
+# pickle it out and back in.
+# Each variant runs in its own process so one variant's garbage cannot affect the next.
+# Usage: python bench_compact_records.py [--items 10000000]
+
+import argparse
+import gc
+import json
+import pickle
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from compact_records import DataStudent, SlottedStudent, Student, StudentColumns, StudentTuple
+
+VARIANTS = {"dict": Student, "slots": SlottedStudent, "dataclass": DataStudent, "namedtuple": StudentTuple}
+PICKLE_CHUNK = 100_000
+NAMES = [f"student{i}" for i in range(1000)]  # Shared strings: the records, not the names, are measured
+
+
+def build(variant: str, n: int):
+    names = NAMES
+    if variant == "columns":
+        ages = bytes(18 + i % 10 for i in range(n))
+        return StudentColumns([names[i % 1000] for i in range(n)], ages, range(n))
+    cls = VARIANTS[variant]
+    return [cls(names[i % 1000], 18 + i % 10, i) for i in range(n)]
+
+
+def read(variant: str, records) -> int:
+    if variant == "columns":
+        return sum(records.ages)  # Whole column at once: the point of a struct of arrays
+    return sum(record.age for record in records)
+
+
+def worker(variant: str, n: int) -> dict:
+    gc.disable()  # Millions of container objects would otherwise trigger many full collections
+    tracemalloc.start()
+    records = build(variant, n)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del records
+
+    start = time.perf_counter()
+    records = build(variant, n)
+    create = time.perf_counter() - start
+
+    start = time.perf_counter()
+    total = read(variant, records)
+    read_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if variant == "columns":
+        blobs = [pickle.dumps(records, protocol=pickle.HIGHEST_PROTOCOL)]
+    else:
+        # In chunks, as you would stream them to a file: one dumps() of 10^7 objects
+        # keeps a memo entry per object and needs gigabytes on top of the records
+        blobs = [pickle.dumps(records[i : i + PICKLE_CHUNK], protocol=pickle.HIGHEST_PROTOCOL)
+                 for i in range(0, len(records), PICKLE_CHUNK)]
+    size = sum(map(len, blobs))
+    del records
+    if variant == "columns":
+        records = pickle.loads(blobs[0])
+    else:
+        records = []
+        for blob in blobs:
+            records += pickle.loads(blob)
+    round_trip = time.perf_counter() - start
+    assert read(variant, records) == total
+    return {"memory": memory, "create": create, "read": read_seconds, "pickle": round_trip,
+            "pickle_bytes": size, "total": total}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000_000)
+    parser.add_argument("--variants", nargs="+", default=[*VARIANTS, "columns"])
+    parser.add_argument("--worker", nargs=2, metavar=("VARIANT", "ITEMS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        print(json.dumps(worker(args.worker[0], int(args.worker[1]))))
+        return
+
+    print(f"{args.items:,} students (name, age, student_id)")
+    print(f"{'variant':<12}{'MB':>8}{'bytes/rec':>10}{'create s':>10}{'read s':>9}{'pickle s':>10}{'pickle MB':>11}")
+    for variant in args.variants:
+        output = subprocess.run([sys.executable, __file__, "--worker", variant, str(args.items)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        print(f"{variant:<12}{result['memory'] / 2**20:>8.0f}{result['memory'] / args.items:>10.1f}"
+              f"{result['create']:>10.2f}{result['read']:>9.3f}{result['pickle']:>10.2f}"
+              f"{result['pickle_bytes'] / 2**20:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+# compact_records.py: Memory-lean versions of the lesson's classes
+# Every ordinary instance carries a __dict__ (or, since 3.11, a lazily created
+# one plus a values array) so that new attributes can be added at any time.
+# With millions of small objects that flexibility is most of the memory.
+# The same Person / Student / BankAccount classes as in the README, five ways:
+#   Person                 plain class (instance __dict__)
+#   SlottedPerson          __slots__: attributes stored in fixed slots, no __dict__
+#   DataPerson             @dataclass(slots=True): the same, generated for you
+#   PersonTuple            namedtuple: immutable, a tuple with field names
+#   StudentColumns         struct of arrays: one array per field instead of one object per row
+# slotted(cls) turns an existing class (and its base classes) into slotted ones,
+# and check_slotted() verifies that inheritance still behaves the same.
+#
+#   FastStudent = slotted(Student)
+#   assert not check_slotted(Student, FastStudent, "Bob", 20, 1234)
+
+import ast
+import inspect
+import textwrap
+import types
+from array import array
+from collections import namedtuple
+from dataclasses import dataclass
+from weakref import WeakKeyDictionary
+
+
+# --------------------------------------------------
+# The lesson's classes, as they are in the README (one __dict__ per instance)
+# --------------------------------------------------
+class Person:
+    species = "human"  # Class variable: stored once on the class, not per instance
+
+    def __init__(self, name: str, age: int):
+        self.name = name
+        self.age = age
+
+    def greet(self) -> str:
+        return f"Hello, I'm {self.name}!"
+
+
+class Student(Person):
+    def __init__(self, name: str, age: int, student_id: int):
+        super().__init__(name, age)
+        self.student_id = student_id
+
+    def study(self) -> str:
+        return f"{self.name} is studying."
+
+
+class BankAccount:
+    def __init__(self, owner: str, balance: int = 0):
+        self.owner = owner
+        self.__balance = balance  # Private (name-mangled to _BankAccount__balance)
+
+    def deposit(self, amount: int) -> None:
+        if amount > 0:
+            self.__balance += amount
+
+    def get_balance(self) -> int:
+        return self.__balance
+
+
+# --------------------------------------------------
+# __slots__ by hand
+# --------------------------------------------------
+class SlottedPerson:
+    __slots__ = ("name", "age")  # Only these attributes exist; no __dict__
+    species = "human"  # Class variables still work (they just cannot share a name with a slot)
+
+    def __init__(self, name: str, age: int):
+        self.name = name
+        self.age = age
+
+    def greet(self) -> str:
+        return f"Hello, I'm {self.name}!"
+
+
+class SlottedStudent(SlottedPerson):
+    __slots__ = ("student_id",)  # ONLY the new attribute: name/age are slots of the base already
+
+    def __init__(self, name: str, age: int, student_id: int):
+        super().__init__(name, age)
+        self.student_id = student_id
+
+    def study(self) -> str:
+        return f"{self.name} is studying."
+
+
+class SlottedBankAccount:
+    __slots__ = ("owner", "__balance")  # Private slots are name-mangled like private attributes
+
+    def __init__(self, owner: str, balance: int = 0):
+        self.owner = owner
+        self.__balance = balance
+
+    def deposit(self, amount: int) -> None:
+        if amount > 0:
+            self.__balance += amount
+
+    def get_balance(self) -> int:
+        return self.__balance
+
+
+# --------------------------------------------------
+# dataclass(slots=True) and namedtuple
+# --------------------------------------------------
+@dataclass(slots=True)
+class DataPerson:
+    name: str
+    age: int
+
+    def greet(self) -> str:
+        return f"Hello, I'm {self.name}!"
+
+
+@dataclass(slots=True)
+class DataStudent(DataPerson):
+    student_id: int
+
+    def study(self) -> str:
+        return f"{self.name} is studying."
+
+
+class PersonTuple(namedtuple("PersonTuple", "name age")):
+    __slots__ = ()  # Keeps the subclass as small as the tuple itself
+
+    def greet(self) -> str:
+        return f"Hello, I'm {self.name}!"
+
+
+class StudentTuple(namedtuple("StudentTuple", PersonTuple._fields + ("student_id",))):
+    __slots__ = ()
+    greet = PersonTuple.greet  # Tuples cannot inherit fields, so methods are shared explicitly
+
+    def study(self) -> str:
+        return f"{self.name} is studying."
+
+
+# --------------------------------------------------
+# Struct of arrays
+# --------------------------------------------------
+class StudentColumns:
+    """
+    Many students stored as three columns instead of one object each:
+    ages in an array of bytes, ids in an array of 32-bit ints, names in a list
+    (repeated names share one string). students[i] builds a StudentTuple on demand.
+
+        students = StudentColumns()
+        students.append("Bob", 20, 1234)
+        sum(students.ages)             # Whole-column work without touching any objects
+    """
+
+    __slots__ = ("names", "ages", "student_ids")
+
+    def __init__(self, names=(), ages=(), student_ids=()):
+        self.names: list[str] = list(names)
+        self.ages = array("B", ages)            # 0..255
+        self.student_ids = array("I", student_ids)
+        if not len(self.names) == len(self.ages) == len(self.student_ids):
+            raise ValueError("all columns must have the same length")
+
+    def append(self, name: str, age: int, student_id: int) -> None:
+        self.names.append(name)
+        self.ages.append(age)
+        self.student_ids.append(student_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, index: int) -> StudentTuple:
+        return StudentTuple(self.names[index], self.ages[index], self.student_ids[index])
+
+    def __iter__(self):
+        return map(StudentTuple, self.names, self.ages, self.student_ids)
+
+    def __getstate__(self):
+        return self.names, self.ages, self.student_ids  # array pickles as raw bytes
+
+    def __setstate__(self, state) -> None:
+        self.names, self.ages, self.student_ids = state
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the columns themselves (the name strings are shared, not counted)."""
+        return (len(self.names) * 8 + self.ages.itemsize * len(self.ages)
+                + self.student_ids.itemsize * len(self.student_ids))
+
+
+# --------------------------------------------------
+# Converting an existing class
+# --------------------------------------------------
+def _mangle(class_name: str, name: str) -> str:
+    if name.startswith("__") and not name.endswith("__"):
+        return f"_{class_name.lstrip('_')}{name}"
+    return name
+
+
+def instance_attributes(cls) -> list[str]:
+    """Attribute names the class's own methods assign on self (self.x = ..., self.x += ...)."""
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(cls)))
+    except (OSError, TypeError) as error:
+        raise TypeError(f"cannot read the source of {cls.__qualname__}; pass fields=[...]") from error
+    names: list[str] = []
+    for method in ast.walk(tree):
+        if not isinstance(method, (ast.FunctionDef, ast.AsyncFunctionDef)) or not method.args.args:
+            continue
+        self_name = method.args.args[0].arg
+        for node in ast.walk(method):
+            targets = []
+            if isinstance(node, ast.Assign):
+                targets = node.targets
+            elif isinstance(node, (ast.AugAssign, ast.AnnAssign)):
+                targets = [node.target]
+            for target in targets:
+                for item in ast.walk(target):  # Also finds self.a, self.b = ... tuple targets
+                    if (isinstance(item, ast.Attribute) and isinstance(item.value, ast.Name)
+                            and item.value.id == self_name):
+                        name = _mangle(cls.__name__, item.attr)
+                        if name not in names:
+                            names.append(name)
+    return names
+
+
+def _rebind(value, old_cls, new_cls):
+    """Copy of a function (or descriptor around one) whose zero-argument super() refers to new_cls."""
+    if isinstance(value, types.FunctionType):
+        if "__class__" not in value.__code__.co_freevars:
+            return value
+        cells = tuple(types.CellType(new_cls) if name == "__class__" and cell.cell_contents is old_cls else cell
+                      for name, cell in zip(value.__code__.co_freevars, value.__closure__))
+        copy = types.FunctionType(value.__code__, value.__globals__, value.__name__, value.__defaults__, cells)
+        copy.__kwdefaults__ = value.__kwdefaults__
+        copy.__dict__.update(value.__dict__)
+        copy.__qualname__ = value.__qualname__
+        copy.__annotations__ = value.__annotations__
+        return copy
+    if isinstance(value, (classmethod, staticmethod)):
+        return type(value)(_rebind(value.__func__, old_cls, new_cls))
+    if isinstance(value, property):
+        return property(*(_rebind(f, old_cls, new_cls) if f else None for f in (value.fget, value.fset, value.fdel)),
+                        value.__doc__)
+    return value
+
+
+# Original class -> its slotted() copy. Every class is converted once, so after
+# Person = slotted(Person); Student = slotted(Student), Student's copy subclasses
+# the same Person copy (and isinstance(student, Person) still holds).
+_SLOTTED: WeakKeyDictionary = WeakKeyDictionary()
+
+
+def slotted(cls, fields=None, weakref: bool = False):
+    """
+    Return a copy of cls that stores its instance attributes in __slots__.
+    - Base classes that still give their instances a __dict__ are converted too
+      (one __dict__ anywhere in the hierarchy and the saving is gone), or the
+      copy made by an earlier slotted() call is reused.
+    - fields: slot names if they cannot be read from the source.
+    - weakref: keep support for weakref.ref(instance).
+    Methods using zero-argument super() are re-bound to the new class.
+    Pickling needs the new class to be reachable under its name: Student = slotted(Student).
+    """
+    if cls in _SLOTTED:
+        return _SLOTTED[cls]
+    if "__slots__" in cls.__dict__ or cls.__module__ == "builtins":
+        return cls  # Already slotted (or object itself)
+    bases = tuple(slotted(base, weakref=weakref) for base in cls.__bases__)
+    inherited = {slot for base in bases for klass in base.__mro__ for slot in klass.__dict__.get("__slots__", ())}
+    inherited |= {_mangle(klass.__name__, slot) for base in bases for klass in base.__mro__
+                  for slot in klass.__dict__.get("__slots__", ())}
+    slots = [name for name in (fields if fields is not None else instance_attributes(cls)) if name not in inherited]
+    # A name that is a property (or other data descriptor) is not an instance attribute
+    slots = [name for name in slots
+             if not any(hasattr(klass.__dict__.get(name), "__set__") for klass in cls.__mro__)]
+    clashes = [name for name in slots if name in cls.__dict__]
+    if clashes:
+        raise TypeError(f"{cls.__qualname__}: {clashes} are class variables AND instance attributes; "
+                        "a slot cannot share its name with a class variable")
+    if weakref and not any(hasattr(base, "__weakref__") for base in bases):
+        slots.append("__weakref__")
+
+    namespace = {key: value for key, value in cls.__dict__.items() if key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = tuple(slots)
+    new_cls = type(cls)(cls.__name__, bases, namespace)
+    new_cls.__qualname__ = cls.__qualname__
+    for key, value in namespace.items():
+        rebound = _rebind(value, cls, new_cls)
+        if rebound is not value:
+            setattr(new_cls, key, rebound)
+    _SLOTTED[cls] = new_cls
+    return new_cls
+
+
+def check_slotted(original, converted, *args, **kwargs) -> list[str]:
+    """
+    Compare a class with its slotted() copy; returns the problems found (empty = fine).
+    Checks the hierarchy (same MRO, every converted base is the shared slotted() copy,
+    no __dict__ anywhere), then builds one instance of
+    each from args/kwargs and compares attributes, isinstance and zero-argument methods.
+    """
+    problems = []
+    if [k.__name__ for k in original.__mro__] != [k.__name__ for k in converted.__mro__]:
+        problems.append(f"MRO differs: {original.__mro__} vs {converted.__mro__}")
+    for base_before, base_after in zip(original.__mro__[1:], converted.__mro__[1:]):
+        if base_after is not base_before and base_after is not _SLOTTED.get(base_before):
+            problems.append(f"base {base_after.__qualname__} is a private copy: isinstance() with the "
+                            f"slotted() copy of {base_before.__qualname__} fails")
+    for klass in converted.__mro__[:-1]:
+        if "__slots__" not in klass.__dict__:
+            problems.append(f"{klass.__qualname__} has no __slots__, so instances still get a __dict__")
+        for slot in klass.__dict__.get("__slots__", ()):
+            owners = [k.__qualname__ for k in klass.__mro__[1:] if slot in k.__dict__.get("__slots__", ())]
+            if owners:
+                problems.append(f"slot {slot!r} of {klass.__qualname__} repeats {owners}: wasted memory")
+
+    before, after = original(*args, **kwargs), converted(*args, **kwargs)
+    if hasattr(after, "__dict__"):
+        problems.append("converted instances still have a __dict__")
+    for name, value in vars(before).items():
+        if getattr(after, name, object()) != value:
+            problems.append(f"attribute {name!r}: {value!r} vs {getattr(after, name, '<missing>')!r}")
+    for base_before, base_after in zip(original.__mro__, converted.__mro__):
+        if isinstance(before, base_before) != isinstance(after, base_after):
+            problems.append(f"isinstance(..., {base_before.__qualname__}) differs")
+    for name in dir(original):
+        attribute = getattr(original, name)
+        if name.startswith("_") or not inspect.isfunction(attribute):
+            continue
+        if len(inspect.signature(attribute).parameters) != 1:
+            continue  # Only methods that take no arguments besides self can be called blindly
+        try:
+            expected = ("ok", getattr(before, name)())
+        except Exception as error:
+            expected = ("error", type(error))
+        try:
+            got = ("ok", getattr(after, name)())
+        except Exception as error:
+            got = ("error", type(error))
+        if expected != got:
+            problems.append(f"{name}(): {expected[1]!r} vs {got[1]!r}")
+    return problems
+
+
+# Example of code that should only run when compact_records.py is executed directly
+if __name__ == "__main__":
+    import tracemalloc
+
+    for cls in (Student, SlottedStudent, DataStudent, StudentTuple):
+        tracemalloc.start()
+        many = [cls("Bob", 20, 1234) for _ in range(10_000)]
+        print(f"{cls.__name__:<15}{tracemalloc.get_traced_memory()[0] / len(many):>6.0f} bytes per instance")
+        tracemalloc.stop()
+    slim = SlottedStudent("Bob", 20, 1234)
+    try:
+        slim.nickname = "Bobby"
+    except AttributeError as error:
+        print(f"Slots are fixed: {error}")
+
+    FastStudent = slotted(Student)
+    print(FastStudent.__mro__, FastStudent.__slots__, FastStudent.__mro__[1].__slots__)
+    print(FastStudent("Ann", 19, 7).study(), check_slotted(Student, FastStudent, "Ann", 19, 7) or "inheritance OK")
+    FastAccount = slotted(BankAccount)
+    print(FastAccount.__slots__, check_slotted(BankAccount, FastAccount, "Ann", 50) or "encapsulation OK")
+
+    students = StudentColumns()
+    for i in range(1000):
+        students.append(f"student{i % 50}", 18 + i % 10, i)
+    print(f"{len(students)} students in {students.nbytes:,} bytes of columns, mean age "
+          f"{sum(students.ages) / len(students):.1f}, first: {students[0]}")
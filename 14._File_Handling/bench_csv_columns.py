@@ -0,0 +1,88 @@
+# bench_csv_columns.py: csv.DictReader (list of dicts) vs read_csv_columns (typed columns)
+# Each loader runs in a fresh child process so peak memory (max RSS) is its own.
+#   dicts         list(csv.DictReader(f)): the usual approach
+#   columns       read_csv_columns, all columns, 1 process
+#   columns xN    the same with N worker processes
+#   projected     only 2 of the 6 columns, rows filtered by a `where` condition
+# Usage: python bench_csv_columns.py [--rows 500000] [--workers 4]
+
+import argparse
+import csv
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from csv_columns import read_csv_columns
+
+CITIES = ["Lahore", "Karachi", "Islamabad", "Quetta", "Peshawar", "Multan"]
+
+
+def make_csv(path: str, rows: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id", "city", "price", "quantity", "customer", "comment"])
+        for i in range(rows):
+            comment = 'said "great", then left' if rng.random() < 0.05 else ""
+            writer.writerow([i, rng.choice(CITIES), round(rng.uniform(1, 500), 2), rng.randint(1, 20),
+                             f"customer{rng.randint(1, 5000)}", comment])
+
+
+def load(method: str, path: str, workers: int) -> int:
+    if method == "dicts":
+        with open(path, newline="") as f:
+            return len(list(csv.DictReader(f)))
+    if method == "columns":
+        return len(read_csv_columns(path, workers=1))
+    if method == "columns xN":
+        return len(read_csv_columns(path, workers=workers, chunk_bytes=max(os.path.getsize(path) // (4 * workers), 1)))
+    if method == "projected":
+        return len(read_csv_columns(path, columns=["city", "price"], where=[("price", ">", 400)], workers=1))
+    raise ValueError(method)
+
+
+def worker(method: str, path: str, workers: int) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    rows = load(method, path, workers)
+    elapsed = time.perf_counter() - start
+    # Children's RSS counts too: the process pool parses in other processes
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    peak = max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline, children)
+    print(json.dumps({"rows": rows, "seconds": elapsed, "rss_kb": peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--worker", nargs=3, metavar=("METHOD", "PATH", "WORKERS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        method, path, workers = args.worker
+        worker(method, path, int(workers))
+        return
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sales.csv")
+        make_csv(path, args.rows)
+        size_mb = os.path.getsize(path) / 1024 / 1024
+        print(f"{args.rows:,} rows, {size_mb:.1f} MB, {args.workers} workers")
+        print(f"{'loader':<14}{'rows kept':>12}{'seconds':>10}{'MB/s':>8}{'peak RSS MB':>14}")
+        for method in ("dicts", "columns", "columns xN", "projected"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--worker", method, path, str(args.workers)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output)
+            print(f"{method:<14}{result['rows']:>12,}{result['seconds']:>10.2f}"
+                  f"{size_mb / result['seconds']:>8.1f}{result['rss_kb'] / 1024:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# bench_fast_io.py: Compare ways of reading a big text file line by line / block by block
+# Every method runs in a fresh child process so its peak memory (max RSS) is
+# measured on its own. Reported: throughput (MB/s) and peak RSS above the
+# interpreter's own baseline.
+#   read()       f.read() then split: the whole file in memory at once
+#   readlines()  a list with every line
+#   iterate      `for line in f` (buffered, one line at a time)
+#   chunks       fast_io.read_chunks, one reused 1 MB buffer
+#   mmap         fast_io.mmap_lines, memoryview slices of a memory-mapped file
+# Usage: python bench_fast_io.py [--sizes 1 10 100] [--methods chunks mmap]
+#        (sizes in MB; 10240 = 10 GB -- read()/readlines() are skipped above --max-in-memory)
+
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from fast_io import BatchedWriter, mmap_lines, read_chunks
+
+METHODS = ("read()", "readlines()", "iterate", "chunks", "mmap")
+IN_MEMORY = ("read()", "readlines()")
+
+
+def make_file(path: str, size_mb: int, seed: int = 42) -> None:
+    """Write ~size_mb MB of log-like lines of random length."""
+    rng = random.Random(seed)
+    words = ["python", "file", "stream", "buffer", "memory", "line", "data", "chunk"]
+    block = "".join(f"{i} " + " ".join(rng.choices(words, k=rng.randint(2, 15))) + "\n" for i in range(10_000))
+    block = block.encode()
+    target = size_mb * 1024 * 1024
+    written = 0
+    with BatchedWriter(path) as out:
+        while written < target:
+            out.write(block)
+            written += len(block)
+
+
+def run_method(method: str, path: str) -> int:
+    """Count the lines of the file using one method; returns the line count."""
+    if method == "read()":
+        with open(path, "rb") as f:
+            return len(f.read().splitlines())
+    if method == "readlines()":
+        with open(path, "rb") as f:
+            return len(f.readlines())
+    if method == "iterate":
+        with open(path, "rb") as f:
+            return sum(1 for _ in f)
+    if method == "chunks":
+        return sum(block.tobytes().count(b"\n") for block in read_chunks(path))
+    if method == "mmap":
+        return sum(1 for _ in mmap_lines(path))
+    raise ValueError(method)
+
+
+def peak_rss_kb() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss  # KB on Linux
+
+
+def worker(method: str, path: str) -> None:
+    baseline = peak_rss_kb()
+    start = time.perf_counter()
+    lines = run_method(method, path)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"lines": lines, "seconds": elapsed, "rss_kb": peak_rss_kb() - baseline}))
+
+
+def measure(method: str, path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--worker", method, path],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="file sizes in MB")
+    parser.add_argument("--methods", nargs="+", default=list(METHODS), choices=METHODS)
+    parser.add_argument("--max-in-memory", type=int, default=1024,
+                        help="skip read()/readlines() for files larger than this many MB")
+    parser.add_argument("--dir", default=None, help="where to create the test files (needs free space)")
+    parser.add_argument("--worker", nargs=2, metavar=("METHOD", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(*args.worker)
+        return
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as folder:
+        for size_mb in args.sizes:
+            path = os.path.join(folder, f"{size_mb}mb.txt")
+            make_file(path, size_mb)
+            real_mb = os.path.getsize(path) / 1024 / 1024
+            print(f"\n--- {real_mb:,.0f} MB file ---")
+            print(f"{'method':<14}{'lines':>14}{'MB/s':>10}{'peak RSS MB':>14}")
+            for method in args.methods:
+                if method in IN_MEMORY and size_mb > args.max_in_memory:
+                    print(f"{method:<14}{'skipped (would load the whole file)':>38}")
+                    continue
+                result = measure(method, path)
+                print(f"{method:<14}{result['lines']:>14,}{real_mb / result['seconds']:>10,.0f}"
+                      f"{result['rss_kb'] / 1024:>14.1f}")
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
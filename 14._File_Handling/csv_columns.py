@@ -0,0 +1,373 @@
+# csv_columns.py: Load big CSV files into compact typed columns, in parallel
+# csv.DictReader gives one dict per row: every value is a separate str object
+# and every row repeats the column names. For a few GB of CSV that is many
+# times the file size in RAM. read_csv_columns() instead:
+#   - splits the file into byte ranges that never cut a quoted field in half,
+#   - parses the ranges in a process pool,
+#   - stores each column as ONE typed array: int -> array('q'), float -> array('d'),
+#     text -> DictColumn (each distinct string stored once + array of small codes),
+#   - only converts the columns you ask for (projection) and drops rows that fail
+#     the `where` conditions inside the workers (predicate pushdown).
+#
+#   table = read_csv_columns("sales.csv", columns=["city", "price"], where=[("price", ">", 100)])
+#   table["price"]        # array('d', [...])
+#   table.row(0)          # {'city': 'Lahore', 'price': 120.5}
+
+import csv
+import io
+import math
+import operator
+import os
+import re
+from array import array
+from collections.abc import Iterator, Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024  # 16 MB of CSV per task
+BATCH_ROWS = 16_384                      # Rows of text converted to typed arrays at a time
+
+# Characters inference accepts in numbers: ASCII digits, sign, point, exponent. int() and
+# float() also take "nan", "Inf", "1_000" and " 7 ", which would lose the text's spelling.
+_NUMBER_CHARS = re.compile(r"[0-9+\-.eE]*").fullmatch
+
+_OPS = {
+    "==": operator.eq, "!=": operator.ne,
+    "<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge,
+    "in": lambda value, options: value in options,
+    "not in": lambda value, options: value not in options,
+}
+
+
+class DictColumn(Sequence):
+    """
+    Dictionary-encoded text column: `values` holds each distinct string once,
+    `codes[i]` is the position of row i's string in `values`.
+    """
+
+    def __init__(self, codes: array, values: list[str]):
+        self.codes = codes
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.values[code] for code in self.codes[index]]
+        return self.values[self.codes[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        return map(self.values.__getitem__, self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.codes.itemsize * len(self.codes) + sum(len(v) for v in self.values)
+
+    def __repr__(self) -> str:
+        return f"DictColumn({len(self)} rows, {len(self.values)} distinct values)"
+
+
+class Table:
+    """Columns of equal length, addressed by name: table["price"], table.row(3)."""
+
+    def __init__(self, columns: dict):
+        self.columns = columns
+
+    @property
+    def names(self) -> list[str]:
+        return list(self.columns)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def row(self, index: int) -> dict:
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def rows(self) -> Iterator[dict]:
+        names = self.names
+        for values in zip(*self.columns.values()):
+            yield dict(zip(names, values))
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate memory used by the column data."""
+        return sum(c.nbytes if isinstance(c, DictColumn) else c.itemsize * len(c) for c in self.columns.values())
+
+    def __repr__(self) -> str:
+        kinds = {name: type(c).__name__ if isinstance(c, DictColumn) else c.typecode for name, c in self.columns.items()}
+        return f"Table({len(self)} rows, {kinds})"
+
+
+# --------------------------------------------------
+# Splitting the file
+# --------------------------------------------------
+def record_starts(path: str, targets: list[int], block_size: int = 1024 * 1024) -> list[int]:
+    """
+    For each byte offset in `targets`, the first offset at or after it where a
+    new CSV record begins: just after a newline that is NOT inside quotes.
+
+    A newline is inside quotes when an odd number of `"` came before it in the
+    file (an escaped quote "" counts twice, so it does not change the parity).
+    This needs one read through the file, but bytes.find/count do it in C.
+    """
+    size = os.path.getsize(path)
+    pending = sorted(targets)
+    starts = []
+    parity = offset = 0
+    with open(path, "rb") as f:
+        while pending and offset < size:
+            block = f.read(block_size)
+            scanned = 0  # Quotes before this point of the block are already in `parity`
+            while pending:
+                target = pending[0]
+                if target <= 0:
+                    starts.append(0)
+                    pending.pop(0)
+                    continue
+                newline = block.find(b"\n", max(target - 1 - offset, scanned))
+                if newline < 0:
+                    break
+                parity ^= block.count(b'"', scanned, newline) & 1
+                scanned = newline
+                if parity:
+                    pending[0] = offset + newline + 2  # Quoted newline: keep looking after it
+                else:
+                    starts.append(offset + newline + 1)
+                    pending.pop(0)
+            parity ^= block.count(b'"', scanned) & 1
+            offset += len(block)
+    return starts + [size] * len(pending)
+
+
+def split_ranges(path: str, chunk_bytes: int = DEFAULT_CHUNK_BYTES) -> tuple[list[str], list[tuple[int, int]]]:
+    """Return (header, [(start, end), ...]) with every range holding whole records."""
+    size = os.path.getsize(path)
+    targets = [1] + list(range(chunk_bytes, size, chunk_bytes))
+    starts = record_starts(path, targets)
+    with open(path, "rb") as f:
+        header_bytes = f.read(starts[0])
+    header = next(csv.reader(io.StringIO(header_bytes.decode("utf-8-sig"), newline="")), [])
+    bounds = sorted(set(starts)) + [size]
+    ranges = [(a, b) for a, b in zip(bounds, bounds[1:]) if a < b]
+    return header, ranges
+
+
+# --------------------------------------------------
+# Parsing one range (runs inside a worker process)
+# --------------------------------------------------
+def _compile_where(header: list[str], where) -> list:
+    """[("price", ">", 10)] -> [(column_index, test(raw_text) -> bool)]."""
+    tests = []
+    for name, op, literal in where:
+        if op not in _OPS:
+            raise ValueError(f"unknown operator {op!r}; use one of {sorted(_OPS)}")
+        compare = _OPS[op]
+        sample = next(iter(literal), None) if op in ("in", "not in") else literal
+        convert = float if isinstance(sample, (int, float)) and not isinstance(sample, bool) else str
+
+        def test(raw: str, convert=convert, compare=compare, literal=literal) -> bool:
+            try:
+                return compare(convert(raw), literal)
+            except ValueError:
+                return False  # Empty or non-numeric text never matches a numeric condition
+
+        tests.append((header.index(name), test))
+    return tests
+
+
+def _convert(raw: list[str], dtype: type | None):
+    """Turn one column of text into the narrowest typed container."""
+    if dtype is None and not _NUMBER_CHARS("".join(raw)):  # One scan in C, for the whole batch
+        dtype = str
+    if dtype in (None, int):
+        try:
+            return array("q", map(int, raw))
+        except (ValueError, OverflowError):
+            if dtype is int:
+                raise
+    if dtype in (None, float):
+        try:
+            return array("d", [float(v) if v else math.nan for v in raw])  # Empty -> NaN
+        except ValueError:
+            if dtype is float:
+                raise
+    positions: dict[str, int] = {}
+    codes = array("I", [positions.setdefault(v, len(positions)) for v in raw])
+    return DictColumn(codes, list(positions))
+
+
+class _TextColumn(Exception):
+    """A column looked numeric in earlier batches of a range but holds text later on."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+def _parse_text(text: str, label: str, header: list[str], columns: list[str], where, dtypes: dict) -> dict:
+    tests = _compile_where(header, where)
+    width = len(header)
+    wanted = [(name, header.index(name)) for name in columns]
+    raw = {name: [] for name in columns}   # Text of the current batch, projected columns only
+    parts = {name: [] for name in columns}  # Typed containers of finished batches
+
+    def flush():
+        for name, values in raw.items():
+            dtype = dtypes.get(name)
+            if dtype is None and parts[name] and _kind(parts[name][0]) is str:
+                dtype = str  # Once text, always text: these values are still raw, nothing is lost
+            try:
+                part = _convert(values, dtype)
+            except (ValueError, OverflowError) as error:
+                raise ValueError(f"column {name!r} is not {dtype.__name__}: {error}") from None
+            if _kind(part) is str and parts[name] and _kind(parts[name][0]) is not str:
+                raise _TextColumn(name)  # Earlier batches were converted to numbers: start over
+            parts[name].append(part)
+            values.clear()
+
+    kept = 0
+    for number, row in enumerate(csv.reader(io.StringIO(text, newline=""))):
+        if not row:
+            continue
+        if len(row) != width:
+            raise ValueError(f"record {number} of {label} has {len(row)} fields, expected {width}")
+        if all(test(row[i]) for i, test in tests):
+            for name, i in wanted:
+                raw[name].append(row[i])
+            kept += 1
+            if kept % BATCH_ROWS == 0:
+                flush()  # Keeps at most BATCH_ROWS rows of text alive at once
+    flush()
+    return {name: merge_columns(parts[name]) for name in columns}
+
+
+def parse_range(path: str, start: int, end: int, header: list[str], columns: list[str],
+                where=(), dtypes: dict | None = None, encoding: str = "utf-8") -> dict:
+    """Parse the records in bytes [start, end) into {column: typed container}."""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = f.read(end - start).decode(encoding)
+    dtypes = dict(dtypes or {})
+    while True:
+        try:
+            return _parse_text(text, f"bytes {start}-{end}", header, columns, where, dtypes)
+        except _TextColumn as found:
+            dtypes[found.name] = str
+
+
+def _parse_task(task: tuple) -> dict:
+    return parse_range(*task)
+
+
+def _run_tasks(tasks: list[tuple], workers: int | None) -> list[dict]:
+    if workers == 1 or len(tasks) <= 1:
+        return [_parse_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_parse_task, tasks))
+
+
+# --------------------------------------------------
+# Merging the chunks
+# --------------------------------------------------
+def _kind(column) -> type:
+    return str if isinstance(column, DictColumn) else {"q": int, "d": float}[column.typecode]
+
+
+def _empty(column) -> bool:
+    """Only empty fields (NaN in a float array): no evidence of the column's type."""
+    if isinstance(column, DictColumn):
+        return column.values in ([], [""])
+    return not column or column.typecode == "d" and all(map(math.isnan, column))
+
+
+def merge_columns(parts: list):
+    """
+    Concatenate one column's chunks. Int chunks are widened to float when
+    other chunks hold floats; text chunks must not be mixed with numbers.
+    Chunks of only empty fields take the type of the others (NaN in numbers,
+    "" in text), so the result does not depend on where the chunks were cut;
+    a column with nothing but empty fields is text.
+    """
+    kinds = {_kind(p) for p in parts if not _empty(p)}
+    if not kinds:
+        return _convert([""] * sum(map(len, parts)), str)
+    if str not in kinds:
+        if any(len(p) and _empty(p) for p in parts):
+            kinds.add(float)  # Empty fields among ints: NaN needs a float array
+        merged = array("d" if float in kinds else "q")
+        for part in parts:
+            if isinstance(part, DictColumn):
+                part = array("d", [math.nan]) * len(part)
+            merged.extend(part if part.typecode == merged.typecode else array("d", part))
+        return merged
+    if kinds != {str}:
+        raise TypeError("cannot merge text chunks with numeric chunks")
+    positions: dict[str, int] = {}
+    codes = array("I")
+    for part in parts:
+        if not isinstance(part, DictColumn):
+            part = _convert([""] * len(part), str)
+        remap = [positions.setdefault(v, len(positions)) for v in part.values]
+        codes.extend(map(remap.__getitem__, part.codes))
+    return DictColumn(codes, list(positions))
+
+
+def read_csv_columns(path: str, columns: list[str] | None = None, where=(), dtypes: dict | None = None,
+                     workers: int | None = None, chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                     encoding: str = "utf-8") -> Table:
+    """
+    Load a CSV file (first line = header) into a Table of typed columns.
+
+    - columns: names to load (default: all). Other columns are never converted or stored.
+    - where: conditions every kept row must meet, e.g. [("age", ">=", 18), ("city", "in", {"Lahore"})].
+      Numeric literals compare numerically, strings compare as text.
+    - dtypes: force a type per column, e.g. {"zip": str}; otherwise int/float/str is inferred.
+    - workers: processes to use (1 = parse in this process).
+
+    Assumes RFC 4180 quoting: a `"` only appears inside quoted fields (escaped as "").
+    """
+    header, ranges = split_ranges(path, chunk_bytes)
+    columns = list(header) if columns is None else list(columns)
+    names = set(header)
+    for name in [*columns, *(condition[0] for condition in where), *(dtypes or {})]:
+        if name not in names:
+            raise KeyError(f"no column {name!r} in {path}; columns are {header}")
+    where = list(where)
+    chunks = _run_tasks([(path, start, end, header, columns, where, dtypes, encoding)
+                         for start, end in ranges], workers)
+
+    # A column can look numeric in one range and hold text in another ("12", "12A").
+    # Converting the numbers back would lose their spelling ("007" -> 7), so
+    # those ranges are parsed again with the column read as text.
+    # Ranges of only empty fields carry no type, so they never make a column mixed.
+    kinds = {name: {_kind(chunk[name]) for chunk in chunks if not _empty(chunk[name])} for name in columns}
+    mixed = [name for name in columns if str in kinds[name] and len(kinds[name]) > 1]
+    if mixed:
+        forced = {**(dtypes or {}), **dict.fromkeys(mixed, str)}
+        redo = [i for i, chunk in enumerate(chunks)
+                if any(_kind(chunk[name]) is not str and not _empty(chunk[name]) for name in mixed)]
+        fixes = _run_tasks([(path, *ranges[i], header, mixed, where, forced, encoding) for i in redo], workers)
+        for i, fix in zip(redo, fixes):
+            chunks[i].update(fix)
+    return Table({name: merge_columns([chunk[name] for chunk in chunks]) for name in columns})
+
+
+# Example of code that should only run when csv_columns.py is executed directly
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "people.csv")
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "age", "city", "note"])
+            for i in range(10_000):
+                writer.writerow([f"user{i}", 18 + i % 50, ["Lahore", "Karachi", "Quetta"][i % 3],
+                                 'likes "Python",\nand files' if i % 7 == 0 else ""])
+        table = read_csv_columns(path, columns=["name", "age", "city"], where=[("age", ">=", 60)],
+                                 chunk_bytes=64 * 1024, workers=2)
+        print(table)
+        print(table.row(0))
+        print(f"{table.nbytes:,} bytes of column data")
@@ -0,0 +1,179 @@
+# fast_io.py: Reading and writing very large files without running out of memory
+#   read_chunks(path)   fixed-size blocks read into ONE reused buffer
+#   mmap_lines(path)    lines as memoryview slices of a memory-mapped file (no copies)
+#   tail(path, n)       last n lines, reading backwards from the end of the file
+#   reverse_lines(path) every line, last to first
+#   BatchedWriter       collects small writes and flushes them in large batches
+# `f.read()` and `f.readlines()` load the whole file at once; these helpers
+# keep memory use constant no matter how big the file is.
+
+import mmap
+import os
+from collections.abc import Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024  # 1 MB
+
+
+def read_chunks(path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[memoryview]:
+    """
+    Yield the file in blocks of up to `chunk_size` bytes.
+
+    The SAME buffer is refilled for every block (readinto, no new bytes object
+    per read), so each memoryview is only valid until the next one is yielded.
+    Call bytes(block) if you need to keep it.
+    """
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, "rb", buffering=0) as f:  # Unbuffered: readinto goes straight to our buffer
+        while True:
+            n = f.readinto(buffer)
+            if not n:
+                break
+            yield view[:n]
+
+
+def mmap_lines(path: str, keepends: bool = False) -> Iterator[memoryview]:
+    """
+    Yield every line as a memoryview into a memory-mapped file.
+
+    No line is copied: the OS pages the file in as you go and can drop pages
+    you have passed. Each view stays valid for as long as you keep it.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, "rb") as f:
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)  # The map outlives the open file
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mm.madvise(mmap.MADV_SEQUENTIAL)  # Hint: read ahead aggressively, drop pages behind us
+    # No mm.close(): lines you kept still point into the map. It is unmapped
+    # automatically once the last view is garbage collected.
+    view = memoryview(mm)
+    start, size, find = 0, len(mm), mm.find
+    while start < size:
+        newline = find(b"\n", start)
+        end = size if newline < 0 else newline + 1
+        yield view[start : end if keepends or newline < 0 else newline]
+        start = end
+
+
+def _backward_blocks(f, block_size: int) -> Iterator[bytes]:
+    """Yield the file's blocks from last to first."""
+    position = f.seek(0, os.SEEK_END)
+    while position > 0:
+        step = min(block_size, position)
+        position -= step
+        f.seek(position)
+        yield f.read(step)
+
+
+def reverse_lines(path: str, block_size: int = 64 * 1024, encoding: str | None = "utf-8") -> Iterator:
+    """Yield lines from last to first, reading the file backwards one block at a time."""
+    with open(path, "rb") as f:
+        leftover = b""
+        first_block = True
+        for block in _backward_blocks(f, block_size):
+            block += leftover
+            lines = block.split(b"\n")
+            if first_block:
+                first_block = False
+                if lines and lines[-1] == b"":
+                    lines.pop()  # The file ends with "\n": no empty last line
+            leftover = lines.pop(0)  # May be the end of a line that started in an earlier block
+            for line in reversed(lines):
+                yield line.decode(encoding) if encoding else line
+        if leftover or not first_block:
+            yield leftover.decode(encoding) if encoding else leftover
+
+
+def tail(path: str, n: int = 10, block_size: int = 64 * 1024, encoding: str | None = "utf-8") -> list:
+    """The last n lines of a file, like the `tail` command. Reads only the end of the file."""
+    lines = []
+    for line in reverse_lines(path, block_size, encoding):
+        if len(lines) == n:
+            break
+        lines.append(line)
+    lines.reverse()
+    return lines
+
+
+class BatchedWriter:
+    """
+    Buffer many small writes and hand them to the OS in large batches.
+
+    Each flush is ONE os.write/os.writev call, so writing a million short
+    lines costs a few hundred system calls instead of a million.
+    """
+
+    def __init__(self, path: str, mode: str = "wb", batch_bytes: int = 4 * DEFAULT_CHUNK_SIZE,
+                 encoding: str = "utf-8"):
+        if mode not in ("wb", "ab"):
+            raise ValueError("mode must be 'wb' or 'ab'")
+        flags = os.O_WRONLY | os.O_CREAT | (os.O_APPEND if mode == "ab" else os.O_TRUNC)
+        self._fd = os.open(path, flags | getattr(os, "O_BINARY", 0), 0o644)
+        self.batch_bytes = batch_bytes
+        self.encoding = encoding
+        self._pending: list[bytes] = []
+        self._pending_bytes = 0
+        self.syscalls = 0
+        self.bytes_written = 0
+
+    def write(self, data: bytes | str) -> None:
+        if isinstance(data, str):
+            data = data.encode(self.encoding)
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        if self._pending_bytes >= self.batch_bytes:
+            self.flush()
+
+    def writelines(self, lines: Iterable[bytes | str]) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        # writev sends the list of pieces in one call; its size limit (IOV_MAX)
+        # is usually 1024, so join larger batches first
+        total = self._pending_bytes
+        if hasattr(os, "writev") and len(self._pending) <= 1024:
+            written = os.writev(self._fd, self._pending)
+        else:
+            written = os.write(self._fd, b"".join(self._pending))
+        self.syscalls += 1
+        if written < total:  # Rare partial write: finish the rest
+            rest = memoryview(b"".join(self._pending))
+            while written < total:
+                written += os.write(self._fd, rest[written:])
+                self.syscalls += 1
+        self.bytes_written += total
+        self._pending.clear()
+        self._pending_bytes = 0
+
+    def close(self) -> None:
+        if self._fd is None:
+            return
+        self.flush()
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self) -> "BatchedWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# Example of code that should only run when fast_io.py is executed directly
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "sample.log")
+        with BatchedWriter(path, batch_bytes=64 * 1024) as out:
+            for i in range(100_000):
+                out.write(f"line {i}: hello, python!\n")
+        print(f"Wrote {out.bytes_written:,} bytes with {out.syscalls} write system calls")
+        total = sum(len(block) for block in read_chunks(path, 256 * 1024))
+        print(f"read_chunks() saw {total:,} bytes")
+        print(f"mmap_lines() counted {sum(1 for _ in mmap_lines(path)):,} lines")
+        print(f"tail(path, 3): {tail(path, 3)}")
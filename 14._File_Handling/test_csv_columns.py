@@ -0,0 +1,44 @@
+# test_csv_columns.py: read_csv_columns() must not depend on where the file is cut
+# Usage: python -m pytest test_csv_columns.py   (or: python test_csv_columns.py)
+
+import math
+import os
+import tempfile
+
+from csv_columns import DictColumn, read_csv_columns
+
+
+def _write(rows: list[str]) -> str:
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, newline="") as f:
+        f.write("id,late,spelled,blank\n")
+        f.writelines(row + "\n" for row in rows)
+        return f.name
+
+
+def _snapshot(table) -> dict:
+    """{column: (kind, values)} with NaN made comparable."""
+    return {name: (type(column).__name__ if isinstance(column, DictColumn) else column.typecode,
+                   ["nan" if isinstance(v, float) and math.isnan(v) else v for v in column])
+            for name, column in table.columns.items()}
+
+
+def test_same_result_at_any_chunk_size():
+    spellings = ["Nan", "Inf", "1_000", " 7 ", "-inf"]
+    # `late` is empty for its first 10k rows, then holds ints
+    rows = [f"{i},{'' if i < 10_000 else i},{spellings[i % len(spellings)]}," for i in range(12_000)]
+    path = _write(rows)
+    try:
+        expected = _snapshot(read_csv_columns(path, workers=1, chunk_bytes=1 << 30))
+        assert expected["late"][0] == "d"
+        assert expected["late"][1][9_999:10_001] == ["nan", 10_000.0]
+        assert expected["spelled"] == ("DictColumn", [spellings[i % len(spellings)] for i in range(12_000)])
+        assert expected["blank"] == ("DictColumn", [""] * 12_000)
+        for chunk_bytes in (50_000, 20_000, 7_000):
+            assert _snapshot(read_csv_columns(path, workers=1, chunk_bytes=chunk_bytes)) == expected, chunk_bytes
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    test_same_result_at_any_chunk_size()
+    print("ok")
@@ -0,0 +1,84 @@
+# bench_monitor_profiler.py: What does profiling cost the program being profiled?
+# The same call-heavy workload runs under:
+#   none         no profiler
+#   cProfile     the standard library's deterministic profiler
+#   monitor      monitor_profiler.Profiler (function events only)
+#   lines        monitor_profiler.Profiler(lines=True) (one event per executed line)
+#   toggled      Profiler started and stopped again before the workload runs
+# "toggled" shows the point of sys.monitoring: once the events are switched off
+# the program runs at full speed again. Also timed: one start()+stop() pair.
+# Usage: python bench_monitor_profiler.py [--n 22] [--repeat 3]
+
+import argparse
+import cProfile
+import time
+
+from monitor_profiler import Profiler
+
+
+def fib(n: int) -> int:
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+
+def word_lengths(words: list[str]) -> dict[int, int]:
+    counts: dict[int, int] = {}
+    for word in words:
+        counts[len(word)] = counts.get(len(word), 0) + 1
+    return counts
+
+
+def workload(n: int) -> int:
+    words = [f"word{i % 997}" * (i % 5 + 1) for i in range(20_000)]
+    return fib(n) + sum(word_lengths(words).values())
+
+
+def timed(variant: str, n: int) -> float:
+    start = time.perf_counter()
+    if variant == "none":
+        workload(n)
+    elif variant == "cProfile":
+        profile = cProfile.Profile()
+        profile.enable()
+        workload(n)
+        profile.disable()
+    elif variant == "toggled":
+        with Profiler() as profiler:
+            pass
+        start = time.perf_counter()
+        workload(n)
+        profiler.close()
+    else:
+        profiler = Profiler(lines=variant == "lines")
+        with profiler:
+            workload(n)
+        profiler.close()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n", type=int, default=22, help="fib(n): about 1.3 * fib(n) Python calls")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"workload: fib({args.n}) + counting 20,000 words, best of {args.repeat}")
+    baseline = None
+    print(f"{'variant':<10}{'seconds':>9}{'overhead':>10}")
+    for variant in ("none", "cProfile", "monitor", "lines", "toggled"):
+        best = min(timed(variant, args.n) for _ in range(args.repeat))
+        baseline = baseline or best
+        print(f"{variant:<10}{best:>9.3f}{best / baseline:>9.2f}x")
+
+    profiler = Profiler()
+    toggles = 10_000
+    start = time.perf_counter()
+    for _ in range(toggles):
+        profiler.start()
+        profiler.stop()
+    elapsed = time.perf_counter() - start
+    profiler.close()
+    print(f"start()+stop(): {elapsed / toggles * 1e6:.1f} us per pair")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_pipeline.py: Lazy pipeline vs building a list at every step
+# The same ETL-style job, four ways:
+#   lists        a list comprehension per stage (every stage fully in memory)
+#   generators   chained generator expressions (lazy, one frame per stage)
+#   pipeline     pipeline.py with fusion: Map/Filter/Map run in ONE generated frame
+#   unfused      pipeline.py with fuse=False (built-in map/filter per stage)
+# Job: x * 3 -> keep odd -> + 1 -> batches of 1000 -> sum of every batch -> total
+# Each variant runs in its own process so its peak memory (max RSS) is its own.
+# Usage: python bench_pipeline.py [--items 10000000]   (10**8 works; lists are skipped above --max-list-items)
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+from itertools import batched
+
+from pipeline import Batch, Filter, Map, Sink, Source
+
+VARIANTS = ("lists", "generators", "pipeline", "unfused")
+
+
+def triple(x):
+    return x * 3
+
+
+def is_odd(x):
+    return x % 2
+
+
+def plus_one(x):
+    return x + 1
+
+
+def sum_batches(batches) -> int:
+    return sum(map(sum, batches))
+
+
+def run(variant: str, n: int) -> int:
+    if variant == "lists":
+        tripled = [triple(x) for x in range(n)]
+        odd = [x for x in tripled if is_odd(x)]
+        bumped = [plus_one(x) for x in odd]
+        batches = [bumped[i : i + 1000] for i in range(0, len(bumped), 1000)]
+        return sum_batches(batches)
+    if variant == "generators":
+        tripled = (triple(x) for x in range(n))
+        odd = (x for x in tripled if is_odd(x))
+        bumped = (plus_one(x) for x in odd)
+        batches = batched(bumped, 1000)
+        return sum_batches(batches)
+    fuse = variant == "pipeline"
+    return Source(range(n), fuse=fuse) | Map(triple) | Filter(is_odd) | Map(plus_one) | Batch(1000) | Sink(sum_batches)
+
+
+def worker(variant: str, n: int) -> None:
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    total = run(variant, n)
+    elapsed = time.perf_counter() - start
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline
+    print(json.dumps({"total": total, "seconds": elapsed, "rss_kb": peak}))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=10_000_000)
+    parser.add_argument("--max-list-items", type=int, default=20_000_000,
+                        help="skip the list version above this (it needs several GB)")
+    parser.add_argument("--worker", nargs=2, metavar=("VARIANT", "ITEMS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        worker(args.worker[0], int(args.worker[1]))
+        return
+
+    print(f"{args.items:,} items: x*3 -> odd -> +1 -> Batch(1000) -> sum")
+    print(f"{'variant':<12}{'seconds':>9}{'ns/item':>9}{'peak RSS MB':>13}   result")
+    for variant in VARIANTS:
+        if variant == "lists" and args.items > args.max_list_items:
+            print(f"{variant:<12}{'skipped (would need several GB)':>40}")
+            continue
+        output = subprocess.run([sys.executable, __file__, "--worker", variant, str(args.items)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output)
+        print(f"{variant:<12}{result['seconds']:>9.2f}{result['seconds'] / args.items * 1e9:>9.0f}"
+              f"{result['rss_kb'] / 1024:>13.1f}   {result['total']:,}")
+
+
+if __name__ == "__main__":
+    main()
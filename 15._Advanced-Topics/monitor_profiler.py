@@ -0,0 +1,305 @@
+# monitor_profiler.py: A profiler built on sys.monitoring (Python 3.12+, PEP 669)
+# A timing decorator adds a wrapper frame to every call and must be written
+# into the code. sys.monitoring lets a tool ask the interpreter for events
+# (function start, return, line executed...) WITHOUT touching the code, and:
+#   - code you are not interested in (the standard library, this file) answers
+#     the first event with DISABLE, after which the interpreter stops reporting
+#     that location at all: it then runs at full speed,
+#   - with no events switched on, the cost is zero: start()/stop() are just
+#     sys.monitoring.set_events() calls.
+# Records per function: calls, cumulative time, self time; optionally how
+# often each line ran; and a call tree exported as collapsed stacks
+# ("main;load;parse 1234" lines) for flamegraph.pl, speedscope or inferno.
+#
+#   profiler = Profiler()
+#   with profiler:
+#       main()
+#   profiler.print_report()
+#   profiler.write_collapsed("profile.folded")
+#
+# Or, for any script without editing it:
+#   python monitor_profiler.py --lines --collapsed out.folded ../10._Functions/main.py [script args]
+
+import os
+import sys
+import sysconfig
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+FunctionStats = namedtuple("FunctionStats", "name calls cumulative_ms self_ms")
+LineStats = namedtuple("LineStats", "location hits")
+
+_monitoring = sys.monitoring
+_events = _monitoring.events
+_DISABLE = _monitoring.DISABLE
+_LIBRARY_PATHS = tuple(
+    {os.path.abspath(sysconfig.get_paths()[key]) for key in ("stdlib", "platstdlib", "purelib", "platlib")}
+)
+_THIS_FILE = os.path.abspath(__file__)
+_now = time.perf_counter_ns
+_get_ident = threading.get_ident
+
+
+def describe(code) -> str:
+    """Readable, single-line name for a code object: 'app.py:12(greet)'."""
+    return f"{os.path.basename(code.co_filename)}:{code.co_firstlineno}({code.co_qualname})"
+
+
+class _Node:
+    """One call path in the call tree (what a flame graph draws as a box)."""
+
+    __slots__ = ("code", "children", "calls", "self_ns", "total_ns")
+
+    def __init__(self, code):
+        self.code = code
+        self.children: dict = {}
+        self.calls = 0
+        self.self_ns = 0
+        self.total_ns = 0
+
+
+def _claim_tool_id(name: str) -> int:
+    # PROFILER_ID is the conventional slot; take any free one if another profiler holds it
+    for tool_id in (_monitoring.PROFILER_ID, 5, 4, 3):
+        if _monitoring.get_tool(tool_id) is None:
+            _monitoring.use_tool_id(tool_id, name)
+            return tool_id
+    raise RuntimeError("all sys.monitoring tool ids are in use")
+
+
+class Profiler:
+    """
+    - include: what to profile. None = everything outside the standard library and
+      site-packages; a path or list of paths = code in those files/folders; or a
+      function code -> bool.
+    - lines: also count how often every line runs (slower: one event per line).
+    """
+
+    def __init__(self, include=None, lines: bool = False):
+        if isinstance(include, str):
+            include = [include]
+        if include is not None and not callable(include):
+            include = tuple(os.path.abspath(path) for path in include)
+        self.include = include
+        self.lines = lines
+        self.enabled = False
+        self._tool: int | None = None
+        self._included: dict = {}                       # code -> bool, decided once per code object
+        self._line_hits: defaultdict = defaultdict(int)  # (code, line) -> hits
+        self._root = _Node(None)
+        self._threads: dict[int, list] = {}             # thread id -> call stack [[node, start_ns, child_ns], ...]
+
+    # ---------- switching on and off ----------
+    def start(self) -> None:
+        if self._tool is None:
+            self._tool = _claim_tool_id("monitor_profiler")
+            register = _monitoring.register_callback
+            register(self._tool, _events.PY_START, self._on_start)
+            register(self._tool, _events.PY_RESUME, self._on_resume)
+            register(self._tool, _events.PY_RETURN, self._on_exit)
+            register(self._tool, _events.PY_YIELD, self._on_exit)
+            register(self._tool, _events.PY_UNWIND, self._on_unwind)
+            register(self._tool, _events.LINE, self._on_line)
+            _monitoring.restart_events()  # Forget locations an earlier Profiler (other include) disabled
+        events = _events.PY_START | _events.PY_RESUME | _events.PY_RETURN | _events.PY_YIELD | _events.PY_UNWIND
+        if self.lines:
+            events |= _events.LINE
+        _monitoring.set_events(self._tool, events)
+        self.enabled = True
+
+    def stop(self) -> None:
+        """Stop recording; the results so far are kept. start() again to continue."""
+        if self._tool is not None:
+            _monitoring.set_events(self._tool, 0)
+        self._threads.clear()  # Calls still running now will never report their return
+        self.enabled = False
+
+    def close(self) -> None:
+        """Stop and give the tool id back so other tools can use it."""
+        self.stop()
+        if self._tool is not None:
+            for event in (_events.PY_START, _events.PY_RESUME, _events.PY_RETURN,
+                          _events.PY_YIELD, _events.PY_UNWIND, _events.LINE):
+                _monitoring.register_callback(self._tool, event, None)
+            _monitoring.free_tool_id(self._tool)
+            self._tool = None
+
+    def reset(self) -> None:
+        self._line_hits.clear()
+        self._root = _Node(None)
+        self._threads.clear()
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    # ---------- event callbacks (kept short: they run for every call) ----------
+    def _wanted(self, code) -> bool:
+        filename = code.co_filename
+        if filename.startswith("<") or os.path.abspath(filename) == _THIS_FILE:
+            wanted = False
+        elif self.include is None:
+            wanted = not os.path.abspath(filename).startswith(_LIBRARY_PATHS)
+        elif callable(self.include):
+            wanted = bool(self.include(code))
+        else:
+            wanted = os.path.abspath(filename).startswith(self.include)
+        self._included[code] = wanted
+        return wanted
+
+    # Only the call tree is updated per event; per-function numbers are summed from it in stats()
+    def _push(self, code, is_call: bool):
+        wanted = self._included.get(code)
+        if wanted is None:
+            wanted = self._wanted(code)
+        if not wanted:
+            return _DISABLE  # The interpreter never reports this location to us again
+        stack = self._threads.get(_get_ident())
+        if stack is None:
+            stack = self._threads[_get_ident()] = []
+        parent = stack[-1][0] if stack else self._root
+        node = parent.children.get(code)
+        if node is None:
+            node = parent.children[code] = _Node(code)
+        if is_call:
+            node.calls += 1
+        stack.append([node, _now(), 0])
+
+    def _on_start(self, code, offset):
+        return self._push(code, True)
+
+    def _on_resume(self, code, offset):
+        return self._push(code, False)  # A generator/coroutine continuing, not a new call
+
+    def _pop(self, code) -> None:
+        now = _now()
+        stack = self._threads.get(_get_ident())
+        if not stack or stack[-1][0].code is not code:
+            return  # Started before the profiler was switched on
+        node, start, child = stack.pop()
+        elapsed = now - start
+        node.self_ns += elapsed - child
+        node.total_ns += elapsed
+        if stack:
+            stack[-1][2] += elapsed
+
+    def _on_exit(self, code, offset, value):
+        wanted = self._included.get(code)
+        if wanted is None:
+            wanted = self._wanted(code)  # Entered before start(): decide now, do not just disable
+        if not wanted:
+            return _DISABLE
+        self._pop(code)
+
+    def _on_unwind(self, code, offset, exception):
+        # PY_UNWIND (function left by an exception) cannot be disabled per location
+        if self._included.get(code, False):
+            self._pop(code)
+
+    def _on_line(self, code, line):
+        wanted = self._included.get(code)
+        if wanted is None:
+            wanted = self._wanted(code)
+        if not wanted:
+            return _DISABLE
+        self._line_hits[(code, line)] += 1
+
+    # ---------- results ----------
+    def stats(self, sort: str = "cumulative_ms") -> list[FunctionStats]:
+        totals: dict = {}  # code -> [calls, cumulative_ns, self_ns]
+        pending = [(self._root, frozenset())]  # Explicit stack: deep recursion makes deep trees
+        while pending:
+            node, active = pending.pop()
+            for code, child in node.children.items():
+                row = totals.setdefault(code, [0, 0, 0])
+                row[0] += child.calls
+                row[2] += child.self_ns
+                if code not in active:
+                    row[1] += child.total_ns  # A recursive call's time is already in its outermost call
+                pending.append((child, active | {code}))
+        rows = [FunctionStats(describe(code), calls, cumulative / 1e6, self_ns / 1e6)
+                for code, (calls, cumulative, self_ns) in totals.items()]
+        return sorted(rows, key=lambda row: getattr(row, sort), reverse=True)
+
+    def hot_lines(self, top: int = 10) -> list[LineStats]:
+        ranked = sorted(self._line_hits.items(), key=lambda item: item[1], reverse=True)[:top]
+        return [LineStats(f"{os.path.basename(code.co_filename)}:{line} ({code.co_qualname})", hits)
+                for (code, line), hits in ranked]
+
+    def collapsed(self) -> list[str]:
+        """Call tree as 'outer;inner;innermost <self microseconds>' lines (flame graph input)."""
+        lines = []
+        pending = [(self._root, "")]
+        while pending:
+            node, path = pending.pop()
+            for code, child in reversed(node.children.items()):
+                frame = describe(code).replace(";", ":").replace(" ", "_")
+                child_path = f"{path};{frame}" if path else frame
+                if child.self_ns >= 1000:
+                    lines.append(f"{child_path} {child.self_ns // 1000}")
+                pending.append((child, child_path))
+        return lines
+
+    def write_collapsed(self, path: str) -> None:
+        with open(path, "w") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+
+    def print_report(self, top: int = 15, sort: str = "cumulative_ms") -> None:
+        print(f"{'calls':>10}{'cumul ms':>12}{'self ms':>12}{'us/call':>10}  function")
+        for row in self.stats(sort)[:top]:
+            per_call = row.cumulative_ms * 1000 / row.calls if row.calls else 0.0
+            print(f"{row.calls:>10,}{row.cumulative_ms:>12.2f}{row.self_ms:>12.2f}{per_call:>10.1f}  {row.name}")
+        if self._line_hits:
+            print(f"\n{'hits':>10}  hot line")
+            for location, hits in self.hot_lines(top):
+                print(f"{hits:>10,}  {location}")
+
+
+def profile_script(path: str, args: list[str], lines: bool = False) -> Profiler:
+    """Run a script as __main__ under the profiler (only code in its folder is profiled)."""
+    import runpy
+
+    path = os.path.abspath(path)
+    folder = os.path.dirname(path)
+    profiler = Profiler(include=folder, lines=lines)
+    saved_argv, saved_path = sys.argv, list(sys.path)
+    sys.argv = [path, *args]
+    sys.path.insert(0, folder)
+    try:
+        with profiler:
+            runpy.run_path(path, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        sys.argv, sys.path[:] = saved_argv, saved_path
+    return profiler
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profile a Python script with sys.monitoring")
+    parser.add_argument("script")
+    parser.add_argument("args", nargs=argparse.REMAINDER, help="arguments for the script")
+    parser.add_argument("--lines", action="store_true", help="also count line executions")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--sort", default="cumulative_ms", choices=["cumulative_ms", "self_ms", "calls"])
+    parser.add_argument("--collapsed", help="write collapsed stacks here (for flame graphs)")
+    options = parser.parse_args()
+
+    profiler = profile_script(options.script, options.args, options.lines)
+    print(f"\n=== Profile of {options.script} ===")
+    profiler.print_report(options.top, options.sort)
+    if options.collapsed:
+        profiler.write_collapsed(options.collapsed)
+        print(f"\nCollapsed stacks written to {options.collapsed}")
+    profiler.close()
+
+
+# Example of code that should only run when monitor_profiler.py is executed directly
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+# pipeline.py: Lazy, chainable data pipelines built from generators
+# Each stage pulls ONE item at a time from the stage before it, so a pipeline
+# over 100 million rows uses as much memory as over 10 rows:
+#
+#   total = Source(range(10**8)) | Map(lambda x: x * 3) | Filter(lambda x: x % 2) | Batch(1000) | Sink(sum_batches)
+#
+# Stages:
+#   Map(func)              func(item) for every item            (element-wise)
+#   Filter(predicate)      keep items where predicate(item)      (element-wise)
+#   Batch(size)            tuples of up to `size` items
+#   Window(size, step)     sliding windows (tuples) over the stream
+#   Dedupe(key, max_keys)  drop items whose key was already seen
+#   Take(n)                stop after n items
+#   Sink(consume)          run the pipeline: consume(iterator), e.g. Sink(list), Sink(sum)
+#
+# Fusion: every generator stage costs a frame switch per item. A run of
+# neighbouring Map/Filter stages is compiled into ONE generator function
+# (see Pipeline.explain()), so three element-wise stages cost one frame, not three.
+
+import sys
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import batched, islice
+
+
+# --------------------------------------------------
+# Stages
+# --------------------------------------------------
+class Stage:
+    """Base class: apply(iterator) returns the stage's output iterator."""
+
+    elementwise = False
+
+    def apply(self, iterator):
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return type(self).__name__
+
+
+class Map(Stage):
+    elementwise = True
+
+    def __init__(self, func):
+        self.func = func
+
+    def apply(self, iterator):
+        return map(self.func, iterator)  # Built-in map: a C iterator, no Python frame
+
+
+class Filter(Stage):
+    elementwise = True
+
+    def __init__(self, predicate):
+        self.func = predicate
+
+    def apply(self, iterator):
+        return filter(self.func, iterator)
+
+
+class Batch(Stage):
+    def __init__(self, size: int):
+        if size < 1:
+            raise ValueError("batch size must be at least 1")
+        self.size = size
+
+    def apply(self, iterator):
+        return batched(iterator, self.size)
+
+    def __repr__(self) -> str:
+        return f"Batch({self.size})"
+
+
+class Window(Stage):
+    """Sliding windows: Window(3) over 1,2,3,4,5 gives (1,2,3), (2,3,4), (3,4,5)."""
+
+    def __init__(self, size: int, step: int = 1):
+        if size < 1 or step < 1:
+            raise ValueError("window size and step must be at least 1")
+        self.size = size
+        self.step = step
+
+    def apply(self, iterator):
+        window = deque(islice(iterator, self.size), maxlen=self.size)
+        if len(window) < self.size:
+            return
+        yield tuple(window)
+        while True:
+            added = 0
+            for item in islice(iterator, self.step):
+                window.append(item)
+                added += 1
+            if added < self.step:
+                return
+            yield tuple(window)
+
+    def __repr__(self) -> str:
+        return f"Window({self.size}, step={self.step})"
+
+
+class Dedupe(Stage):
+    """
+    Drop repeated items (by key(item) if given). With max_keys, only the most
+    recently seen keys are remembered, so memory stays bounded on endless streams.
+    """
+
+    def __init__(self, key=None, max_keys: int | None = None):
+        self.key = key
+        self.max_keys = max_keys
+
+    def apply(self, iterator):
+        key = self.key
+        if self.max_keys is None:
+            seen = set()
+            for item in iterator:
+                k = item if key is None else key(item)
+                if k not in seen:
+                    seen.add(k)
+                    yield item
+            return
+        recent = OrderedDict()
+        for item in iterator:
+            k = item if key is None else key(item)
+            if k in recent:
+                recent.move_to_end(k)
+                continue
+            recent[k] = None
+            if len(recent) > self.max_keys:
+                recent.popitem(last=False)
+            yield item
+
+
+class Take(Stage):
+    def __init__(self, n: int):
+        self.n = n
+
+    def apply(self, iterator):
+        return islice(iterator, self.n)
+
+    def __repr__(self) -> str:
+        return f"Take({self.n})"
+
+
+class Sink:
+    """Terminal stage: `pipeline | Sink(list)` runs the pipeline and returns consume(iterator)."""
+
+    def __init__(self, consume=list):
+        self.consume = consume
+
+    @classmethod
+    def each(cls, func) -> "Sink":
+        """Call func(item) for every item (e.g. Sink.each(print)); returns the item count."""
+        def consume(iterator):
+            count = 0
+            for item in iterator:
+                func(item)
+                count += 1
+            return count
+        return cls(consume)
+
+
+# --------------------------------------------------
+# Fusion
+# --------------------------------------------------
+@lru_cache(maxsize=None)
+def _fused_factory(shape: str):
+    """
+    Compile a generator for a run of element-wise stages. shape is e.g. "mfm"
+    (map, filter, map); the generated code is straight-line:
+
+        def fused(iterable):
+            for x in iterable:
+                x = f0(x)
+                if not f1(x):
+                    continue
+                x = f2(x)
+                yield x
+    """
+    names = [f"f{i}" for i in range(len(shape))]
+    lines = [f"def make({', '.join(names)}):", "    def fused(iterable):", "        for x in iterable:"]
+    for name, kind in zip(names, shape):
+        if kind == "m":
+            lines.append(f"            x = {name}(x)")
+        else:
+            lines += [f"            if not {name}(x):", "                continue"]
+    lines += ["            yield x", "    return fused"]
+    namespace = {}
+    exec("\n".join(lines), namespace)
+    return namespace["make"]
+
+
+def _fuse(stages: list[Stage]):
+    """One iterator-transforming callable for a run of Map/Filter stages."""
+    if len(stages) == 1:
+        return stages[0].apply  # A single built-in map()/filter() is already as cheap as it gets
+    shape = "".join("m" if isinstance(stage, Map) else "f" for stage in stages)
+    return _fused_factory(shape)(*(stage.func for stage in stages))
+
+
+# --------------------------------------------------
+# Pipeline
+# --------------------------------------------------
+class Pipeline:
+    """An iterable source plus a chain of stages. Nothing runs until you iterate or pipe into a Sink."""
+
+    def __init__(self, source, stages: tuple = (), fuse: bool = True):
+        self.source = source
+        self.stages = tuple(stages)
+        self.fuse = fuse
+
+    def __or__(self, stage):
+        if isinstance(stage, Sink):
+            return stage.consume(iter(self))
+        if not isinstance(stage, Stage):
+            raise TypeError(f"can only pipe into a Stage or Sink, not {type(stage).__name__}")
+        return Pipeline(self.source, self.stages + (stage,), self.fuse)
+
+    def _plan(self) -> list[tuple[str, object]]:
+        """[(description, iterator -> iterator)] after fusing neighbouring element-wise stages."""
+        plan, run = [], []
+        for stage in self.stages + (None,):
+            if self.fuse and stage is not None and stage.elementwise:
+                run.append(stage)
+                continue
+            if run:
+                label = "fused[" + ", ".join(type(s).__name__ for s in run) + "]" if len(run) > 1 else repr(run[0])
+                plan.append((label, _fuse(run)))
+                run = []
+            if stage is not None:
+                plan.append((repr(stage), stage.apply))
+        return plan
+
+    def __iter__(self):
+        iterator = iter(self.source)
+        for _, step in self._plan():
+            iterator = step(iterator)
+        return iterator
+
+    def explain(self) -> str:
+        return " -> ".join(["source"] + [label for label, _ in self._plan()])
+
+    # Method-chaining spelling of the same stages: Source(x).map(f).filter(g).run(list)
+    def map(self, func) -> "Pipeline":
+        return self | Map(func)
+
+    def filter(self, predicate) -> "Pipeline":
+        return self | Filter(predicate)
+
+    def batch(self, size: int) -> "Pipeline":
+        return self | Batch(size)
+
+    def window(self, size: int, step: int = 1) -> "Pipeline":
+        return self | Window(size, step)
+
+    def dedupe(self, key=None, max_keys: int | None = None) -> "Pipeline":
+        return self | Dedupe(key, max_keys)
+
+    def take(self, n: int) -> "Pipeline":
+        return self | Take(n)
+
+    def run(self, consume=list):
+        return self | Sink(consume)
+
+    def tee(self, n: int = 2, max_buffer: int = 10_000) -> "Tee":
+        """Split into n pipelines that share this one's output: `a, b = pipe.tee(2)` (see Tee)."""
+        return Tee(self, n, max_buffer, self.fuse)
+
+
+def Source(iterable, fuse: bool = True) -> Pipeline:
+    """Start a pipeline: Source(range(10)) | Map(str) | Sink(list)."""
+    return Pipeline(iterable, fuse=fuse)
+
+
+# --------------------------------------------------
+# Tee with a bounded buffer
+# --------------------------------------------------
+class BufferOverflow(BufferError):
+    """One tee branch got more than max_buffer items ahead of another."""
+
+
+class Tee:
+    """
+    Like itertools.tee, but the shared buffer is capped at `max_buffer` items.
+    itertools.tee silently keeps everything one branch has read and another has
+    not: consume one branch fully before the other and the whole stream ends up
+    in memory. Here that raises BufferOverflow instead, and the buffer's peak
+    size is reported in peak_items / peak_bytes.
+
+        shared = tee(rows, 2); totals, counts = shared   # Unpacks into Pipelines
+        ...; print(shared.peak_items, shared.peak_bytes)
+    """
+
+    def __init__(self, iterable, n: int = 2, max_buffer: int = 10_000, fuse: bool = True):
+        self._iterator = iter(iterable)
+        self._buffer: deque = deque()
+        self._sizes: deque = deque()
+        self._base = 0  # Stream position of _buffer[0]
+        self._positions = [0] * n
+        self.max_buffer = max_buffer
+        self.peak_items = 0
+        self.peak_bytes = 0
+        self._bytes = 0
+        self.branches = [Pipeline(self._branch(i), fuse=fuse) for i in range(n)]
+
+    def __iter__(self):
+        return iter(self.branches)
+
+    def __len__(self) -> int:
+        return len(self.branches)
+
+    def _branch(self, index: int):
+        try:
+            while True:
+                position = self._positions[index]
+                offset = position - self._base
+                if offset < len(self._buffer):
+                    item = self._buffer[offset]
+                else:
+                    if len(self._buffer) >= self.max_buffer:
+                        raise BufferOverflow(
+                            f"tee branch {index} is {len(self._buffer)} items ahead of the slowest branch "
+                            f"(max_buffer={self.max_buffer}); consume the branches in step"
+                        )
+                    try:
+                        item = next(self._iterator)
+                    except StopIteration:
+                        return
+                    size = sys.getsizeof(item)
+                    self._buffer.append(item)
+                    self._sizes.append(size)
+                    self._bytes += size
+                    self.peak_items = max(self.peak_items, len(self._buffer))
+                    self.peak_bytes = max(self.peak_bytes, self._bytes)
+                self._positions[index] = position + 1
+                self._trim()
+                yield item
+        finally:
+            self._positions[index] = float("inf")  # A finished/closed branch holds nothing back
+            self._trim()
+
+    def _trim(self) -> None:
+        slowest = min(self._positions)
+        while self._buffer and self._base < slowest:
+            self._buffer.popleft()
+            self._bytes -= self._sizes.popleft()
+            self._base += 1
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+
+def tee(pipeline, n: int = 2, max_buffer: int = 10_000) -> Tee:
+    """tee(Source(rows) | Map(parse), 2) -> two pipelines reading the same parsed rows."""
+    pipeline = pipeline if isinstance(pipeline, Pipeline) else Source(pipeline)
+    return pipeline.tee(n, max_buffer)
+
+
+# Example of code that should only run when pipeline.py is executed directly
+if __name__ == "__main__":
+    readings = [3, 3, 5, 7, 7, 7, 2, 9, 9, 4, 6, 1]
+
+    pipe = Source(readings) | Dedupe() | Map(lambda x: x * 10) | Filter(lambda x: x > 20) | Map(float) | Window(3)
+    print(pipe.explain())
+    print(pipe | Sink(list))
+
+    total = Source(range(1_000_000)) | Map(lambda x: x * 3) | Filter(lambda x: x % 2) | Batch(1000) | Sink(
+        lambda batches: sum(sum(b) for b in batches))
+    print(f"Sum of odd multiples of 3 below 3,000,000: {total:,}")
+
+    shared = tee(range(10), 2, max_buffer=4)
+    evens, odds = shared
+    print(list(zip(evens | Filter(lambda x: x % 2 == 0), odds | Filter(lambda x: x % 2))))
+    print(f"tee buffer peak: {shared.peak_items} items, {shared.peak_bytes} bytes")
+    squares, cubes = Source(range(100)).tee(2, max_buffer=10)
+    try:
+        squares.run(list)  # Reads everything before `cubes` reads anything
+    except BufferOverflow as error:
+        print(f"BufferOverflow: {error}")
@@ -0,0 +1,118 @@
+# bench_fetch.py: Requests per second and tail latency of three ways to call a slow API
+#   sequential   one http.client keep-alive connection, one request after another
+#   threads      ThreadPoolExecutor, one keep-alive connection per thread
+#   asyncio      fetch_pipeline.Fetcher: one thread, many connections in flight
+# The stand-in server (stand_in_server.py) runs in its own process so it does
+# not compete with the client for the GIL. Its /stats page reports how many TCP
+# connections each client opened.
+# Usage: python bench_fetch.py [--requests 2000] [--concurrency 50] [--latency 0.05]
+
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fetch_pipeline import Fetcher
+
+
+SERVER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stand_in_server.py")
+
+
+def start_server(args) -> tuple[subprocess.Popen, int]:
+    server = subprocess.Popen(
+        [sys.executable, SERVER_SCRIPT, "--port", "0", "--latency", str(args.latency),
+         "--jitter", str(args.jitter), "--error-rate", str(args.error_rate), "--seed", "42"],
+        stdout=subprocess.PIPE, text=True,
+    )
+    line = server.stdout.readline()  # "listening on http://127.0.0.1:PORT"
+    return server, int(line.rsplit(":", 1)[1])
+
+
+def server_stats(port: int) -> dict:
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", "/stats")
+    stats = json.loads(connection.getresponse().read())
+    connection.close()
+    return stats
+
+
+def timed_get(connection: http.client.HTTPConnection, path: str) -> tuple[float, int]:
+    start = time.perf_counter()
+    connection.request("GET", path)
+    response = connection.getresponse()
+    response.read()
+    return time.perf_counter() - start, response.status
+
+
+def run_sequential(port: int, paths: list[str], _concurrency: int) -> list[tuple[float, int]]:
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    results = [timed_get(connection, path) for path in paths]
+    connection.close()
+    return results
+
+
+def run_threads(port: int, paths: list[str], concurrency: int) -> list[tuple[float, int]]:
+    local = threading.local()
+
+    def get(path):
+        if not hasattr(local, "connection"):
+            local.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        return timed_get(local.connection, path)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(get, paths))
+
+
+def run_asyncio(port: int, paths: list[str], concurrency: int) -> list[tuple[float, int]]:
+    async def main():
+        urls = (f"http://127.0.0.1:{port}{path}" for path in paths)
+        async with Fetcher(concurrency=concurrency, timeout=10, retries=0) as fetcher:
+            return [(result.latency, result.status) async for result in fetcher.stream(urls)]
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--sequential-requests", type=int, default=100,
+                        help="sequential calls are slow: measure fewer and compare the rate")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server, port = start_server(args)
+    try:
+        print(f"server latency {args.latency * 1000:.0f} ms (+0..{args.jitter * 1000:.0f} ms), "
+              f"concurrency {args.concurrency}")
+        print(f"{'client':<12}{'requests':>10}{'seconds':>9}{'req/s':>9}{'p50 ms':>9}{'p99 ms':>9}{'non-200':>9}{'TCP conns':>11}")
+        for name, run, count in (("sequential", run_sequential, args.sequential_requests),
+                                 ("threads", run_threads, args.requests),
+                                 ("asyncio", run_asyncio, args.requests)):
+            paths = [f"/item/{i}" for i in range(count)]
+            before = server_stats(port)["connections"]
+            start = time.perf_counter()
+            results = run(port, paths, args.concurrency)
+            elapsed = time.perf_counter() - start
+            opened = server_stats(port)["connections"] - before - 1  # Minus the /stats call itself
+            latencies = sorted(latency * 1000 for latency, _ in results)
+            p99 = statistics.quantiles(latencies, n=100)[98] if len(latencies) > 1 else latencies[0]
+            errors = sum(status != 200 for _, status in results)
+            print(f"{name:<12}{len(results):>10,}{elapsed:>9.2f}{len(results) / elapsed:>9.0f}"
+                  f"{statistics.median(latencies):>9.1f}{p99:>9.1f}{errors:>9}{opened:>11}")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# bench_hybrid.py: How responsive does the event loop stay while CPU work is going on?
+# A mixed workload runs three ways:
+#   inline       CPU functions are called directly inside coroutines (blocks the loop)
+#   offload      every CPU call goes to the process pool on its own (cpu=True, no batching)
+#   hybrid       HybridScheduler decides: inline / batched / single offload
+# Meanwhile `--clients` I/O coroutines repeatedly await a 5 ms "network call".
+# Reported: wall time, loop lag (p99 / max) and the p99 latency of those I/O calls.
+# Usage: python bench_hybrid.py [--heavy 20] [--small 2000] [--clients 50]
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from hybrid_scheduler import HybridScheduler, LoopLagMonitor
+
+
+def count_primes(limit: int) -> int:
+    return sum(all(n % d for d in range(2, int(n ** 0.5) + 1)) for n in range(2, limit))
+
+
+# The scheduler learns a cost per function, so each kind of job has its own
+def build_report(limit: int) -> int:
+    return count_primes(limit)
+
+
+def score_item(limit: int) -> int:
+    return count_primes(limit)
+
+
+async def io_client(latencies: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.005)  # Stands in for a 5 ms database / network call
+        latencies.append(time.perf_counter() - start)
+
+
+async def cpu_jobs(call, heavy: int, heavy_limit: int, small: int, small_limit: int) -> None:
+    """Heavy and small jobs arrive spread out over time, like requests to a service."""
+    jobs = []
+    every = max(1, (heavy + small) // max(heavy, 1))
+    for i in range(heavy + small):
+        if heavy and i % every == 0:
+            jobs.append(asyncio.ensure_future(call(build_report, heavy_limit)))
+        else:
+            jobs.append(asyncio.ensure_future(call(score_item, small_limit)))
+        if i % 50 == 0:
+            await asyncio.sleep(0.001)
+    await asyncio.gather(*jobs)
+
+
+async def run_mode(mode: str, args) -> dict:
+    latencies: list[float] = []
+    stop = asyncio.Event()
+    scheduler = None
+    if mode == "inline":
+        async def call(func, limit):
+            return func(limit)
+    else:
+        scheduler = HybridScheduler(workers=args.workers, monitor_interval=None,
+                                    batch_below=0 if mode == "offload" else 0.005)
+        await scheduler.start()
+        cpu = True if mode == "offload" else None
+
+        async def call(func, limit):
+            return await scheduler.run(func, limit, cpu=cpu)
+
+    async with LoopLagMonitor(0.005) as monitor:
+        clients = [asyncio.create_task(io_client(latencies, stop)) for _ in range(args.clients)]
+        start = time.perf_counter()
+        await cpu_jobs(call, args.heavy, args.heavy_limit, args.small, args.small_limit)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await asyncio.gather(*clients)
+        lag = monitor.snapshot()
+    stats = scheduler.stats() if scheduler else {}
+    if scheduler:
+        await scheduler.close()
+    io_p99 = statistics.quantiles(latencies, n=100, method="inclusive")[98] * 1000 if len(latencies) > 1 else 0.0
+    return {"seconds": elapsed, "lag_p99": lag.p99_ms, "lag_max": lag.max_ms, "io_p99": io_p99,
+            "io_calls": len(latencies), "stats": stats}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--heavy", type=int, default=20, help="heavy CPU jobs (tens of ms each)")
+    parser.add_argument("--heavy-limit", type=int, default=20_000)
+    parser.add_argument("--small", type=int, default=2000, help="small CPU jobs (about 1 ms each)")
+    parser.add_argument("--small-limit", type=int, default=1_000)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"{args.heavy} heavy + {args.small} small CPU jobs, {args.clients} I/O clients awaiting 5 ms calls")
+    print(f"{'mode':<10}{'seconds':>9}{'lag p99 ms':>12}{'lag max ms':>12}{'I/O p99 ms':>12}{'I/O calls':>11}   placement")
+    for mode in ("inline", "offload", "hybrid"):
+        result = asyncio.run(run_mode(mode, args))
+        stats = result["stats"]
+        placement = (f"inline={stats['inline']} single={stats['offloaded']} batched={stats['batched']} "
+                     f"in {stats['batches']} batches" if stats else "all on the loop")
+        print(f"{mode:<10}{result['seconds']:>9.2f}{result['lag_p99']:>12.1f}{result['lag_max']:>12.1f}"
+              f"{result['io_p99']:>12.1f}{result['io_calls']:>11,}   {placement}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+# fetch_pipeline.py: Fetch thousands of URLs concurrently with asyncio, safely
+# asyncio.gather(*(fetch(url) for url in urls)) starts EVERY request at once:
+# thousands of sockets, no limit on memory, one slow server stalls nothing but
+# also nothing protects it. Fetcher.stream() instead:
+#   - runs at most `concurrency` requests at a time (an asyncio.Semaphore),
+#   - reads URLs from a bounded queue, so a huge (or endless) URL source is
+#     consumed only as fast as requests finish (backpressure),
+#   - reuses keep-alive connections from a pool per host,
+#   - gives every attempt a timeout and retries failures with backoff,
+#   - yields each Result as soon as it is ready (completion order).
+#
+#   async with Fetcher(concurrency=50, timeout=2, retries=2) as fetcher:
+#       async for result in fetcher.stream(urls):
+#           print(result.url, result.status, result.latency)
+#
+# Plain HTTP/1.1 (and HTTPS) with the standard library only: GET requests,
+# Content-Length and chunked bodies.
+
+import asyncio
+import random
+import ssl as ssl_module
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+_DONE = object()
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def _put_done(queue: asyncio.Queue) -> None:
+    """End-of-stream marker that never blocks: if the queue is full, its reader stopped reading."""
+    try:
+        queue.put_nowait(_DONE)
+    except asyncio.QueueFull:
+        pass
+
+
+class ProtocolError(Exception):
+    """The server's answer was not valid HTTP."""
+
+
+@dataclass
+class Response:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+@dataclass
+class Result:
+    url: str
+    response: Response | None   # The last response received (None if none arrived)
+    error: Exception | None     # Why the last attempt failed, if it did
+    attempts: int
+    latency: float              # Seconds from the first attempt to the final outcome
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response is not None and 200 <= self.response.status < 400
+
+    @property
+    def status(self) -> int | None:
+        return self.response.status if self.response else None
+
+
+class ConnectionPool:
+    """Keep-alive connections to ONE host:port, at most `size` open at a time."""
+
+    def __init__(self, host: str, port: int, size: int = 10, ssl: ssl_module.SSLContext | None = None):
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self._idle: list[tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(size)
+        self.opened = 0   # New TCP connections
+        self.reused = 0   # Requests that used an idle connection instead
+
+    async def acquire(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        await self._slots.acquire()
+        try:
+            while self._idle:
+                reader, writer = self._idle.pop()
+                if not writer.is_closing() and not reader.at_eof():
+                    self.reused += 1
+                    return reader, writer
+                writer.close()  # The server closed it while it was idle
+            connection = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+            self.opened += 1
+            return connection
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+        self._slots.release()
+
+    async def close(self) -> None:
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+async def _read_response(reader: asyncio.StreamReader) -> tuple[Response, bool]:
+    """Read one HTTP response; returns (response, connection can be reused)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ProtocolError("connection closed before a response arrived")
+    parts = status_line.decode("latin-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+        raise ProtocolError(f"bad status line {status_line!r}")
+    version, status = parts[0], int(parts[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        pieces = []
+        while size := int((await reader.readline()).split(b";")[0], 16):
+            pieces.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # CRLF after each chunk
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass  # Trailer headers
+        body, delimited = b"".join(pieces), True
+    elif "content-length" in headers:
+        body, delimited = await reader.readexactly(int(headers["content-length"])), True
+    else:
+        body, delimited = await reader.read(), False  # Body ends when the server closes
+    keep_alive = (delimited and version == "HTTP/1.1"
+                  and headers.get("connection", "").lower() != "close")
+    return Response(status, headers, body), keep_alive
+
+
+def _split_url(url: str):
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError(f"not an http(s) URL: {url!r}")
+    return parts
+
+
+class Fetcher:
+    """
+    Concurrent HTTP GET client. Use as `async with Fetcher(...) as fetcher:`.
+
+    - concurrency: requests in flight at once, across all hosts
+    - per_host: open connections per host (default: concurrency)
+    - timeout: seconds per attempt, including waiting for a connection
+    - retries: extra attempts after a network error, timeout or 429/5xx answer
+    - backoff: base delay; attempt n waits random(0, backoff * 2**n) seconds
+    """
+
+    def __init__(self, concurrency: int = 50, per_host: int | None = None, timeout: float = 10.0,
+                 retries: int = 2, backoff: float = 0.1, headers: dict[str, str] | None = None):
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        self.concurrency = concurrency
+        self.per_host = per_host or concurrency
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.headers = {"User-Agent": "fetch_pipeline", "Accept": "*/*", **(headers or {})}
+        self._limit = asyncio.Semaphore(concurrency)
+        self._pools: dict[tuple[str, str, int], ConnectionPool] = {}
+
+    def _pool(self, scheme: str, host: str, port: int) -> ConnectionPool:
+        key = (scheme, host, port)
+        if key not in self._pools:
+            context = ssl_module.create_default_context() if scheme == "https" else None
+            self._pools[key] = ConnectionPool(host, port, self.per_host, context)
+        return self._pools[key]
+
+    @property
+    def connections_opened(self) -> int:
+        return sum(pool.opened for pool in self._pools.values())
+
+    @property
+    def connections_reused(self) -> int:
+        return sum(pool.reused for pool in self._pools.values())
+
+    async def get(self, url: str) -> Response:
+        """One attempt: GET url, with the timeout applied. Raises on failure."""
+        parts = _split_url(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        pool = self._pool(parts.scheme, parts.hostname, port)
+        target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        head = f"GET {target} HTTP/1.1\r\nHost: {parts.netloc}\r\n"
+        head += "".join(f"{name}: {value}\r\n" for name, value in self.headers.items()) + "\r\n"
+
+        async with asyncio.timeout(self.timeout):
+            connection = await pool.acquire()
+            reusable = False
+            try:
+                reader, writer = connection
+                writer.write(head.encode("latin-1"))
+                await writer.drain()
+                response, reusable = await _read_response(reader)
+                return response
+            finally:
+                pool.release(connection, reusable)
+
+    async def fetch(self, url: str) -> Result:
+        """GET url with retries. Never raises for network/HTTP problems: check result.ok."""
+        start = time.perf_counter()
+        try:
+            _split_url(url)
+        except ValueError as exc:
+            return Result(url, None, exc, 0, 0.0)  # A bad URL will not get better by trying again
+        response = error = None
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response, error = await self.get(url), None
+                if response.status not in RETRY_STATUSES:
+                    break
+            except (OSError, TimeoutError, ProtocolError, asyncio.IncompleteReadError, ValueError) as exc:
+                response, error = None, exc
+            if attempt > self.retries:
+                break
+            await asyncio.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+        return Result(url, response, error, attempt, time.perf_counter() - start)
+
+    async def stream(self, urls: Iterable[str] | AsyncIterable[str], queue_size: int | None = None) -> AsyncIterator[Result]:
+        """
+        Fetch every URL and yield the Results as they complete.
+
+        URLs are pulled from `urls` only as fast as requests finish, and
+        finished Results wait in a bounded queue until you consume them, so
+        memory stays bounded however many URLs there are.
+        """
+        queue_size = queue_size or 2 * self.concurrency
+        todo: asyncio.Queue = asyncio.Queue(queue_size)
+        done: asyncio.Queue = asyncio.Queue(queue_size)
+
+        async def produce():
+            cancelled = False
+            try:
+                if isinstance(urls, AsyncIterable):
+                    async for url in urls:
+                        await todo.put(url)
+                else:
+                    for url in urls:
+                        await todo.put(url)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                if cancelled:  # The consumer stopped: nobody may read `todo` any more
+                    _put_done(todo)
+                else:
+                    await todo.put(_DONE)
+
+        async def run_one(url):
+            try:
+                await done.put(await self.fetch(url))  # Waits here if the consumer falls behind
+            finally:
+                self._limit.release()
+
+        async def dispatch():
+            running = set()
+            cancelled = False
+            try:
+                while (url := await todo.get()) is not _DONE:
+                    await self._limit.acquire()  # At most `concurrency` requests at a time
+                    task = asyncio.create_task(run_one(url))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+                if running:
+                    await asyncio.wait(running)
+            except asyncio.CancelledError:
+                cancelled = True
+                raise
+            finally:
+                for task in list(running):
+                    task.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                if cancelled:  # The consumer stopped (break / aclose()): `done` may stay full
+                    _put_done(done)
+                else:
+                    await done.put(_DONE)
+
+        producer = asyncio.create_task(produce())
+        dispatcher = asyncio.create_task(dispatch())
+        try:
+            while (result := await done.get()) is not _DONE:
+                yield result
+            await producer  # Re-raises an error from iterating `urls`
+        finally:
+            producer.cancel()
+            dispatcher.cancel()
+            await asyncio.gather(producer, dispatcher, return_exceptions=True)
+
+    async def close(self) -> None:
+        for pool in self._pools.values():
+            await pool.close()
+        self._pools.clear()
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+
+async def fetch_all(urls: Iterable[str] | AsyncIterable[str], **options) -> AsyncIterator[Result]:
+    """Shortcut: `async for result in fetch_all(urls, concurrency=20): ...`."""
+    async with Fetcher(**options) as fetcher:
+        async for result in fetcher.stream(urls):
+            yield result
+
+
+# Example of code that should only run when fetch_pipeline.py is executed directly
+if __name__ == "__main__":
+    from stand_in_server import serve
+
+    async def demo():
+        server, stats = await serve(latency=0.05, jitter=0.02, error_rate=0.05, seed=1)
+        port = server.sockets[0].getsockname()[1]
+        urls = (f"http://127.0.0.1:{port}/item/{i}" for i in range(200))
+        start = time.perf_counter()
+        async with Fetcher(concurrency=20, timeout=1, retries=3) as fetcher:
+            results = [result async for result in fetcher.stream(urls)]
+            opened = fetcher.connections_opened
+        elapsed = time.perf_counter() - start
+        server.close()
+        await server.wait_closed()
+        ok = sum(result.ok for result in results)
+        retried = sum(result.attempts > 1 for result in results)
+        print(f"{len(results)} requests in {elapsed:.2f} s ({len(results) / elapsed:.0f} req/s)")
+        print(f"{ok} ok, {retried} needed a retry, {opened} TCP connections for {stats.requests} HTTP requests")
+
+    asyncio.run(demo())
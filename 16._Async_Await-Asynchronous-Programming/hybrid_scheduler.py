@@ -0,0 +1,307 @@
+# hybrid_scheduler.py: Keep the event loop responsive when async code also needs CPU work
+# asyncio runs everything on ONE thread. A coroutine that computes for 200 ms
+# freezes every other coroutine for 200 ms: timeouts fire late, heartbeats
+# are missed, and the latency of every request goes up.
+# HybridScheduler decides where each call runs:
+#   - cheap calls run directly on the loop (sending them to a process costs more),
+#   - expensive calls go to a warm ProcessPoolExecutor via loop.run_in_executor,
+#   - many small calls to the same function are sent as ONE batch, so the
+#     pickling and inter-process round trip is paid once per batch.
+# It learns how long each function takes (measured where it runs), or you can
+# tell it: @cpu_bound, or run(..., cpu=True / cpu=False).
+# LoopLagMonitor measures how late the loop wakes up: the number to watch.
+#
+#   async with HybridScheduler() as scheduler:
+#       digest = await scheduler.run(hash_file_contents, data)
+#       print(scheduler.stats())
+#
+# Functions sent to processes must be picklable: defined at module level.
+
+import asyncio
+import inspect
+import os
+import statistics
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+LagStats = namedtuple("LagStats", "samples mean_ms p99_ms max_ms")
+
+
+def cpu_bound(func):
+    """Mark a function as CPU-heavy: HybridScheduler always runs it in a worker process."""
+    func.__cpu_bound__ = True
+    return func
+
+
+class LoopLagMonitor:
+    """
+    Sleeps `interval` seconds in a loop and records how much later than asked
+    it woke up. On an idle loop the lag is ~0; while a coroutine hogs the CPU,
+    the lag equals how long it held the loop.
+    """
+
+    def __init__(self, interval: float = 0.01, history: int = 10_000):
+        self.interval = interval
+        self.samples: deque[float] = deque(maxlen=history)  # Fixed memory: only recent samples
+        self._task: asyncio.Task | None = None
+
+    async def _watch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(loop.time() - start - self.interval, 0.0))
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._watch())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def reset(self) -> None:
+        self.samples.clear()
+
+    def snapshot(self) -> LagStats:
+        samples = list(self.samples)
+        if not samples:
+            return LagStats(0, 0.0, 0.0, 0.0)
+        p99 = statistics.quantiles(samples, n=100, method="inclusive")[98] if len(samples) > 1 else samples[0]
+        return LagStats(len(samples), statistics.fmean(samples) * 1000, p99 * 1000, max(samples) * 1000)
+
+    async def __aenter__(self) -> "LoopLagMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+
+# --------------------------------------------------
+# Code that runs inside the worker processes
+# --------------------------------------------------
+def _warm_up(delay: float) -> int:
+    time.sleep(delay)  # Keeps this worker busy so the pool has to start the others too
+    return os.getpid()
+
+
+def _run_timed(func, args: tuple, kwargs: dict) -> tuple:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def _run_batch(func, calls: list[tuple[tuple, dict]]) -> tuple[list, float]:
+    """Run many calls in one go; each outcome is (True, result) or (False, exception)."""
+    start = time.perf_counter()
+    outcomes = []
+    for args, kwargs in calls:
+        try:
+            outcomes.append((True, func(*args, **kwargs)))
+        except Exception as error:
+            outcomes.append((False, error))
+    return outcomes, time.perf_counter() - start
+
+
+class _Batch:
+    __slots__ = ("calls", "futures", "timer")
+
+    def __init__(self, timer: asyncio.TimerHandle):
+        self.calls: list[tuple[tuple, dict]] = []
+        self.futures: list[asyncio.Future] = []
+        self.timer = timer
+
+
+class HybridScheduler:
+    """
+    Run sync functions from async code without blocking the event loop.
+
+    - workers: processes in the pool (default: os.cpu_count())
+    - inline_below: calls known to take less than this many seconds run on the loop
+    - batch_below: offloaded calls cheaper than this are batched
+    - batch_target: aim for batches with about this many seconds of work
+    - batch_window: wait at most this long for a batch to fill up
+    - monitor_interval: loop lag sampling period (None = no monitor)
+    """
+
+    def __init__(self, workers: int | None = None, inline_below: float = 0.0005, batch_below: float = 0.005,
+                 batch_target: float = 0.02, batch_window: float = 0.002, max_batch: int = 1000,
+                 monitor_interval: float | None = 0.01):
+        self.workers = workers or os.cpu_count() or 1
+        self.inline_below = inline_below
+        self.batch_below = batch_below
+        self.batch_target = batch_target
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.monitor = LoopLagMonitor(monitor_interval) if monitor_interval else None
+        self._pool: ProcessPoolExecutor | None = None
+        self._costs: dict = {}  # func -> average seconds per call
+        self._probes: dict = {}  # func -> first call still measuring its cost
+        self._batches: dict = {}  # func -> _Batch being filled
+        self._counts = {"inline": 0, "offloaded": 0, "batched": 0, "batches": 0}
+
+    # ---------- lifecycle ----------
+    async def start(self) -> None:
+        """Create the pool and start all worker processes now, not on the first request."""
+        if self._pool is not None:
+            return
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._pool, _warm_up, 0.05) for _ in range(self.workers)))
+        if self.monitor:
+            self.monitor.start()
+
+    async def close(self) -> None:
+        for func in list(self._batches):
+            self._flush(func)
+        if self.monitor:
+            await self.monitor.stop()
+        if self._pool is not None:
+            pool, self._pool = self._pool, None
+            await asyncio.get_running_loop().run_in_executor(None, partial(pool.shutdown, wait=True))
+
+    async def __aenter__(self) -> "HybridScheduler":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    # ---------- cost model ----------
+    def _record(self, func, seconds_per_call: float) -> None:
+        previous = self._costs.get(func)
+        # Moving average: follows the function if its inputs get bigger or smaller
+        self._costs[func] = seconds_per_call if previous is None else 0.8 * previous + 0.2 * seconds_per_call
+
+    def estimated_cost(self, func) -> float | None:
+        return self._costs.get(func)
+
+    def placement(self, func, cpu: bool | None = None) -> str:
+        """Where the next call to func would run: "inline", "batch" or "process"."""
+        if cpu is None and getattr(func, "__cpu_bound__", False):
+            cpu = True
+        cost = self._costs.get(func)
+        if cpu is False:
+            return "inline"
+        if cost is None:
+            return "process"  # Unknown: measure it once in a worker rather than risk blocking the loop
+        if cpu is None and cost < self.inline_below:
+            return "inline"
+        return "batch" if cost < self.batch_below else "process"
+
+    # ---------- running calls ----------
+    async def run(self, func, *args, cpu: bool | None = None, **kwargs):
+        """
+        Call func(*args, **kwargs) and return its result. Coroutine functions are
+        simply awaited. cpu=True forces a worker process, cpu=False the event loop.
+        """
+        if inspect.iscoroutinefunction(func):
+            return await func(*args, **kwargs)
+        if self._pool is None:
+            await self.start()
+        while func in self._probes and cpu is not False:
+            # Another call is measuring this function: wait for the result instead of
+            # guessing, so 1000 concurrent calls of a cheap function do not all go to processes
+            await asyncio.wait([self._probes[func]])
+        where = self.placement(func, cpu)
+        if where == "inline":
+            self._counts["inline"] += 1
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self._record(func, time.perf_counter() - start)
+            return result
+        if where == "batch":
+            self._counts["batched"] += 1
+            return await self._enqueue(func, args, kwargs)
+        self._counts["offloaded"] += 1
+        loop = asyncio.get_running_loop()
+        work = loop.run_in_executor(self._pool, _run_timed, func, args, kwargs)
+        if func not in self._costs:
+            self._probes[func] = work
+            work.add_done_callback(lambda _: self._probes.pop(func, None))
+        result, seconds = await work
+        self._record(func, seconds)
+        return result
+
+    async def map(self, func, *iterables, cpu: bool | None = None) -> list:
+        """[func(*args) for args in zip(*iterables)], run concurrently through run()."""
+        return await asyncio.gather(*(self.run(func, *args, cpu=cpu) for args in zip(*iterables)))
+
+    def _enqueue(self, func, args: tuple, kwargs: dict) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        batch = self._batches.get(func)
+        if batch is None:
+            batch = self._batches[func] = _Batch(loop.call_later(self.batch_window, self._flush, func))
+        future = loop.create_future()
+        batch.calls.append((args, kwargs))
+        batch.futures.append(future)
+        cost = self._costs.get(func) or self.batch_below
+        if len(batch.calls) >= min(self.max_batch, max(1, int(self.batch_target / max(cost, 1e-9)))):
+            self._flush(func)
+        return future
+
+    def _flush(self, func) -> None:
+        batch = self._batches.pop(func, None)
+        if batch is None:
+            return
+        batch.timer.cancel()
+        self._counts["batches"] += 1
+        work = asyncio.get_running_loop().run_in_executor(self._pool, _run_batch, func, batch.calls)
+        work.add_done_callback(partial(self._deliver, func, batch.futures))
+
+    def _deliver(self, func, futures: list[asyncio.Future], work: asyncio.Future) -> None:
+        if work.cancelled() or work.exception() is not None:
+            error = asyncio.CancelledError() if work.cancelled() else work.exception()
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)  # e.g. the function could not be pickled
+            return
+        outcomes, seconds = work.result()
+        self._record(func, seconds / len(outcomes))
+        for future, (ok, value) in zip(futures, outcomes):
+            if future.done():
+                continue  # The caller gave up (cancelled) meanwhile
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def stats(self) -> dict:
+        info = dict(self._counts)
+        info["costs_ms"] = {getattr(f, "__qualname__", repr(f)): round(c * 1000, 3) for f, c in self._costs.items()}
+        if self.monitor:
+            info["loop_lag"] = self.monitor.snapshot()
+        return info
+
+
+# Example of code that should only run when hybrid_scheduler.py is executed directly
+def count_primes(limit: int) -> int:
+    """Deliberately slow pure-Python CPU work."""
+    return sum(all(n % d for d in range(2, int(n ** 0.5) + 1)) for n in range(2, limit))
+
+
+def square(x: int) -> int:
+    return x * x
+
+
+if __name__ == "__main__":
+    async def demo():
+        async with HybridScheduler() as scheduler:
+            # Unknown cost -> processes. Tasks start now; bare coroutines would only run in gather()
+            heavy = [asyncio.create_task(scheduler.run(count_primes, 60_000)) for _ in range(4)]
+            await asyncio.sleep(0.2)
+            print(f"Loop lag while 4 heavy jobs run in processes: {scheduler.monitor.snapshot()}")
+            print(f"Primes below 60,000: {(await asyncio.gather(*heavy))[0]}")
+            squares = await scheduler.map(square, range(1000))               # Learned: cheap -> inline
+            print(f"Sum of 1000 squares: {sum(squares)}")
+            print(scheduler.stats())
+
+    asyncio.run(demo())
@@ -0,0 +1,105 @@
+# stand_in_server.py: A tiny local HTTP server with adjustable slowness, for trying out clients
+# Every request waits `latency` seconds (+ random jitter) before answering, so
+# it behaves like a remote API without needing the internet. Some requests can
+# be made extra slow or fail with 503 to exercise timeouts and retries.
+#   GET /anything   -> 200 {"path": "/anything", "request": 17}
+#   GET /stats      -> 200 {"connections": 3, "requests": 120}  (answered immediately)
+# Usage: python stand_in_server.py [--port 8080] [--latency 0.05] [--jitter 0.02]
+#                                  [--error-rate 0.01] [--slow-rate 0.01]
+
+import argparse
+import asyncio
+import json
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class ServerStats:
+    connections: int = 0
+    requests: int = 0
+
+
+async def serve(host: str = "127.0.0.1", port: int = 0, latency: float = 0.05, jitter: float = 0.0,
+                error_rate: float = 0.0, slow_rate: float = 0.0, seed: int | None = None):
+    """
+    Start the server and return (asyncio.Server, ServerStats). port=0 picks a free port:
+    read it back with server.sockets[0].getsockname()[1].
+    """
+    stats = ServerStats()
+    rng = random.Random(seed)
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        stats.connections += 1
+        try:
+            while True:  # Keep-alive: serve requests on this connection until the client leaves
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if "content-length" in headers:
+                    await reader.readexactly(int(headers["content-length"]))
+                path = request_line.split()[1].decode() if len(request_line.split()) > 1 else "/"
+                stats.requests += 1
+
+                if path == "/stats":
+                    status, payload = 200, {"connections": stats.connections, "requests": stats.requests}
+                else:
+                    delay = latency + rng.uniform(0, jitter)
+                    if rng.random() < slow_rate:
+                        delay *= 20  # A straggler: the reason clients need timeouts
+                    await asyncio.sleep(delay)
+                    if rng.random() < error_rate:
+                        status, payload = 503, {"error": "try again"}
+                    else:
+                        status, payload = 200, {"path": path, "request": stats.requests}
+
+                body = json.dumps(payload).encode()
+                close = headers.get("connection", "").lower() == "close"
+                reason = "OK" if status == 200 else "Service Unavailable"
+                writer.write(
+                    f"HTTP/1.1 {status} {reason}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client went away mid-request
+        except asyncio.CancelledError:
+            pass  # Server shutting down with requests in flight: just drop the connection
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, host, port, backlog=1024)
+    return server, stats
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080, help="0 = any free port")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random seconds, 0..jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 503 answers")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="fraction of requests 20x slower")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    server, _ = await serve(args.host, args.port, args.latency, args.jitter, args.error_rate, args.slow_rate, args.seed)
+    port = server.sockets[0].getsockname()[1]
+    print(f"listening on http://{args.host}:{port}", flush=True)  # bench_fetch.py reads this line
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,33 @@
+# test_fetch_pipeline.py: Fetcher.stream() must let the consumer stop early
+# Usage: python -m pytest test_fetch_pipeline.py   (or: python test_fetch_pipeline.py)
+
+import asyncio
+
+from fetch_pipeline import Fetcher
+from stand_in_server import serve
+
+
+async def _break_after_one() -> int:
+    server, _ = await serve(latency=0.01, seed=1)
+    port = server.sockets[0].getsockname()[1]
+    urls = [f"http://127.0.0.1:{port}/item/{i}" for i in range(100)]
+    try:
+        async with Fetcher(concurrency=10, timeout=1) as fetcher:
+            stream = fetcher.stream(urls, queue_size=2)
+            async for result in stream:
+                break
+            await stream.aclose()  # Was a hang: dispatch() blocked putting its end marker into a full queue
+            return fetcher._limit._value
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_stream_break_after_one_result():
+    free = asyncio.run(asyncio.wait_for(_break_after_one(), timeout=10))
+    assert free == 10  # Every in-flight request was cancelled and released its slot
+
+
+if __name__ == "__main__":
+    test_stream_break_after_one_result()
+    print("ok")
@@ -0,0 +1,184 @@
+# bench_binary_records.py: Records per second when unpacking a multi-GB binary feed
+# The feed is a memory-mapped file. Fixed-size records are trades "<qdI"
+# (timestamp, price, quantity: 20 bytes); variable-size records are messages
+# "<HI" (kind, length) followed by 0-120 payload bytes. Parsed four ways:
+#   slicing       slice every record, then every field, convert each slice (int.from_bytes / struct.unpack)
+#   unpack        struct.unpack(fmt, data[i:i + size]): one slice per record, format looked up per call
+#   unpack_from   precompiled Struct.unpack_from(data, offset): no slices, but a Python loop step per record
+#   zero-copy     binary_records.iter_fixed / iter_variable (iter_unpack, memoryview payloads)
+# Every variant adds up one field, so all of them really read every record.
+# Usage: python bench_binary_records.py [--gb 2] [--kind fixed variable] [--dir /tmp]
+
+import argparse
+import os
+import random
+import struct
+import time
+
+from binary_records import compile_format, iter_fixed, iter_variable, mapped
+
+TRADE = compile_format("<qdI")
+MESSAGE = compile_format("<HI")
+VARIANTS = ("slicing", "unpack", "unpack_from", "zero-copy")
+
+
+# --------------------------------------------------
+# Input files
+# --------------------------------------------------
+def make_block(kind: str, size: int, seed: int = 42) -> bytes:
+    """About `size` bytes of whole records; the big file repeats this block."""
+    rng = random.Random(seed)
+    parts, total = [], 0
+    while total < size:
+        if kind == "fixed":
+            part = TRADE.pack(1_700_000_000_000 + total, rng.uniform(1, 500), rng.randint(1, 1000))
+        else:
+            payload = rng.randbytes(rng.randint(0, 120))
+            part = MESSAGE.pack(rng.randint(1, 9), len(payload)) + payload
+        parts.append(part)
+        total += len(part)
+    return b"".join(parts)
+
+
+def make_file(path: str, kind: str, gb: float) -> None:
+    block = make_block(kind, 32 * 2**20)
+    repeats = max(1, round(gb * 2**30 / len(block)))
+    if os.path.exists(path) and os.path.getsize(path) == repeats * len(block):
+        return
+    with open(path, "wb") as f:
+        for _ in range(repeats):
+            f.write(block)
+
+
+def warm_page_cache(path: str) -> None:
+    buffer = bytearray(8 * 2**20)
+    with open(path, "rb", buffering=0) as f:
+        while f.readinto(buffer):
+            pass
+
+
+# --------------------------------------------------
+# Parsers: each returns (records, checksum)
+# --------------------------------------------------
+def fixed_slicing(data) -> tuple[int, int]:
+    total = count = 0
+    for i in range(0, len(data), 20):
+        record = data[i:i + 20]
+        timestamp = int.from_bytes(record[0:8], "little", signed=True)
+        price = struct.unpack("<d", record[8:16])[0]
+        quantity = int.from_bytes(record[16:20], "little")
+        total += quantity
+        count += 1
+    return count, total
+
+
+def fixed_unpack(data) -> tuple[int, int]:
+    total = count = 0
+    for i in range(0, len(data), 20):
+        timestamp, price, quantity = struct.unpack("<qdI", data[i:i + 20])
+        total += quantity
+        count += 1
+    return count, total
+
+
+def fixed_unpack_from(data) -> tuple[int, int]:
+    unpack_from = TRADE.unpack_from
+    total = count = 0
+    for i in range(0, len(data), 20):
+        timestamp, price, quantity = unpack_from(data, i)
+        total += quantity
+        count += 1
+    return count, total
+
+
+def fixed_zero_copy(data) -> tuple[int, int]:
+    total = count = 0
+    for timestamp, price, quantity in iter_fixed(data, TRADE):
+        total += quantity
+        count += 1
+    return count, total
+
+
+def variable_slicing(data) -> tuple[int, int]:
+    total = count = position = 0
+    end = len(data)
+    while position < end:
+        header = data[position:position + 6]
+        kind = int.from_bytes(header[0:2], "little")
+        length = int.from_bytes(header[2:6], "little")
+        payload = data[position + 6:position + 6 + length]
+        position += 6 + length
+        total += len(payload)
+        count += 1
+    return count, total
+
+
+def variable_unpack(data) -> tuple[int, int]:
+    total = count = position = 0
+    end = len(data)
+    while position < end:
+        kind, length = struct.unpack("<HI", data[position:position + 6])
+        payload = data[position + 6:position + 6 + length]
+        position += 6 + length
+        total += len(payload)
+        count += 1
+    return count, total
+
+
+def variable_unpack_from(data) -> tuple[int, int]:
+    unpack_from = MESSAGE.unpack_from
+    view = memoryview(data)
+    total = count = position = 0
+    end = len(data)
+    while position < end:
+        kind, length = unpack_from(data, position)
+        payload = view[position + 6:position + 6 + length]
+        position += 6 + length
+        total += len(payload)
+        count += 1
+    view.release()
+    return count, total
+
+
+def variable_zero_copy(data) -> tuple[int, int]:
+    total = count = 0
+    for (kind, length), payload in iter_variable(data, MESSAGE, length_index=1):
+        total += len(payload)
+        count += 1
+    return count, total
+
+
+PARSERS = {
+    "fixed": dict(zip(VARIANTS, (fixed_slicing, fixed_unpack, fixed_unpack_from, fixed_zero_copy))),
+    "variable": dict(zip(VARIANTS, (variable_slicing, variable_unpack, variable_unpack_from, variable_zero_copy))),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--gb", type=float, default=2.0, help="input size per record kind")
+    parser.add_argument("--kind", nargs="+", default=["fixed", "variable"], choices=list(PARSERS))
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    parser.add_argument("--dir", default=".", help="where to write the input files (reused between runs)")
+    args = parser.parse_args()
+
+    for kind in args.kind:
+        path = os.path.join(args.dir, f"bench_{kind}_{args.gb:g}gb.bin")
+        make_file(path, kind, args.gb)
+        warm_page_cache(path)
+        size = os.path.getsize(path)
+        print(f"\n{kind} records, {size / 2**30:.2f} GB memory-mapped")
+        print(f"{'variant':<13}{'seconds':>9}{'M records/s':>13}{'GB/s':>7}   checksum")
+        with mapped(path) as view:
+            for variant in args.variants:
+                # The naive versions slice the mmap object itself: that is what returns bytes copies
+                data = view.obj if variant in ("slicing", "unpack") else view
+                start = time.perf_counter()
+                records, checksum = PARSERS[kind][variant](data)
+                elapsed = time.perf_counter() - start
+                print(f"{variant:<13}{elapsed:>9.2f}{records / elapsed / 1e6:>13.2f}"
+                      f"{size / elapsed / 2**30:>7.2f}   {records:,} / {checksum:,}")
+
+
+if __name__ == "__main__":
+    main()
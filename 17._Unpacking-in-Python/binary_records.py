@@ -0,0 +1,222 @@
+# binary_records.py: Unpacking binary records without copying them first
+# The obvious way to parse a binary feed slices out every record, then every
+# field, and unpacks each slice:
+#
+#   for i in range(0, len(data), 20):
+#       record = data[i:i + 20]                               # new bytes object
+#       ts, price = struct.unpack("<qd", record[:16])         # another one, plus a format lookup
+#
+# Every slice is a copy. Here the work stays in C and nothing is copied:
+#   - formats are compiled ONCE into struct.Struct objects,
+#   - fixed-size records: Struct.iter_unpack walks the buffer and yields tuples,
+#   - variable-size records: Struct.unpack_from reads the header in place and
+#     the payload is handed out as a memoryview (a window, not a copy),
+#   - the buffer can be bytes, a bytearray, a memoryview, an mmap'ed file, or
+#     the reused receive buffer of a socket / stream (StreamRecords).
+#
+#   for ts, price, qty in iter_fixed(data, "<qdI"):          # Unpack straight into names
+#       ...
+#   for (kind, length), payload in iter_variable(data, "<HI", length_index=1):
+#       ...
+
+import mmap
+import struct
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def compile_format(fmt: str) -> struct.Struct:
+    """One Struct per format string, compiled once and shared."""
+    return struct.Struct(fmt)
+
+
+def _as_struct(fmt) -> struct.Struct:
+    return fmt if isinstance(fmt, struct.Struct) else compile_format(fmt)
+
+
+# --------------------------------------------------
+# Fixed-size records
+# --------------------------------------------------
+def iter_fixed(buffer, fmt, offset: int = 0, count: int | None = None,
+               record_type=None, strict: bool = True) -> Iterator[tuple]:
+    """
+    Yield every record of format `fmt` in buffer[offset:] as a tuple.
+    - count: stop after this many records.
+    - record_type: a namedtuple class to build instead of plain tuples.
+    - strict: raise ValueError if the data does not end on a record boundary
+      (strict=False ignores the trailing partial record).
+    """
+    layout = _as_struct(fmt)
+    view = memoryview(buffer).cast("B")  # Slicing a memoryview is free: no bytes are copied
+    if not 0 <= offset <= len(view):
+        raise ValueError(f"offset {offset} is outside the {len(view)}-byte buffer")
+    available = (len(view) - offset) // layout.size
+    if strict and count is None and (len(view) - offset) % layout.size:
+        raise ValueError(f"{len(view) - offset} bytes is not a whole number of {layout.size}-byte records")
+    records = available if count is None else min(count, available)
+    rows = layout.iter_unpack(view[offset:offset + records * layout.size])
+    return rows if record_type is None else map(record_type._make, rows)
+
+
+def read_record(buffer, fmt, index: int, offset: int = 0) -> tuple:
+    """Random access: record number `index`, unpacked in place."""
+    layout = _as_struct(fmt)
+    return layout.unpack_from(buffer, offset + index * layout.size)
+
+
+# --------------------------------------------------
+# Variable-size records
+# --------------------------------------------------
+def iter_variable(buffer, header, length_index: int = 0, offset: int = 0,
+                  length_includes_header: bool = False) -> Iterator[tuple[tuple, memoryview]]:
+    """
+    Records made of a fixed header followed by a payload whose length is one of
+    the header's fields (header[length_index]). Yields (header tuple, payload),
+    where payload is a memoryview into `buffer`: unpack fields from it with
+    unpack_from, or bytes(payload) / payload.tobytes() to keep a copy.
+    A record cut off by the end of the buffer raises ValueError.
+    """
+    layout = _as_struct(header)
+    view = memoryview(buffer).cast("B")
+    unpack_from, header_size, end = layout.unpack_from, layout.size, len(view)
+    adjust = header_size if length_includes_header else 0
+    position = offset
+    try:
+        while position < end:
+            fields = unpack_from(view, position)
+            start = position + header_size
+            position = start + fields[length_index] - adjust
+            if position > end or position < start:
+                raise ValueError(f"record at byte {start - header_size} claims "
+                                 f"{position - start} payload bytes; only {end - start} are left")
+            yield fields, view[start:position]
+    except struct.error:
+        raise ValueError(f"truncated header at byte {position}") from None
+
+
+# --------------------------------------------------
+# Files and streams
+# --------------------------------------------------
+@contextmanager
+def mapped(path: str):
+    """
+    `with mapped("feed.bin") as data:` a read-only memoryview of the whole file.
+    Nothing is read up front; the OS loads pages as the parser reaches them.
+    Views taken from `data` must not outlive the with block.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            view = memoryview(mm)
+            try:
+                yield view
+            finally:
+                view.release()  # The mmap cannot close while a view still points into it
+
+
+class StreamRecords:
+    """
+    Parse records from a socket or binary stream into ONE reused buffer.
+
+        with socket.create_connection(feed) as sock:
+            for ts, price, qty in StreamRecords(sock, "<qdI"):
+                ...
+
+    The source only needs recv_into() (sockets) or readinto() (files, pipes).
+    Bytes are received straight into the buffer; records are unpacked from it in
+    place, and only the partial record at the end of a read is moved to the front.
+    With header= (variable-size records) the items are (header, payload view);
+    a payload view is only valid until the next record is requested.
+    """
+
+    def __init__(self, source, fmt=None, header=None, length_index: int = 0,
+                 length_includes_header: bool = False, buffer_size: int = 1 << 20):
+        if (fmt is None) == (header is None):
+            raise ValueError("pass either fmt= (fixed-size records) or header= (variable-size records)")
+        self.layout = _as_struct(fmt if fmt is not None else header)
+        self.variable = header is not None
+        self.length_index = length_index
+        self.length_includes_header = length_includes_header
+        self._read_into = getattr(source, "recv_into", None) or source.readinto
+        self._buffer = bytearray(max(buffer_size, self.layout.size))
+        self.bytes_read = 0
+
+    def _fill(self, view: memoryview, start: int) -> int:
+        """Read more bytes after `start`; returns the new end (== start at end of stream)."""
+        received = self._read_into(view[start:])
+        if not received:
+            return start
+        self.bytes_read += received
+        return start + received
+
+    def __iter__(self) -> Iterator:
+        view = memoryview(self._buffer)
+        size = self.layout.size
+        start = end = 0
+        while True:
+            new_end = self._fill(view, end)
+            if new_end == end:
+                if end > start:
+                    raise ValueError(f"stream ended inside a record ({end - start} bytes left over)")
+                return
+            end = new_end
+            if self.variable:
+                start, end, view = yield from self._variable(view, start, end)
+            else:
+                whole = (end - start) // size * size
+                yield from self.layout.iter_unpack(view[start:start + whole])
+                start += whole
+            if start == end:
+                start = end = 0
+            elif len(view) - end < size:  # Not enough room for one more read: move the tail to the front
+                view[:end - start] = view[start:end]
+                start, end = 0, end - start
+
+    def _variable(self, view: memoryview, start: int, end: int):
+        layout, index = self.layout, self.length_index
+        while end - start >= layout.size:
+            fields = layout.unpack_from(view, start)
+            length = fields[index] - (layout.size if self.length_includes_header else 0)
+            if length < 0:
+                raise ValueError(f"negative payload length in header {fields}")
+            total = layout.size + length
+            if end - start < total:
+                if total > len(view):  # Record bigger than the buffer: continue in a bigger one
+                    bigger = bytearray(max(total, 2 * len(view)))
+                    bigger[:end - start] = view[start:end]
+                    self._buffer, view = bigger, memoryview(bigger)
+                    end, start = end - start, 0
+                break
+            yield fields, view[start + layout.size:start + total]
+            start += total
+        return start, end, view
+
+
+# Example of code that should only run when binary_records.py is executed directly
+if __name__ == "__main__":
+    import io
+    from collections import namedtuple
+
+    Trade = namedtuple("Trade", "timestamp price quantity")
+    TRADE = compile_format("<qdI")
+    data = b"".join(TRADE.pack(1_700_000_000 + i, 100 + i / 4, i * 10) for i in range(5))
+    for timestamp, price, quantity in iter_fixed(data, TRADE):
+        print(timestamp, price, quantity)
+    print(read_record(data, TRADE, 3), list(iter_fixed(data, TRADE, count=2, record_type=Trade)))
+
+    # Variable-size messages: (type: uint16, length: uint32) + payload
+    HEADER = compile_format("<HI")
+    messages = [(1, b"hello"), (2, "¡unpacked!".encode()), (1, b"")]
+    feed = b"".join(HEADER.pack(kind, len(body)) + body for kind, body in messages)
+    for (kind, length), payload in iter_variable(feed, HEADER, length_index=1):
+        print(kind, length, bytes(payload).decode())
+
+    # The same feed arriving in pieces through a stream with a tiny buffer
+    stream = StreamRecords(io.BytesIO(feed * 3), header=HEADER, length_index=1, buffer_size=8)
+    print([(kind, bytes(payload)) for (kind, _), payload in stream])
@@ -0,0 +1,85 @@
+# bench_rule_compiler.py: Interpreting rule dicts vs running the compiled function
+# For 1, 10, 100 and 1000 rules (each: "output = then if condition else other"),
+# every record is evaluated by:
+#   interpreted   rule_compiler.interpret(): walks the rule dicts per record
+#   compiled      rule_compiler.compile_rules(): one generated function
+# Rules look like real config: most start with a test on country or channel
+# (so they share predicates), followed by one or two threshold checks.
+# Also reported: time to compile, and to "compile" again (content-hash cache hit).
+# Usage: python bench_rule_compiler.py [--records 20000] [--rules 1 10 100 1000]
+
+import argparse
+import random
+import time
+
+from rule_compiler import clear_cache, compile_rules, interpret
+
+COUNTRIES = ["DE", "FR", "IT", "ES", "NL", "PL", "US", "CA", "JP", "BR"]
+CHANNELS = ["web", "app", "store", "phone"]
+
+
+def make_rules(n: int, rng: random.Random) -> list[dict]:
+    rules = []
+    for i in range(n):
+        conditions = []
+        if rng.random() < 0.8:
+            conditions.append(rng.choice([["country", "==", rng.choice(COUNTRIES)],
+                                          ["channel", "==", rng.choice(CHANNELS)],
+                                          ["country", "in", {"param": "eu"}]]))
+        conditions.append(rng.choice([["amount", ">", rng.choice([50, 100, 500, {"param": "high"}])],
+                                      ["age", ">=", rng.choice([18, 21, 65])],
+                                      ["tier", "in", rng.sample(["bronze", "silver", "gold", "platinum"], 2)]]))
+        if rng.random() < 0.5:
+            conditions.append(["age", "<", rng.choice([30, 50, 70])])
+        rules.append({"name": f"rule{i}", "if": {"all": conditions},
+                      "then": {"op": "*", "args": [{"field": "amount"}, rng.choice([0.05, 0.1, {"param": "rate"}])]},
+                      "else": 0})
+    return rules
+
+
+def make_records(n: int, rng: random.Random) -> list[dict]:
+    return [{"country": rng.choice(COUNTRIES), "channel": rng.choice(CHANNELS), "age": rng.randint(16, 90),
+             "amount": round(rng.uniform(1, 1000), 2), "tier": rng.choice(["bronze", "silver", "gold", "platinum"])}
+            for _ in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--rules", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    params = {"eu": ["DE", "FR", "IT", "ES", "NL", "PL"], "high": 750, "rate": 0.15}
+    records = make_records(args.records, rng)
+    print(f"{args.records:,} records")
+    print(f"{'rules':>6}{'interpreted ns/rec':>20}{'compiled ns/rec':>17}{'speedup':>9}"
+          f"{'compile ms':>12}{'cached us':>11}")
+    for n in args.rules:
+        rules = make_rules(n, rng)
+        # The interpreter is slow with many rules: time it on fewer records
+        sample = records[:max(100, args.records * 10 // n)] if n > 10 else records
+        start = time.perf_counter()
+        expected = [interpret(rules, record, params) for record in sample]
+        interpreted = (time.perf_counter() - start) / len(sample)
+
+        clear_cache()
+        start = time.perf_counter()
+        evaluate = compile_rules(rules, params)
+        compile_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        compile_rules(rules, params)
+        cached = time.perf_counter() - start
+
+        start = time.perf_counter()
+        results = [evaluate(record) for record in records]
+        compiled = (time.perf_counter() - start) / len(records)
+        if results[:len(sample)] != expected:
+            raise SystemExit(f"compiled and interpreted results differ for {n} rules")
+        print(f"{n:>6}{interpreted * 1e9:>20,.0f}{compiled * 1e9:>17,.0f}{interpreted / compiled:>8.1f}x"
+              f"{compile_seconds * 1000:>12.1f}{cached * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,431 @@
+# rule_compiler.py: Turn declarative if/else rules into one fast Python function
+# Business rules often live in config as data:
+#
+#   {"name": "segment", "if": {"all": [["age", ">=", 18], ["country", "in", ["DE", "FR"]]]},
+#    "then": "eu_adult", "else": "other"}
+#
+# Walking those dicts for every record (interpret()) repeats the same work a
+# million times. compile_rules() does it once and generates the function you
+# would have written by hand out of one-line ifs:
+#
+#   def evaluate(record):
+#       get = record.get
+#       f0 = get('age')
+#       f1 = get('country')
+#       o0 = 'eu_adult' if (f0 >= 18) and (f1 in _k0) else 'other'
+#       return {'segment': o0}
+#
+# On the way it:
+#   - folds constants: params (config values) are substituted, arithmetic on
+#     constants is computed, and conditions that are always True/False vanish,
+#   - shares predicates: rules with a common condition are nested under ONE
+#     `if`, so when it is False all of them are skipped at once,
+#   - turns `in [...]` lists into frozensets,
+#   - caches compiled functions by a hash of the rules' content.
+#
+# Rule syntax
+#   condition  ["field", op, value]      op: == != < <= > >= in "not in"
+#              {"all": [...]}  {"any": [...]}  {"not": condition}  true / false
+#              a value on its own ({"param": "promo_enabled"}) means "is it truthy"
+#   value      a literal, {"field": "name"}, {"param": "name"},
+#              {"op": "+", "args": [value, value, ...]}   (+ - * / // % min max)
+# Modes
+#   "all"      every rule is one output: {name: then if condition else else}
+#   "first"    a decision list: the `then` of the first rule whose condition holds, else `default`
+
+import hashlib
+import json
+import math
+import operator
+from collections import Counter, OrderedDict
+from functools import reduce
+
+COMPARISONS = {"==": operator.eq, "!=": operator.ne, "<": operator.lt, "<=": operator.le,
+               ">": operator.gt, ">=": operator.ge,
+               "in": lambda a, b: a in b, "not in": lambda a, b: a not in b}
+ARITHMETIC = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv,
+              "//": operator.floordiv, "%": operator.mod, "min": min, "max": max}
+MODES = ("all", "first")
+_CACHE_SIZE = 256
+
+
+class RuleError(ValueError):
+    """A rule that cannot be understood (unknown operator, missing param...)."""
+
+
+# --------------------------------------------------
+# Interpreter: the walk-the-dicts baseline
+# --------------------------------------------------
+def _value(spec, record, params):
+    if isinstance(spec, dict):
+        if "field" in spec:
+            return record.get(spec["field"])
+        if "param" in spec:
+            return params[spec["param"]]
+        if "op" in spec:
+            args = [_value(arg, record, params) for arg in spec["args"]]
+            if spec["op"] in ("min", "max"):
+                return ARITHMETIC[spec["op"]](args)
+            return reduce(ARITHMETIC[spec["op"]], args)
+    return spec
+
+
+def _holds(condition, record, params) -> bool:
+    if condition is True or condition is False:
+        return condition
+    if isinstance(condition, dict):
+        if "all" in condition:
+            return all(_holds(part, record, params) for part in condition["all"])
+        if "any" in condition:
+            return any(_holds(part, record, params) for part in condition["any"])
+        if "not" in condition:
+            return not _holds(condition["not"], record, params)
+        return bool(_value(condition, record, params))  # {"param": "flag"} or {"field": "is_vip"}
+    left, op, right = condition
+    left = record.get(left) if isinstance(left, str) else _value(left, record, params)
+    return bool(COMPARISONS[op](left, _value(right, record, params)))
+
+
+def interpret(rules: list[dict], record: dict, params: dict | None = None, mode: str = "all", default=None):
+    """Evaluate the rules against one record by walking them (the slow, obvious way)."""
+    params = params or {}
+    if mode == "first":
+        for rule in rules:
+            if _holds(rule.get("if", True), record, params):
+                return _value(rule.get("then"), record, params)
+        return _value(default, record, params)
+    return {_rule_name(rule, i): _value(rule.get("then"), record, params)
+            if _holds(rule.get("if", True), record, params) else _value(rule.get("else"), record, params)
+            for i, rule in enumerate(rules)}
+
+
+def _rule_name(rule: dict, index: int) -> str:
+    return rule.get("name", f"rule{index}")
+
+
+# --------------------------------------------------
+# Normalising and constant folding
+# --------------------------------------------------
+# Normalised values:     ("const", v) | ("field", name) | ("arith", op, (values...))
+# Normalised conditions: True | False | ("cmp", op, left, right) | ("truth", value)
+#                        | ("all", (...)) | ("any", (...)) | ("not", c)
+# Identical predicates in different rules compare equal; _key() makes them hashable
+# (constants may be lists) so they can be counted and de-duplicated.
+def _key(node):
+    if isinstance(node, (tuple, list)):
+        return (type(node).__name__, tuple(_key(item) for item in node))
+    if isinstance(node, dict):
+        return ("dict", tuple(sorted((key, _key(item)) for key, item in node.items())))
+    if isinstance(node, set):
+        return frozenset(node)
+    return node
+
+
+def _norm_value(spec, params: dict):
+    if isinstance(spec, dict):
+        if "field" in spec:
+            return ("field", spec["field"])
+        if "param" in spec:
+            if spec["param"] not in params:
+                raise RuleError(f"missing param {spec['param']!r}")
+            return ("const", params[spec["param"]])
+        if "op" in spec:
+            op = spec["op"]
+            if op not in ARITHMETIC:
+                raise RuleError(f"unknown arithmetic operator {op!r}")
+            args = tuple(_norm_value(arg, params) for arg in spec["args"])
+            if all(arg[0] == "const" for arg in args):  # Computed now, once, instead of per record
+                values = [arg[1] for arg in args]
+                try:
+                    return ("const", ARITHMETIC[op](values) if op in ("min", "max")
+                            else reduce(ARITHMETIC[op], values))
+                except (TypeError, ArithmeticError):
+                    pass  # e.g. None - 1: leave it to fail at run time, if that branch is ever reached
+            return ("arith", op, args)
+        raise RuleError(f"unknown value {spec!r}")
+    return ("const", spec)
+
+
+def _norm_condition(condition, params: dict):
+    if condition is True or condition is False:
+        return condition
+    if isinstance(condition, dict):
+        if "not" in condition:
+            inner = _norm_condition(condition["not"], params)
+            return (not inner) if isinstance(inner, bool) else ("not", inner)
+        for kind, absorbing in (("all", False), ("any", True)):
+            if kind in condition:
+                parts = []
+                for part in (_norm_condition(c, params) for c in condition[kind]):
+                    if part is absorbing:
+                        return absorbing  # all(..., False, ...) is False; any(..., True, ...) is True
+                    if part is not (not absorbing):
+                        parts.extend(part[1] if part[0] == kind else (part,))  # Flatten all(all(...))
+                unique = {}
+                for part in parts:
+                    unique.setdefault(_key(part), part)  # A repeated predicate is tested once, where it first appears
+                parts = tuple(unique.values())
+                if not parts:
+                    return not absorbing
+                return parts[0] if len(parts) == 1 else (kind, parts)
+        value = _norm_value(condition, params)  # {"param": "flag"} or {"field": "is_vip"}: its truth value
+        return bool(value[1]) if value[0] == "const" else ("truth", value)
+    try:
+        left, op, right = condition
+    except (TypeError, ValueError):
+        raise RuleError(f"a comparison is [field, op, value], not {condition!r}") from None
+    if op not in COMPARISONS:
+        raise RuleError(f"unknown comparison {op!r}")
+    left = ("field", left) if isinstance(left, str) else _norm_value(left, params)
+    right = _norm_value(right, params)
+    if op in ("in", "not in") and right[0] == "const" and isinstance(right[1], (list, tuple, set)):
+        try:
+            right = ("const", frozenset(right[1]))  # O(1) membership instead of scanning a list
+        except TypeError:
+            pass
+    if left[0] == "const" and right[0] == "const":
+        try:
+            return bool(COMPARISONS[op](left[1], right[1]))  # Decided at compile time
+        except TypeError:
+            pass
+    return ("cmp", op, left, right)
+
+
+def _conjuncts(condition) -> tuple:
+    return condition[1] if isinstance(condition, tuple) and condition[0] == "all" else (condition,)
+
+
+# --------------------------------------------------
+# Code generation
+# --------------------------------------------------
+class _Writer:
+    def __init__(self):
+        self.lines: list[str] = []
+        self.constants: dict = {}     # name -> value, becomes the function's globals
+        self._constant_names: dict = {}
+        self.fields: dict[str, str] = {}  # field name -> local variable
+
+    def emit(self, depth: int, line: str) -> None:
+        self.lines.append("    " * depth + line)
+
+    def constant(self, value) -> str:
+        if value is None or isinstance(value, (bool, int, str)) or (isinstance(value, float) and math.isfinite(value)):
+            return repr(value)
+        key = _key(value)
+        if key not in self._constant_names:
+            name = f"_k{len(self._constant_names)}"
+            self._constant_names[key] = name
+            self.constants[name] = value
+        return self._constant_names[key]
+
+    def field(self, name: str) -> str:
+        if name not in self.fields:
+            self.fields[name] = f"f{len(self.fields)}"
+        return self.fields[name]
+
+    def value(self, value) -> str:
+        kind = value[0]
+        if kind == "const":
+            return self.constant(value[1])
+        if kind == "field":
+            return self.field(value[1])
+        op, args = value[1], [self.value(arg) for arg in value[2]]
+        if len(args) == 1:  # min(x) would iterate x; interpret() gives x itself
+            return args[0]
+        if op in ("min", "max"):
+            return f"{op}({', '.join(args)})"
+        return "(" + f" {op} ".join(args) + ")"
+
+    def condition(self, condition) -> str:
+        if isinstance(condition, bool):
+            return repr(condition)
+        kind = condition[0]
+        if kind == "cmp":
+            _, op, left, right = condition
+            return f"{self.value(left)} {op} {self.value(right)}"
+        if kind == "not":
+            return f"not ({self.condition(condition[1])})"
+        if kind == "truth":
+            return f"bool({self.value(condition[1])})"
+        joiner = " and " if kind == "all" else " or "
+        return "(" + joiner.join(f"({self.condition(part)})" for part in condition[1]) + ")"
+
+    def conjunction(self, parts) -> str:
+        return " and ".join(self.condition(part) if len(parts) == 1 else f"({self.condition(part)})"
+                            for part in parts)
+
+
+def _shared(rules) -> object | None:
+    """
+    The predicate that comes first in the most rules (at least two), or None.
+    Only FIRST conjuncts are shared, so every rule still tests its conditions
+    left to right and guards like [["age", "!=", None], ["age", ">", 18]] keep working.
+    """
+    counts = Counter(_key(parts[0]) for parts, *_ in rules if parts)
+    if not counts:
+        return None
+    key, count = counts.most_common(1)[0]
+    if count < 2:
+        return None
+    return next(parts[0] for parts, *_ in rules if parts and _key(parts[0]) == key)
+
+
+def _emit_all(writer: _Writer, rules: list[tuple], depth: int) -> None:
+    """
+    rules: [(remaining conjuncts, output variable, then, else)]; every output is assigned on every path.
+    Recurses only into a shared predicate's block (as deep as the longest rule);
+    the rules left outside it are handled by the loop, at the same depth.
+    """
+    while rules:
+        predicate = _shared(rules)
+        if predicate is None:
+            for parts, out, then, other in rules:
+                if not parts:
+                    writer.emit(depth, f"{out} = {writer.value(then)}")
+                else:
+                    writer.emit(depth, f"{out} = {writer.value(then)} if {writer.conjunction(parts)} "
+                                       f"else {writer.value(other)}")
+            return
+        inside = [rule for rule in rules if rule[0] and rule[0][0] == predicate]
+        rules = [rule for rule in rules if not (rule[0] and rule[0][0] == predicate)]
+        writer.emit(depth, f"if {writer.condition(predicate)}:")
+        _emit_all(writer, [(parts[1:], out, then, other) for parts, out, then, other in inside], depth + 1)
+        writer.emit(depth, "else:")
+        for _, out, _, other in inside:
+            writer.emit(depth + 1, f"{out} = {writer.value(other)}")
+
+
+def _emit_first(writer: _Writer, rules: list[tuple], depth: int) -> bool:
+    """rules: [(remaining conjuncts, then)] in order. Returns True if the code always returns."""
+    i = 0
+    while i < len(rules):
+        parts, then = rules[i]
+        if not parts:
+            writer.emit(depth, f"return {writer.value(then)}")
+            return True  # Later rules can never be reached
+        # Consecutive rules that start with the same predicate share one test (order must be kept)
+        first, end = parts[0], i + 1
+        while end < len(rules) and rules[end][0] and rules[end][0][0] == first:
+            end += 1
+        best, best_end = (first, end) if end - i >= 2 else (None, i + 1)
+        if best is None:
+            writer.emit(depth, f"if {writer.conjunction(parts)}:")
+            writer.emit(depth + 1, f"return {writer.value(then)}")
+            i += 1
+            continue
+        writer.emit(depth, f"if {writer.condition(best)}:")
+        _emit_first(writer, [(rule_parts[1:], rule_then) for rule_parts, rule_then in rules[i:best_end]], depth + 1)
+        i = best_end
+    return False
+
+
+def _generate(rules: list[dict], params: dict, mode: str, default) -> tuple[str, dict]:
+    writer = _Writer()
+    body = _Writer()
+    body.constants, body._constant_names, body.fields = writer.constants, writer._constant_names, writer.fields
+    if mode == "first":
+        decisions = []
+        for rule in rules:
+            condition = _norm_condition(rule.get("if", True), params)
+            if condition is not False:
+                decisions.append((() if condition is True else _conjuncts(condition),
+                                  _norm_value(rule.get("then"), params)))
+        if not _emit_first(body, decisions, 1):
+            body.emit(1, f"return {body.value(_norm_value(default, params))}")
+        result = None
+    else:
+        names = [_rule_name(rule, i) for i, rule in enumerate(rules)]
+        duplicates = [name for name, count in Counter(names).items() if count > 1]
+        if duplicates:
+            raise RuleError(f"rule names must be unique in mode 'all': {duplicates}")
+        outputs = []
+        for i, rule in enumerate(rules):
+            condition = _norm_condition(rule.get("if", True), params)
+            then, other = _norm_value(rule.get("then"), params), _norm_value(rule.get("else"), params)
+            out = f"o{i}"
+            if condition is True or condition is False:
+                then = then if condition else other
+                outputs.append(((), out, then, then))
+            else:
+                outputs.append((_conjuncts(condition), out, then, other))
+        _emit_all(body, outputs, 1)
+        result = "{" + ", ".join(f"{name!r}: o{i}" for i, name in enumerate(names)) + "}"
+        body.emit(1, f"return {result}")
+
+    writer.emit(0, "def evaluate(record):")
+    if writer.fields:
+        writer.emit(1, "get = record.get")
+        for name, local in writer.fields.items():
+            writer.emit(1, f"{local} = get({name!r})")
+    return "\n".join(writer.lines + body.lines) + "\n", writer.constants
+
+
+# --------------------------------------------------
+# Compiling with a content-hash cache
+# --------------------------------------------------
+_cache: OrderedDict = OrderedDict()
+
+
+def rules_hash(rules: list[dict], params: dict | None = None, mode: str = "all", default=None) -> str:
+    """Same content -> same hash, however the dicts were built (keys are sorted)."""
+    payload = json.dumps([rules, params or {}, mode, default], sort_keys=True, default=repr)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def compile_rules(rules: list[dict], params: dict | None = None, mode: str = "all", default=None):
+    """
+    Compile rules into evaluate(record). The function also carries
+    .source (the generated code) and .rules_hash. Compiling the same rules
+    again returns the cached function.
+    """
+    if mode not in MODES:
+        raise ValueError(f"mode must be one of {MODES}, not {mode!r}")
+    key = rules_hash(rules, params, mode, default)
+    function = _cache.get(key)
+    if function is not None:
+        _cache.move_to_end(key)
+        return function
+    source, constants = _generate(rules, params or {}, mode, default)
+    namespace = {"__builtins__": {"min": min, "max": max, "bool": bool}, **constants}
+    exec(compile(source, f"<rules {key[:12]}>", "exec"), namespace)
+    function = namespace["evaluate"]
+    function.source = source
+    function.rules_hash = key
+    _cache[key] = function
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return function
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+# Example of code that should only run when rule_compiler.py is executed directly
+if __name__ == "__main__":
+    params = {"adult_age": 18, "eu": ["DE", "FR", "IT"], "vat": 0.19, "promo_enabled": False}
+    rules = [
+        {"name": "segment", "if": {"all": [["age", ">=", {"param": "adult_age"}], ["country", "in", {"param": "eu"}]]},
+         "then": "eu_adult", "else": "other"},
+        {"name": "tax", "if": ["country", "in", {"param": "eu"}],
+         "then": {"op": "*", "args": [{"field": "amount"}, {"param": "vat"}]}, "else": 0},
+        {"name": "promo", "if": {"all": [{"param": "promo_enabled"}, ["amount", ">", 100]]}, "then": True,
+         "else": False},
+        {"name": "review", "if": {"any": [["amount", ">", {"op": "*", "args": [1000, 10]}], ["age", "<", 16]]},
+         "then": "manual", "else": "auto"},
+    ]
+    evaluate = compile_rules(rules, params)
+    print(evaluate.source)
+    record = {"age": 30, "country": "DE", "amount": 250.0}
+    print(evaluate(record))
+    assert evaluate(record) == interpret(rules, record, params)
+    assert compile_rules(rules, dict(params)) is evaluate  # Same content: cached
+
+    tiers = [
+        {"if": {"all": [["country", "==", "DE"], ["amount", ">", 1000]]}, "then": "gold"},
+        {"if": {"all": [["country", "==", "DE"], ["amount", ">", 100]]}, "then": "silver"},
+        {"if": ["amount", ">", 5000], "then": "gold"},
+    ]
+    tier = compile_rules(tiers, mode="first", default="bronze")
+    print(tier.source)
+    print([tier({"country": c, "amount": a}) for c, a in [("DE", 2000), ("DE", 500), ("FR", 9000), ("FR", 50)]])
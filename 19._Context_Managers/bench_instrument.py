@@ -0,0 +1,153 @@
+# bench_instrument.py: What one timed() / track_memory() block costs
+# Every variant runs an empty block N times; reported: ns per block above an empty
+# `for` loop, and the memory kept after N blocks.
+#   nullcontext       `with contextlib.nullcontext():`, the floor for any `with`
+#   generator-timer   the lesson's @contextmanager timer, appending each duration to a list
+#   timed             `with timed("block"):`
+#   timed-nested      `with timed("outer"): with timed("inner"):`, per block
+#   timed-decorator   a function decorated with @timed, per call (vs. the plain call)
+#   timed-disabled    REGISTRY.enabled = False
+#   memory-off        `with track_memory("block"):` while tracemalloc is not tracing
+#   memory-on         the same while tracing: tracemalloc slows every allocation, the
+#                     block's own included, so this is mostly tracemalloc's cost
+#   timed-threads     timed() in 4 threads at once, per block
+#   timed-tasks       timed() in 100 asyncio tasks, per block
+# Usage: python bench_instrument.py [--blocks 200000]
+
+import argparse
+import asyncio
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+from instrument import REGISTRY, timed, track_memory
+
+VARIANTS = ("nullcontext", "generator-timer", "timed", "timed-nested", "timed-decorator", "timed-disabled",
+            "memory-off", "memory-on", "timed-threads", "timed-tasks")
+
+
+def empty(n: int) -> None:
+    for _ in range(n):
+        pass
+
+
+def run(variant: str, n: int) -> list:
+    """Run n blocks; returns what the variant keeps (to count its memory)."""
+    if variant == "nullcontext":
+        for _ in range(n):
+            with nullcontext():
+                pass
+    elif variant == "generator-timer":
+        durations = []
+
+        @contextmanager
+        def timer():
+            start = time.perf_counter()
+            yield
+            durations.append(time.perf_counter() - start)
+
+        for _ in range(n):
+            with timer():
+                pass
+        return durations
+    elif variant in ("timed", "timed-disabled"):
+        for _ in range(n):
+            with timed("block"):
+                pass
+    elif variant == "timed-nested":
+        for _ in range(n // 2):
+            with timed("outer"):
+                with timed("inner"):
+                    pass
+    elif variant == "timed-decorator":
+        def plain():
+            pass
+
+        decorated = timed("block")(plain)
+        for _ in range(n):
+            decorated()
+        start = time.perf_counter_ns()
+        for _ in range(n):
+            plain()
+        return [time.perf_counter_ns() - start]  # Subtracted: the cost of the call itself
+    elif variant in ("memory-off", "memory-on"):
+        for _ in range(n):
+            with track_memory("block"):
+                pass
+    elif variant == "timed-threads":
+        threads = [threading.Thread(target=run, args=("timed", n // 4)) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elif variant == "timed-tasks":
+        async def task(blocks: int) -> None:
+            for i in range(blocks):
+                with timed("block"):
+                    if i % 100 == 0:
+                        await asyncio.sleep(0)
+
+        async def main():
+            with timed("tasks"):
+                await asyncio.gather(*(task(n // 100) for _ in range(100)))
+
+        asyncio.run(main())
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--blocks", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=3, help="best of")
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=VARIANTS)
+    args = parser.parse_args()
+    n = args.blocks
+
+    def best(function) -> float:
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter_ns()
+            function()
+            times.append(time.perf_counter_ns() - start)
+        return min(times)
+
+    baseline = best(lambda: empty(n))
+    print(f"{n:,} blocks, ns per block above an empty loop ({baseline / n:.0f} ns), best of {args.repeat}")
+    print(f"{'variant':<18}{'ns/block':>10}{'kept':>12}")
+    for variant in args.variants:
+        REGISTRY.reset()
+        REGISTRY.enabled = variant != "timed-disabled"
+        if variant == "memory-on":
+            tracemalloc.start()
+        kept = []
+
+        def once():
+            nonlocal kept
+            kept = run(variant, n)
+
+        elapsed = best(once)
+        if variant == "memory-on":
+            tracemalloc.stop()
+        if variant == "timed-decorator":
+            elapsed, kept = elapsed - kept[0], []
+        else:
+            elapsed -= baseline
+        if variant == "generator-timer":
+            size = sys.getsizeof(kept) + sum(map(sys.getsizeof, kept))
+        else:
+            snapshot = REGISTRY.snapshot()
+            series = [s for kind in snapshot.values() for s in kind.values()]
+            size = sum(sys.getsizeof(s.buckets) for s in series)
+            recorded = sum(s.count for s in snapshot["timed"].values() if s is not snapshot["timed"].get("tasks"))
+            expected = {"timed": n, "timed-nested": n // 2 * 2, "timed-decorator": n, "timed-threads": n // 4 * 4,
+                        "timed-tasks": n // 100 * 100}.get(variant, 0)
+            if recorded != expected * args.repeat:
+                raise SystemExit(f"{variant}: recorded {recorded:,} blocks, expected {expected * args.repeat:,}")
+        print(f"{variant:<18}{elapsed / n:>10,.0f}{size / 1024:>10,.0f} KB")
+    REGISTRY.enabled = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+# instrument.py: Timing and memory context managers cheap enough to leave in
+# The Timer in the lesson prints once per block. In production code the same
+# block runs millions of times, on many threads and asyncio tasks, and what is
+# wanted is an aggregate: how often, how long in total, the p99, the worst.
+#   timed(name)         records perf_counter_ns() durations
+#   track_memory(name)  records the peak of memory allocated inside the block
+#                       (needs tracemalloc tracing; otherwise it costs one check)
+# Blocks nest: the path "request/parse/decode" is kept in a ContextVar, so it
+# follows each thread and each asyncio task on its own (a task created inside
+# `with timed("request")` records under "request/...").
+# Each thread writes to its own shard without locks; snapshot() merges them.
+# Every series is a fixed-size log-linear histogram (8 buckets per power of
+# two, at most 12.5% wide): memory does not grow with the number of samples.
+#
+#   with timed("request"):
+#       with timed("parse"):
+#           ...
+#
+#   @timed("load")                       # Also a decorator (sync or async)
+#   def load(path): ...
+#
+#   print_report()                       # Tree: count, total, self, p50, p99, max
+#   REGISTRY.to_json()                   # Snapshot as JSON
+#   REGISTRY.to_prometheus("myapp_")     # Prometheus text format
+
+import functools
+import inspect
+import json
+import threading
+import time
+import tracemalloc
+from contextvars import ContextVar
+
+_now = time.perf_counter_ns
+_traced = tracemalloc.get_traced_memory
+_reset_peak = tracemalloc.reset_peak
+_is_tracing = tracemalloc.is_tracing
+
+SEP = "/"
+MAX_PATHS = 10_000                 # Distinct paths; names past that record under "<overflow>"
+_SUB_BITS = 3                      # 2**3 buckets per power of two
+_LINEAR = 1 << (_SUB_BITS + 1)     # Values below 16 get one bucket each
+BUCKETS = ((50 - _SUB_BITS) << _SUB_BITS) + _LINEAR  # Up to 2**50 (13 days in ns, 1 PiB in bytes)
+assert (_LINEAR, BUCKETS) == (16, 392), "update the literals in _Series.add()"
+
+
+# --------------------------------------------------
+# Histogram buckets
+# --------------------------------------------------
+def bucket_of(value: int) -> int:
+    """Index of the bucket holding `value` (an int >= 0)."""
+    if value < _LINEAR:
+        return value if value > 0 else 0
+    shift = value.bit_length() - _SUB_BITS - 1
+    return min((shift << _SUB_BITS) + (value >> shift), BUCKETS - 1)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """[low, high) of a bucket."""
+    if index < _LINEAR:
+        return index, index + 1
+    shift = (index >> _SUB_BITS) - 1
+    mantissa = (1 << _SUB_BITS) + (index & ((1 << _SUB_BITS) - 1))
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class _Series:
+    """count, total, max and a histogram of one path in one thread."""
+
+    __slots__ = ("count", "total", "max", "net", "buckets")
+
+    def __init__(self):
+        self.count = self.total = self.max = self.net = 0
+        self.buckets = [0] * BUCKETS
+
+    def add(self, value: int) -> None:
+        # bucket_of() inlined, with literals: 16 = _LINEAR, 4 = _SUB_BITS + 1, 3 = _SUB_BITS,
+        # 392 = BUCKETS (global lookups and min() cost as much as the rest of add())
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if value < 16:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - 4
+            index = (shift << 3) + (value >> shift)
+            if index >= 392:
+                index = 391
+        self.buckets[index] += 1
+
+    def merge(self, other: "_Series") -> None:
+        self.count += other.count
+        self.total += other.total
+        self.net += other.net
+        self.max = max(self.max, other.max)
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+
+    def quantile(self, q: float) -> int:
+        """Upper bound of the bucket holding the q-th quantile (never above max)."""
+        if not self.count:
+            return 0
+        rank, seen = q * self.count, 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(bucket_bounds(index)[1] - 1, self.max)
+        return self.max
+
+    def summary(self, unit: str) -> dict:
+        quantiles = {f"p{round(q * 100)}_{unit}": self.quantile(q) for q in (0.5, 0.9, 0.99)}
+        summary = {"count": self.count, f"total_{unit}": self.total, f"max_{unit}": self.max,
+                   f"mean_{unit}": self.total // self.count if self.count else 0, **quantiles}
+        if unit == "bytes":
+            summary["net_bytes"] = self.net
+        summary["buckets"] = {str(bucket_bounds(i)[0]): n for i, n in enumerate(self.buckets) if n}
+        return summary
+
+
+# --------------------------------------------------
+# Paths
+# --------------------------------------------------
+_path: ContextVar[str] = ContextVar("instrument_path", default="")
+_children: dict[str, dict[str, str]] = {}   # parent -> name -> path, so entering a block allocates no str
+_path_count = 0
+
+
+def _child(parent: str, name: str) -> str:
+    global _path_count
+    names = _children.setdefault(parent, {})
+    if _path_count >= MAX_PATHS:  # Names built from data ("user 1234") would grow without bound
+        name = "<overflow>"
+    path = names.get(name)
+    if path is None:
+        path = names[name] = f"{parent}{SEP}{name}" if parent else name
+        _path_count += 1
+    return path
+
+
+def current_path() -> str:
+    """The path of the innermost timed()/track_memory() block around this call ("" outside any)."""
+    return _path.get()
+
+
+# --------------------------------------------------
+# Registry
+# --------------------------------------------------
+class Registry:
+    """
+    Collects timed() and track_memory() samples. Each thread gets its own
+    shards (dicts of path -> _Series), written without locks; snapshot()
+    merges them, and folds in and drops the shards of threads that ended.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: list[tuple[threading.Thread, dict, dict]] = []
+        self._retired: tuple[dict, dict] = ({}, {})
+
+    def _new_shard(self) -> dict:
+        times, memory = {}, {}
+        with self._lock:
+            self._shards.append((threading.current_thread(), times, memory))
+        self._local.times, self._local.memory = times, memory
+        return times
+
+    def _series(self, path: str, kind: str = "times") -> _Series:
+        """This thread's series for `path`, created on first use."""
+        if not hasattr(self._local, kind):
+            self._new_shard()
+        shard = getattr(self._local, kind)
+        series = shard.get(path)
+        if series is None:
+            series = shard[path] = _Series()
+        return series
+
+    def record(self, path: str, ns: int) -> None:
+        """Add one duration (what timed() does on exit)."""
+        self._series(path).add(ns)
+
+    def record_memory(self, path: str, peak: int, net: int) -> None:
+        """Add one block's peak and net allocated bytes (what track_memory() does on exit)."""
+        series = self._series(path, "memory")
+        series.add(peak)
+        series.net += net
+
+    def snapshot(self) -> dict[str, dict[str, _Series]]:
+        """{"timed": {path: series}, "memory": {path: series}}, merged over all threads."""
+        merged = {"timed": {}, "memory": {}}
+        with self._lock:
+            alive = []
+            for thread, times, memory in self._shards:
+                ended = not thread.is_alive()
+                for kind, shard, retired in zip(("timed", "memory"), (times, memory), self._retired):
+                    target = retired if ended else merged[kind]
+                    for path, series in list(shard.items()):  # list(): the owner thread may add paths meanwhile
+                        target.setdefault(path, _Series()).merge(series)
+                if not ended:
+                    alive.append((thread, times, memory))
+            self._shards = alive
+            for kind, retired in zip(("timed", "memory"), self._retired):
+                for path, series in retired.items():
+                    merged[kind].setdefault(path, _Series()).merge(series)
+        return {kind: dict(sorted(series.items())) for kind, series in merged.items()}
+
+    def reset(self) -> None:
+        """Forget every sample (threads keep their shards, emptied)."""
+        with self._lock:
+            for _, times, memory in self._shards:
+                times.clear()
+                memory.clear()
+            self._retired = ({}, {})
+
+    # --------------------------------------------------
+    # Export
+    # --------------------------------------------------
+    def to_dict(self) -> dict:
+        snapshot = self.snapshot()
+        return {"timed": {path: s.summary("ns") for path, s in snapshot["timed"].items()},
+                "memory": {path: s.summary("bytes") for path, s in snapshot["memory"].items()}}
+
+    def to_json(self, **dumps_options) -> str:
+        """The snapshot as JSON: per path count, totals, max, mean, p50/p90/p99 and the non-empty buckets."""
+        return json.dumps(self.to_dict(), **dumps_options)
+
+    def to_prometheus(self, prefix: str = "", powers=range(10, 36, 2)) -> str:
+        """
+        Prometheus text format: one histogram per path, labelled path="a/b".
+        The fine buckets are summed up to each power of two, a bucket edge
+        (ns or bytes, exported in seconds and bytes). `le` means <=, so the
+        bound is 2**power - 1: the bucket starting at 2**power is left out.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for kind, name, scale, help_text in (
+                ("timed", f"{prefix}timed_seconds", 1e-9, "Time spent in timed() blocks"),
+                ("memory", f"{prefix}memory_peak_bytes", 1, "Peak traced memory of track_memory() blocks")):
+            if not snapshot[kind]:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for path, series in snapshot[kind].items():
+                label = path.replace("\\", "\\\\").replace('"', '\\"')
+                cumulative, index = 0, 0
+                for power in powers:
+                    edge = bucket_of(1 << power)  # First bucket at or above 2**power
+                    cumulative += sum(series.buckets[index:edge])
+                    index = edge
+                    lines.append(f'{name}_bucket{{path="{label}",le="{((1 << power) - 1) * scale:.12g}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{path="{label}",le="+Inf"}} {series.count}')
+                lines.append(f'{name}_sum{{path="{label}"}} {series.total * scale:.9g}')
+                lines.append(f'{name}_count{{path="{label}"}} {series.count}')
+        return "\n".join(lines) + "\n"
+
+    def print_report(self, file=None) -> None:
+        """The timed paths as a tree: self time is total minus the children's totals."""
+        times = self.snapshot()["timed"]
+        print(f"{'path':<32}{'count':>10}{'total ms':>11}{'self ms':>10}{'p50 us':>11}{'p99 us':>11}{'max us':>11}",
+              file=file)
+        for path, series in times.items():
+            children = sum(s.total for p, s in times.items() if p.rpartition(SEP)[0] == path)
+            # Concurrent children (asyncio tasks, threads) can add up to more than their parent
+            own = max(series.total - children, 0)
+            depth = path.count(SEP)
+            print(f"{'  ' * depth + path.rpartition(SEP)[2]:<32}{series.count:>10,}{series.total / 1e6:>11,.2f}"
+                  f"{own / 1e6:>10,.2f}{series.quantile(0.5) / 1e3:>11,.1f}{series.quantile(0.99) / 1e3:>11,.1f}"
+                  f"{series.max / 1e3:>11,.1f}", file=file)
+
+
+REGISTRY = Registry()
+
+
+# --------------------------------------------------
+# Context managers
+# --------------------------------------------------
+class timed:
+    """
+    with timed("name"): records the block's duration under the enclosing
+    path + "/name". As a decorator, each call is one block. An instance
+    measures one block at a time: write `with timed(...)` at each use.
+    """
+
+    __slots__ = ("name", "registry", "_path", "_token", "_start")
+
+    def __init__(self, name: str, registry: Registry = REGISTRY):
+        self.name, self.registry = name, registry
+
+    def __enter__(self) -> "timed":
+        if self.registry.enabled:
+            parent = _path.get()
+            names = _children.get(parent)
+            path = names.get(self.name) if names else None
+            self._path = path or _child(parent, self.name)
+            self._token = _path.set(self._path)
+            self._start = _now()
+        else:
+            self._token = None
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self._token is not None:
+            elapsed = _now() - self._start
+            _path.reset(self._token)
+            try:  # record() inlined: free unless this thread or path is new
+                series = self.registry._local.times[self._path]
+            except (AttributeError, KeyError):
+                series = self.registry._series(self._path)
+            series.add(elapsed)
+
+    def __call__(self, function):
+        name, registry, kind = self.name, self.registry, type(self)
+        if inspect.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def wrapper(*args, **kwargs):
+                with kind(name, registry):
+                    return await function(*args, **kwargs)
+        else:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with kind(name, registry):
+                    return function(*args, **kwargs)
+        return wrapper
+
+
+class track_memory(timed):
+    """
+    with track_memory("name"): records the peak traced memory above the
+    block's start (and the net change) under path + "/name"; with no name,
+    under the enclosing path itself (`with timed("load"), track_memory():`).
+
+    Only while tracemalloc is tracing (python -X tracemalloc, or
+    tracemalloc.start()), which slows every allocation: turn it on when
+    looking for memory, the blocks can stay in the code. tracemalloc counts
+    the whole process, so allocations by other threads running at the same
+    time are included.
+    """
+
+    __slots__ = ("_outer", "_peak")
+    _active: ContextVar["track_memory | None"] = ContextVar("instrument_memory", default=None)
+
+    def __init__(self, name: str | None = None, registry: Registry = REGISTRY):
+        super().__init__(name, registry)
+
+    def __enter__(self) -> "track_memory":
+        if not (self.registry.enabled and _is_tracing()):
+            self._token = None
+            return self
+        if self.name is None:
+            self._path = _path.get()
+            self._token = _path.set(self._path)
+        else:
+            super().__enter__()
+        current, peak = _traced()
+        self._outer = self._active.get()
+        if self._outer is not None:  # reset_peak() below would lose the outer block's peak so far
+            self._outer._peak = max(self._outer._peak, peak)
+        _reset_peak()
+        self._start = self._peak = current
+        self._active.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self._token is None:
+            return
+        current, peak = _traced()
+        peak = max(self._peak, peak)
+        if self._outer is not None:
+            self._outer._peak = max(self._outer._peak, peak)
+        self._active.set(self._outer)
+        _path.reset(self._token)
+        self.registry.record_memory(self._path, peak - self._start, current - self._start)
+
+
+def print_report(registry: Registry = REGISTRY, file=None) -> None:
+    registry.print_report(file)
+
+
+# Example of code that should only run when instrument.py is executed directly
+if __name__ == "__main__":
+    import asyncio
+
+    @timed("parse")
+    def parse(text: str) -> list[int]:
+        return [int(word) for word in text.split()]
+
+    def handle(request: int) -> int:
+        with timed("request"):
+            with timed("load"), track_memory():
+                text = " ".join(map(str, range(request * 100)))
+            with timed("compute"):
+                return sum(parse(text))
+
+    tracemalloc.start()
+    threads = [threading.Thread(target=lambda: [handle(i) for i in range(50)]) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    async def job(i: int) -> None:
+        with timed("job"):
+            await asyncio.sleep(0.001 * (i % 5))
+            handle(i)
+
+    async def batch() -> None:
+        with timed("batch"):
+            await asyncio.gather(*(job(i) for i in range(20)))  # Each task records under batch/job
+
+    asyncio.run(batch())
+    tracemalloc.stop()
+
+    print_report()
+    print(json.dumps(REGISTRY.to_dict()["memory"]["request/load"], indent=1)[:300], "...")
+    print("\n".join(REGISTRY.to_prometheus("demo_").splitlines()[:6]), "...")